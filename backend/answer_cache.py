@@ -0,0 +1,227 @@
+"""Semantic cache of answers keyed by question embedding and index generation."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """Answers to earlier questions, found by embedding similarity.
+
+    A lookup compares the question's embedding against every cached
+    question asked with the same variant (tool use and retrieval mode) at
+    the same index generation and returns the most similar answer if its
+    cosine similarity reaches ``threshold``. Entries expire after ``ttl``
+    seconds and the least recently used ones are evicted beyond
+    ``max_entries``.
+
+    With a ``path``, entries are written through to SQLite and read back in
+    one query on first use, so they survive restarts; recency is tracked in
+    memory only. Entries from other index generations are dropped as soon
+    as a lookup or store sees a new generation.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1000,
+                 ttl: Optional[float] = 24 * 3600, threshold: float = 0.95,
+                 timer: Callable[[], float] = time.time):
+        """Initialize the cache.
+
+        The database file is only created on first use.
+
+        Args:
+            path: SQLite file backing the cache, or None to keep it in memory
+            max_entries: Maximum number of cached answers
+            ttl: Seconds an answer stays valid, or None to never expire
+            threshold: Minimum cosine similarity for a hit
+            timer: Wall clock used for expiry (injectable for tests)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self._timer = timer
+        self._conn = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        # key -> (generation, variant, unit vector, result, created_at)
+        self._entries = OrderedDict()
+        self._generation = None  # Generation all entries belong to, once checked
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(generation: int, variant: str, question: str) -> str:
+        return hashlib.sha256(f"{generation}\x00{variant}\x00{question}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _unit(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS answers (
+                    key TEXT PRIMARY KEY,
+                    generation INTEGER NOT NULL,
+                    variant TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _load(self) -> None:
+        """Read the persisted entries once, oldest first (caller holds the lock)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None:
+            return
+        rows = self._connect().execute(
+            "SELECT key, generation, variant, vector, result, created_at FROM answers ORDER BY created_at"
+        ).fetchall()
+        for key, generation, variant, blob, result, created_at in rows:
+            self._entries[key] = (
+                generation, variant, np.frombuffer(blob, dtype=np.float32), json.loads(result), created_at
+            )
+        self._expire()
+
+    def _expire(self) -> None:
+        """Drop expired entries and the least recently used overflow (caller holds the lock)."""
+        removed = []
+        if self.ttl is not None:
+            cutoff = self._timer() - self.ttl
+            removed = [key for key, entry in self._entries.items() if entry[4] <= cutoff]
+        overflow = len(self._entries) - len(removed) - self.max_entries
+        if overflow > 0:
+            expired = set(removed)
+            live = [key for key in self._entries if key not in expired]
+            removed.extend(live[:overflow])
+        self._delete(removed)
+
+    def _drop_other_generations(self, generation: int) -> None:
+        """Drop entries built against another index generation (caller holds the lock)."""
+        if generation == self._generation:
+            return
+        self._generation = generation
+        self._delete([key for key, entry in self._entries.items() if entry[0] != generation])
+
+    def _delete(self, keys: list) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+        if keys and self.path is not None:
+            conn = self._connect()
+            conn.executemany("DELETE FROM answers WHERE key = ?", [(key,) for key in keys])
+            conn.commit()
+
+    def get(self, query_embedding, generation: int, variant: str) -> Optional[dict]:
+        """Find the cached answer to the most similar earlier question.
+
+        Args:
+            query_embedding: Embedding of the question
+            generation: Current index generation
+            variant: Request variant the answer must match
+
+        Returns:
+            Copy of the cached result with 'similarity' added, or None
+        """
+        query = self._unit(query_embedding)
+        with self._lock:
+            self._load()
+            self._drop_other_generations(generation)
+            cutoff = self._timer() - self.ttl if self.ttl is not None else None
+
+            keys = [
+                key for key, entry in self._entries.items()
+                if entry[1] == variant and (cutoff is None or entry[4] > cutoff)
+            ]
+            if keys:
+                matrix = np.stack([self._entries[key][2] for key in keys])
+                similarities = matrix @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    self._entries.move_to_end(keys[best])
+                    self.hits += 1
+                    return {**self._entries[keys[best]][3], 'similarity': float(similarities[best])}
+
+            self.misses += 1
+            return None
+
+    def put(self, question: str, query_embedding, generation: int, variant: str, result: dict) -> None:
+        """Store the answer to a question.
+
+        Args:
+            question: Normalized question text
+            query_embedding: Embedding of the question
+            generation: Index generation the answer was produced against
+            variant: Request variant (tool use and retrieval mode)
+            result: JSON-serializable query result
+        """
+        key = self._key(generation, variant, question)
+        vector = self._unit(query_embedding)
+        created_at = self._timer()
+        with self._lock:
+            self._load()
+            if self._generation is not None and generation < self._generation:
+                return  # Answered against an index that has since been replaced
+            self._drop_other_generations(generation)
+            self._entries[key] = (generation, variant, vector, result, created_at)
+            self._entries.move_to_end(key)
+            if self.path is not None:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO answers (key, generation, variant, vector, result, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, generation, variant, vector.tobytes(), json.dumps(result), created_at)
+                )
+                conn.commit()
+            self._expire()
+
+    def clear(self) -> None:
+        """Drop every entry, on disk too."""
+        with self._lock:
+            self._load()
+            self._delete(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters.
+
+        Returns:
+            Dictionary with size, max_entries, hits, misses and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,165 @@
+"""Token-aware chunking of markdown sections with overlap."""
+
+import re
+from typing import Optional
+
+CHUNK_STRATEGIES = ("sections", "tokens")
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+_APPROX_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+class TokenChunker:
+    """Split section text into chunks of at most max_tokens tokens.
+
+    Text is cut at paragraph boundaries, then at sentence boundaries for
+    paragraphs that are too long, and only then between words. Fenced code
+    blocks are never cut, so a code block longer than max_tokens becomes a
+    chunk of its own. Each chunk after the first starts with up to
+    overlap_tokens tokens of text from the end of the previous one.
+
+    Tokens are counted with the embedding model's tokenizer, so the limit
+    matches what the embedder would otherwise truncate. Without a tokenizer
+    words and punctuation are counted instead (an underestimate for
+    WordPiece vocabularies).
+    """
+
+    def __init__(self, max_tokens: int = 200, overlap_tokens: int = 32, tokenizer=None):
+        """Initialize the chunker.
+
+        Args:
+            max_tokens: Maximum tokens per chunk
+            overlap_tokens: Tokens repeated from the previous chunk
+            tokenizer: Hugging Face tokenizer, or None to approximate
+        """
+        if overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be smaller than max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.tokenizer = tokenizer
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens in text, excluding special tokens."""
+        if self.tokenizer is None:
+            return len(_APPROX_TOKEN_RE.findall(text))
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
+    @staticmethod
+    def _blocks(text: str) -> list:
+        """Split text into ('code', text) fenced blocks and ('para', text) paragraphs."""
+        blocks = []
+        current = []
+        in_code_block = False
+
+        def flush(kind):
+            if current and (kind == 'code' or any(line.strip() for line in current)):
+                blocks.append((kind, '\n'.join(current)))
+            current.clear()
+
+        for line in text.split('\n'):
+            if line.strip().startswith('```'):
+                if in_code_block:
+                    current.append(line)
+                    flush('code')
+                else:
+                    flush('para')
+                    current.append(line)
+                in_code_block = not in_code_block
+            elif in_code_block:
+                current.append(line)
+            elif not line.strip():
+                flush('para')
+            else:
+                current.append(line)
+
+        flush('code' if in_code_block else 'para')
+        return blocks
+
+    def _units(self, text: str) -> list:
+        """Break text into units that each fit in a chunk (code blocks excepted).
+
+        Returns:
+            List of (text, tokens, separator, is_code) tuples, where separator
+            joins the unit to the one before it
+        """
+        units = []
+        for kind, block in self._blocks(text):
+            tokens = self.count_tokens(block)
+            if kind == 'code' or tokens <= self.max_tokens:
+                units.append((block, tokens, '\n\n', kind == 'code'))
+                continue
+
+            separator = '\n\n'
+            for sentence in _SENTENCE_END_RE.split(block):
+                sentence_tokens = self.count_tokens(sentence)
+                if sentence_tokens <= self.max_tokens:
+                    units.append((sentence, sentence_tokens, separator, False))
+                else:
+                    for piece in self._split_words(sentence):
+                        units.append((piece, self.count_tokens(piece), separator, False))
+                        separator = ' '
+                separator = ' '
+        return units
+
+    def _split_words(self, text: str) -> list:
+        """Split an over-long sentence between words."""
+        pieces = []
+        current = []
+        current_tokens = 0
+        for word in text.split():
+            word_tokens = self.count_tokens(word)
+            if current and current_tokens + word_tokens > self.max_tokens:
+                pieces.append(' '.join(current))
+                current, current_tokens = [], 0
+            current.append(word)
+            current_tokens += word_tokens
+        if current:
+            pieces.append(' '.join(current))
+        return pieces
+
+    def _overlap(self, units: list) -> Optional[tuple]:
+        """Build the overlap unit from the tail of a finished chunk."""
+        if not self.overlap_tokens or not units or units[-1][3]:
+            return None  # Never start a chunk with half a code block
+        tail = []
+        tokens = 0
+        for word in reversed(units[-1][0].split()):
+            word_tokens = self.count_tokens(word)
+            if tokens + word_tokens > self.overlap_tokens:
+                break
+            tail.append(word)
+            tokens += word_tokens
+        if not tail:
+            return None
+        return (' '.join(reversed(tail)), tokens, '', False)
+
+    def split(self, text: str) -> list:
+        """Split section text into chunks.
+
+        Args:
+            text: Section text
+
+        Returns:
+            List of chunk strings (empty if the text is blank)
+        """
+        chunks = []
+        current = []
+        current_tokens = 0
+
+        for unit in self._units(text):
+            if current and current_tokens + unit[1] > self.max_tokens:
+                chunks.append(current)
+                overlap = self._overlap(current)
+                current, current_tokens = [], 0
+                if overlap is not None and overlap[1] + unit[1] <= self.max_tokens:
+                    current, current_tokens = [overlap], overlap[1]
+            current.append(unit)
+            current_tokens += unit[1]
+
+        if current:
+            chunks.append(current)
+
+        return [
+            ''.join(unit[0] if i == 0 else unit[2] + unit[0] for i, unit in enumerate(chunk))
+            for chunk in chunks
+        ]
@@ -0,0 +1,129 @@
+"""Circuit breaker that stops calling a dependency while it keeps failing."""
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker with closed, open and half-open states.
+
+    While closed, every call is allowed and its outcome is recorded in a
+    window of the last ``window`` calls. Once at least ``min_calls`` are
+    recorded and the share of failures reaches ``failure_threshold``, the
+    breaker opens and rejects calls. After ``reset_timeout`` seconds it goes
+    half-open and lets a single probe call through: success closes it with
+    a fresh window, failure opens it again. A probe that never reports back
+    (e.g. its request was cancelled) is replaced after another
+    ``reset_timeout``.
+
+    Callers ask allow() before the call and report record_success() or
+    record_failure() after it.
+    """
+
+    def __init__(self, name: str, failure_threshold: float = 0.5, window: int = 20,
+                 min_calls: int = 5, reset_timeout: float = 30.0,
+                 timer: Callable[[], float] = time.monotonic):
+        """Initialize the breaker.
+
+        Args:
+            name: Name used in log messages
+            failure_threshold: Failure rate (0-1) over the window that opens the breaker
+            window: Number of recent calls the failure rate is computed over
+            min_calls: Calls needed in the window before the breaker can open
+            reset_timeout: Seconds the breaker stays open before probing
+            timer: Clock used for the reset timeout (injectable for tests)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # True for failures
+        self.state = CLOSED
+        self._opened_at = None
+        self._probe_started_at = None
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.trips = 0
+
+    def _failure_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def _open(self) -> None:
+        """Move to the open state (caller holds the lock)."""
+        self.state = OPEN
+        self._opened_at = self._timer()
+        self._probe_started_at = None
+        self.trips += 1
+        print(f"Circuit '{self.name}' opened (failure rate {self._failure_rate():.0%})")
+
+    def allow(self) -> bool:
+        """Return whether a call may go through now.
+
+        Returns:
+            True to make the call, False to skip it
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            now = self._timer()
+            if self.state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_started_at = None
+            if self.state == HALF_OPEN and (
+                self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout
+            ):
+                self._probe_started_at = now
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Report a successful call."""
+        with self._lock:
+            self.successes += 1
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._outcomes.clear()
+                print(f"Circuit '{self.name}' closed")
+            self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        """Report a failed call."""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(True)
+            if (self.state == CLOSED and len(self._outcomes) >= self.min_calls
+                    and self._failure_rate() >= self.failure_threshold):
+                self._open()
+
+    def stats(self) -> dict:
+        """Return the state and call counters.
+
+        Returns:
+            Dictionary with state, failure_rate, window_calls, successes,
+            failures, rejected and trips
+        """
+        with self._lock:
+            return {
+                'state': self.state,
+                'failure_rate': self._failure_rate(),
+                'window_calls': len(self._outcomes),
+                'successes': self.successes,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'trips': self.trips
+            }
@@ -0,0 +1,152 @@
+"""Lookup index that resolves course identifiers to chapter names."""
+
+import re
+from collections import defaultdict
+from typing import Optional
+
+_TOKEN_RE = re.compile(r'[a-z]+|\d+')
+_NUMBER_RE = re.compile(r'^(?:chapter|ch|course|lesson)?\s*[#.]?\s*(\d+)$')
+
+# Shared by every chapter name, so useless for telling chapters apart
+_NAME_STOP_TOKENS = {'chapter'}
+
+# Minimum score for a fuzzy match to resolve an identifier
+MIN_MATCH_SCORE = 0.5
+
+
+def _normalize(text: str) -> str:
+    """Lower-case text and collapse everything but letters and digits to spaces."""
+    return ' '.join(_TOKEN_RE.findall(text.lower()))
+
+
+def _tokens(text: str) -> list:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(tokens: list, pad_end: bool) -> set:
+    """Character trigrams of each token, padded at the start (and optionally the end)."""
+    grams = set()
+    for token in tokens:
+        padded = f" {token} " if pad_end else f" {token}"
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class CourseIndex:
+    """Precomputed maps from identifiers to chapter names.
+
+    Built once per course metadata snapshot. Resolving an identifier tries,
+    in order: a chapter number ("3", "chapter 3", "ch3"), an exact
+    normalized title or chapter name, then a fuzzy match. Fuzzy candidates
+    come from token and trigram posting lists, so only chapters sharing
+    something with the identifier are scored; the best one wins, with ties
+    going to the lowest chapter number. Very common trigrams are not used
+    to find candidates, so lookups stay cheap as the catalogue grows.
+    """
+
+    def __init__(self, metadata: dict):
+        """Build the index.
+
+        Args:
+            metadata: Dictionary mapping chapter name to course information
+                ({'number', 'title', ...})
+        """
+        self.by_number = {}
+        self.by_key = {}
+        self._numbers = {}
+        self._tokens = {}
+        self._trigrams = {}
+        self._token_index = defaultdict(set)
+        self._trigram_index = defaultdict(set)
+
+        # Lowest chapter number first, so it wins duplicate numbers and titles
+        for chapter_name, info in sorted(metadata.items(), key=lambda item: (item[1]['number'], item[0])):
+            self._numbers[chapter_name] = info['number']
+            self.by_number.setdefault(info['number'], chapter_name)
+            for key in (_normalize(info['title']), _normalize(chapter_name), chapter_name.lower()):
+                if key:
+                    self.by_key.setdefault(key, chapter_name)
+
+            tokens = {
+                token for token in _tokens(f"{info['title']} {chapter_name}")
+                if token not in _NAME_STOP_TOKENS and not token.isdigit()
+            }
+            trigrams = _trigrams(tokens, pad_end=True)
+            self._tokens[chapter_name] = tokens
+            self._trigrams[chapter_name] = trigrams
+            for token in tokens:
+                self._token_index[token].add(chapter_name)
+            for trigram in trigrams:
+                self._trigram_index[trigram].add(chapter_name)
+
+    def search(self, identifier: str, limit: int = 5) -> list:
+        """Rank chapters by fuzzy similarity to an identifier.
+
+        The score averages the share of identifier tokens found in the
+        chapter (whole-word matches count 1, prefix matches 0.8) and the
+        share of identifier trigrams found in it, so partial words such as
+        "instal" still match "Installation".
+
+        Args:
+            identifier: Course identifier as typed
+            limit: Maximum number of results
+
+        Returns:
+            List of (chapter_name, score) tuples, best first
+        """
+        query_tokens = [token for token in _tokens(identifier) if token not in _NAME_STOP_TOKENS]
+        if not query_tokens:
+            return []
+        query_trigrams = _trigrams(query_tokens, pad_end=False)
+
+        # Trigrams found in many chapters (" th", "ion") would make every
+        # chapter a candidate; they still count when scoring
+        max_postings = max(8, len(self._tokens) // 10)
+        candidates = set()
+        for token in query_tokens:
+            candidates |= self._token_index.get(token, set())
+        for trigram in query_trigrams:
+            postings = self._trigram_index.get(trigram, set())
+            if len(postings) <= max_postings:
+                candidates |= postings
+
+        ranked = []
+        for chapter_name in candidates:
+            tokens = self._tokens[chapter_name]
+            token_score = sum(
+                1.0 if token in tokens else
+                0.8 if any(candidate.startswith(token) for candidate in tokens) else 0.0
+                for token in query_tokens
+            ) / len(query_tokens)
+            trigram_score = len(query_trigrams & self._trigrams[chapter_name]) / len(query_trigrams)
+            score = (token_score + trigram_score) / 2
+            ranked.append((-score, self._numbers[chapter_name], chapter_name))
+
+        ranked.sort()
+        return [(chapter_name, -neg_score) for neg_score, _, chapter_name in ranked[:limit]]
+
+    def resolve(self, identifier: str) -> Optional[str]:
+        """Resolve an identifier to a chapter name.
+
+        Args:
+            identifier: Chapter number, name, title (or part of it), or 'all'
+
+        Returns:
+            Chapter name, 'all', or None if nothing matches well enough
+        """
+        identifier_lower = identifier.lower().strip()
+        if identifier_lower == 'all':
+            return 'all'
+
+        number = _NUMBER_RE.match(identifier_lower)
+        if number:
+            return self.by_number.get(int(number.group(1)))
+
+        exact = self.by_key.get(identifier_lower) or self.by_key.get(_normalize(identifier_lower))
+        if exact:
+            return exact
+
+        ranked = self.search(identifier_lower, limit=1)
+        if ranked and ranked[0][1] >= MIN_MATCH_SCORE:
+            return ranked[0][0]
+        return None
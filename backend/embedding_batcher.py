@@ -0,0 +1,145 @@
+"""Micro-batching scheduler that coalesces concurrent query embeddings."""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """Collect single-text encode requests into batched model calls.
+
+    Callers submit one text at a time from any thread (or from asyncio via
+    ``asyncio.wrap_future``). A single worker thread takes the first pending
+    request, keeps collecting for up to ``max_wait_ms`` or until
+    ``max_batch_size`` texts are queued, encodes them in one call and hands
+    each caller its own vector.
+    """
+
+    def __init__(self, encode_batch: Callable[[list], list], max_batch_size: int = 32,
+                 max_wait_ms: float = 2.0, thread_name: str = "rag-embed"):
+        """Initialize the batcher.
+
+        The worker thread is started lazily on the first submit.
+
+        Args:
+            encode_batch: Function mapping a list of texts to a list of vectors
+            max_batch_size: Maximum number of texts encoded per call
+            max_wait_ms: How long to wait for more texts after the first one
+            thread_name: Name of the worker thread
+        """
+        self._encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._thread_name = thread_name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread, including in a freshly forked child."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                # Threads do not survive fork, and neither should queued work
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,), name=self._thread_name, daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for encoding.
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            Future resolving to the embedding as a list of floats
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, text: str) -> list:
+        """Encode a text, blocking until its batch has been processed.
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            Embedding as a list of floats
+        """
+        return self.submit(text).result()
+
+    def _collect(self, work_queue: queue.Queue, first) -> tuple:
+        """Gather more requests until the batch is full or the wait is over."""
+        batch = [first]
+        stop = False
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                item = work_queue.get(timeout=timeout) if timeout > 0 else work_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+        return batch, stop
+
+    def _run(self, work_queue: queue.Queue) -> None:
+        """Worker loop: collect, encode, dispatch."""
+        while True:
+            first = work_queue.get()
+            if first is _STOP:
+                return
+            batch, stop = self._collect(work_queue, first)
+
+            # Skip requests whose callers have already gone away
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if batch:
+                try:
+                    vectors = self._encode_batch([text for text, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        future.set_exception(e)
+                else:
+                    self.batches += 1
+                    self.items += len(batch)
+                    for (_, future), vector in zip(batch, vectors):
+                        future.set_result(vector.tolist() if hasattr(vector, 'tolist') else list(vector))
+            if stop:
+                return
+
+    def stats(self) -> dict:
+        """Return batching counters.
+
+        Returns:
+            Dictionary with batches, items and average batch size
+        """
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'avg_batch_size': self.items / self.batches if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0
+        }
+
+    def close(self) -> None:
+        """Stop the worker thread after it drains queued requests."""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                self._queue.put(_STOP)
+                self._thread = None
@@ -0,0 +1,156 @@
+"""Persistent on-disk cache of chunk embeddings keyed by model and text hash."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+# SQLite builds before 3.32 cap a statement at 999 bound parameters
+_SQL_PARAM_CHUNK = 500
+
+
+class EmbeddingCache:
+    """SQLite-backed store of embedding vectors.
+
+    Entries are keyed by ``(model_name, sha256(text))`` so the same file can be
+    shared between hosts, restarts and different chunking experiments. The
+    cache holds at most ``max_entries`` vectors; when it grows past that the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        """Initialize the cache.
+
+        The database file is only created on first use.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Maximum number of vectors kept on disk
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Hash a text the way cache keys are built.
+
+        Args:
+            text: Text that is embedded
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, model_name: str, text_hashes: list) -> dict:
+        """Look up cached vectors and mark them as recently used.
+
+        Args:
+            model_name: Embedding model the vectors were produced with
+            text_hashes: Hashes from hash_text()
+
+        Returns:
+            Dictionary mapping each cached hash to its vector (list of floats)
+        """
+        found = {}
+        if not text_hashes:
+            return found
+
+        unique_hashes = list(dict.fromkeys(text_hashes))
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(unique_hashes), _SQL_PARAM_CHUNK):
+                chunk = unique_hashes[i:i+_SQL_PARAM_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model_name] + chunk
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model_name, text_hash) for text_hash in found]
+                )
+                conn.commit()
+
+        return found
+
+    def put_many(self, model_name: str, vectors: dict) -> None:
+        """Store vectors and evict the least recently used overflow.
+
+        Args:
+            model_name: Embedding model the vectors were produced with
+            vectors: Dictionary mapping text hash to vector
+        """
+        if not vectors:
+            return
+
+        now = time.time()
+        rows = [
+            (model_name, text_hash, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text_hash, vector in vectors.items()
+        ]
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete the oldest entries beyond max_entries."""
+        count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used ASC, rowid ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
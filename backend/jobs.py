@@ -0,0 +1,166 @@
+"""Background jobs with progress reporting and cancellation."""
+
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+class JobConflictError(Exception):
+    """Raised when a job is started while another one is still running."""
+
+    def __init__(self, running_job: "Job"):
+        super().__init__(f"Job {running_job.id} is already running")
+        self.running_job = running_job
+
+
+class Job:
+    """State of one background job.
+
+    The job function receives the Job and reports progress through
+    ``report(**counters)``; it should poll ``cancel_event`` and stop early
+    once it is set.
+    """
+
+    def __init__(self, job_id: str, kind: str):
+        self.id = job_id
+        self.kind = kind
+        self.status = "pending"  # pending, running, succeeded, failed, cancelled
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; returns False if timeout expired first."""
+        return self._finished.wait(timeout)
+
+    def report(self, **counters) -> None:
+        """Update progress counters, e.g. report(files_parsed=3, files_total=5)."""
+        with self._lock:
+            self.progress.update(counters)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable snapshot of the job."""
+        with self._lock:
+            return {
+                'job_id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'cancel_requested': self.cancel_event.is_set(),
+                'progress': dict(self.progress),
+                'result': self.result,
+                'error': self.error,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at
+            }
+
+
+class JobManager:
+    """Run jobs one at a time on background threads and keep their history."""
+
+    def __init__(self, max_history: int = 20):
+        """Initialize the manager.
+
+        Args:
+            max_history: Number of finished jobs kept for status queries
+        """
+        self.max_history = max_history
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+
+    def start(self, kind: str, target: Callable[[Job], Optional[dict]]) -> Job:
+        """Start a job unless another one is still running.
+
+        Args:
+            kind: Job type, e.g. "initialize"
+            target: Function run on the job thread; its return value becomes
+                the job result. A result with status "cancelled" or "error"
+                marks the job cancelled or failed.
+
+        Returns:
+            The started Job
+
+        Raises:
+            JobConflictError: If a job is already pending or running
+        """
+        with self._lock:
+            running = self.running_job()
+            if running is not None:
+                raise JobConflictError(running)
+
+            job = Job(f"{next(self._counter)}-{uuid.uuid4().hex[:8]}", kind)
+            self._jobs[job.id] = job
+            self._trim_history()
+
+        thread = threading.Thread(target=self._run, args=(job, target), name=f"job-{job.id}", daemon=True)
+        thread.start()
+        return job
+
+    def _run(self, job: Job, target: Callable[[Job], Optional[dict]]) -> None:
+        """Job thread: run the target and record how it ended."""
+        with job._lock:
+            job.status = "running"
+            job.started_at = time.time()
+        try:
+            result = target(job)
+        except Exception as e:
+            status, result, error = "failed", None, str(e)
+        else:
+            result_status = (result or {}).get('status')
+            if result_status == "cancelled" or job.cancel_event.is_set():
+                status, error = "cancelled", None
+            elif result_status == "error":
+                status, error = "failed", result.get('message')
+            else:
+                status, error = "succeeded", None
+        with job._lock:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+        job._finished.set()
+
+    def _trim_history(self) -> None:
+        """Forget the oldest finished jobs beyond max_history."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(len(self._jobs) - self.max_history, 0)]:
+            del self._jobs[job_id]
+
+    def running_job(self) -> Optional[Job]:
+        """Return the job that is pending or running, if any."""
+        for job in self._jobs.values():
+            if not job.done:
+                return job
+        return None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id."""
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Ask a job to stop.
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            The Job, or None if the id is unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is not None and not job.done:
+            job.cancel_event.set()
+        return job
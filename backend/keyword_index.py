@@ -0,0 +1,131 @@
+"""In-memory BM25 keyword index over document chunks."""
+
+import math
+import re
+from array import array
+from collections import Counter
+
+# Keep identifiers such as tool names, file names and CLI flags intact:
+# "--dangerously-skip-permissions", "search_content", "CLAUDE.md"
+_TOKEN_RE = re.compile(r"-{0,2}[a-z0-9][a-z0-9_.\-/]*[a-z0-9]|[a-z0-9]")
+
+
+def tokenize(text: str) -> list:
+    """Split text into lowercase keyword tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+class KeywordIndex:
+    """Inverted index with BM25 scoring.
+
+    Postings are stored compactly as parallel ``array`` columns of document
+    numbers and term frequencies, and document lengths as an ``array`` too.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.doc_ids = []
+        self._doc_lengths = array('I')
+        self._postings = {}
+        self._total_length = 0
+        self._avg_length = 0.0
+
+    @classmethod
+    def build(cls, documents: dict, **kwargs) -> "KeywordIndex":
+        """Build an index from RAGSystem.documents.
+
+        Args:
+            documents: Mapping of chunk id to chunk dictionary
+            **kwargs: BM25 parameters passed to the constructor
+
+        Returns:
+            Populated KeywordIndex
+        """
+        index = cls(**kwargs)
+        for doc_id, doc in documents.items():
+            index.add(doc_id, f"{doc['chapter']} {doc['title']}\n{doc['content']}")
+        return index
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index one document.
+
+        Args:
+            doc_id: Chunk id
+            text: Text to index
+        """
+        tokens = tokenize(text)
+        doc_num = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self._doc_lengths.append(len(tokens))
+
+        for term, freq in Counter(tokens).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array('I'), array('I'))
+            postings[0].append(doc_num)
+            postings[1].append(freq)
+
+        self._total_length += len(tokens)
+        self._avg_length = self._total_length / len(self.doc_ids)
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def search(self, query: str, top_k: int = 3) -> list:
+        """Score documents against a query with BM25.
+
+        Args:
+            query: Query text
+            top_k: Number of results to return
+
+        Returns:
+            List of (doc_id, score) tuples, best first
+        """
+        if not self.doc_ids:
+            return []
+
+        num_docs = len(self.doc_ids)
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            doc_nums, freqs = postings
+            idf = math.log(1 + (num_docs - len(doc_nums) + 0.5) / (len(doc_nums) + 0.5))
+            for doc_num, freq in zip(doc_nums, freqs):
+                length_norm = 1 - self.b + self.b * self._doc_lengths[doc_num] / self._avg_length
+                scores[doc_num] = scores.get(doc_num, 0.0) + idf * freq * (self.k1 + 1) / (freq + self.k1 * length_norm)
+
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        return [(self.doc_ids[doc_num], score) for doc_num, score in best]
+
+
+def reciprocal_rank_fusion(rankings: list, k: int = 60) -> list:
+    """Fuse several ranked id lists with reciprocal rank fusion.
+
+    Args:
+        rankings: Lists of ids, each ordered best first
+        k: RRF damping constant
+
+    Returns:
+        List of (id, fused_score) tuples, best first
+    """
+    fused = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused.items(), key=lambda item: -item[1])
@@ -0,0 +1,224 @@
+"""Single-pass markdown parser for chapter files, with a per-file cache.
+
+RAGSystem (chunking) and backend.search_tools (course outlines) both read
+the same chapter files. ``parse_file`` reads and scans each file once and
+returns everything either needs:
+
+- ``frontmatter``: parsed YAML frontmatter dictionary ({} if absent/invalid)
+- ``url``: the frontmatter ``url`` field ('' if absent)
+- ``body``: content after the frontmatter
+- ``sections``: (title, text) tuples split on ``##`` headers; text before
+  the first header is titled with the default title
+- ``lessons``: lesson outline, one {number, title} per ``##`` header
+- ``code_blocks``: (start_line, end_line) spans of fenced code blocks, as
+  0-based line numbers within the body, end inclusive
+
+A line is a section header when it starts with exactly two ``#`` followed
+by a title (``## Title`` or ``##Title``, not ``### Title``) and is outside
+a fenced code block.
+
+``parse_file`` results can be persisted across restarts with
+``backend.parse_cache.PersistentParseCache``: ``seed_parse_cache`` loads
+saved entries and ``get_parse_cache_entry`` reads them back for saving.
+
+``corpus_generation`` is a counter bumped whenever the loaded corpus
+changes (a full load or a re-index of changed files); caches derived from
+chapter files can compare it instead of checking every file.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+_HEADER_RE = re.compile(r'^##(?!#)\s*(\S.*)$')
+
+# Bump when parse_markdown output changes so persisted results are discarded
+PARSER_VERSION = 1
+
+# path -> (mtime_ns, size, content_hash, parsed document)
+_parse_cache = {}
+_parse_cache_lock = threading.Lock()
+_corpus_generation = 0
+
+
+def _parse_frontmatter(lines: list) -> dict:
+    """Parse YAML frontmatter lines into a dictionary ({} on any error)."""
+    try:
+        frontmatter = yaml.safe_load('\n'.join(lines))
+    except Exception:
+        return {}
+    return frontmatter if frontmatter and isinstance(frontmatter, dict) else {}
+
+
+def parse_markdown(content: str, default_title: str = "") -> dict:
+    """Parse a markdown document in a single pass over its lines.
+
+    Args:
+        content: Full document content
+        default_title: Title of the section before the first ## header
+
+    Returns:
+        Parsed document dictionary (see module docstring)
+    """
+    lines = content.split('\n')
+    frontmatter_lines = None
+    body_start = 0
+
+    sections = []
+    lessons = []
+    code_blocks = []
+    current_title = default_title
+    current_lines = []
+    in_code_block = False
+    code_start = 0
+
+    # A frontmatter block is only recognised when its closing --- is found;
+    # otherwise the whole document is body
+    if content.startswith('---'):
+        for idx in range(1, len(lines)):
+            if lines[idx].startswith('---'):
+                frontmatter_lines = lines[1:idx]
+                body_start = idx + 1
+                break
+
+    body_lines = lines[body_start:]
+    for line_no, line in enumerate(body_lines):
+        # Track code block boundaries (triple backticks)
+        if line.strip().startswith('```'):
+            if in_code_block:
+                code_blocks.append((code_start, line_no))
+            else:
+                code_start = line_no
+            in_code_block = not in_code_block
+            current_lines.append(line)
+            continue
+
+        header = None if in_code_block else _HEADER_RE.match(line)
+        if header:
+            # Start of new section
+            if current_lines:
+                sections.append((current_title, '\n'.join(current_lines)))
+                current_lines = []
+            current_title = header.group(1).strip()
+            lessons.append({"number": len(lessons) + 1, "title": current_title})
+        else:
+            current_lines.append(line)
+
+    if in_code_block:
+        code_blocks.append((code_start, len(body_lines) - 1))
+
+    # Add final section
+    if current_lines:
+        sections.append((current_title, '\n'.join(current_lines)))
+
+    frontmatter = _parse_frontmatter(frontmatter_lines) if frontmatter_lines is not None else {}
+
+    return {
+        'frontmatter': frontmatter,
+        'url': frontmatter.get('url', ''),
+        'body': '\n'.join(body_lines) if frontmatter_lines is not None else content,
+        'sections': sections,
+        'lessons': lessons,
+        'code_blocks': code_blocks
+    }
+
+
+def parse_file(path: str) -> dict:
+    """Parse a chapter file, reusing the cached result while it is unchanged.
+
+    The cache is keyed by path and validated against the file's mtime and
+    size. When those changed the file is read and hashed, and it is only
+    parsed again if its content hash changed too (a touched or re-checked
+    out file keeps its parse). The returned dictionary is shared and must
+    not be modified.
+
+    Args:
+        path: Path to the markdown file
+
+    Returns:
+        Parsed document dictionary; sections before the first header are
+        titled with the file name without extension
+    """
+    stat = os.stat(path)
+
+    cached = _parse_cache.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[3]
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    content_hash = hashlib.sha256(raw).hexdigest()
+
+    if cached is not None and cached[2] == content_hash:
+        parsed = cached[3]
+    else:
+        parsed = parse_markdown(raw.decode('utf-8'), default_title=Path(path).stem)
+
+    with _parse_cache_lock:
+        _parse_cache[path] = (stat.st_mtime_ns, stat.st_size, content_hash, parsed)
+    return parsed
+
+
+def is_parse_cached(path: str) -> bool:
+    """Check whether parse_file would answer from the cache without reading.
+
+    Args:
+        path: Path to the markdown file
+
+    Returns:
+        True if a cached result matches the file's current mtime and size
+    """
+    cached = _parse_cache.get(path)
+    if cached is None:
+        return False
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return cached[:2] == (stat.st_mtime_ns, stat.st_size)
+
+
+def get_parse_cache_entry(path: str) -> Optional[tuple]:
+    """Return the cached (mtime_ns, size, content_hash, parsed) entry for a path."""
+    return _parse_cache.get(path)
+
+
+def seed_parse_cache(entries: dict) -> None:
+    """Add cache entries produced elsewhere (on disk or in another process).
+
+    Entries are validated by parse_file like any other, so stale ones are
+    harmless.
+
+    Args:
+        entries: Dictionary mapping path to (mtime_ns, size, content_hash, parsed)
+    """
+    with _parse_cache_lock:
+        _parse_cache.update(entries)
+
+
+def clear_parse_cache() -> None:
+    """Forget all cached parse results."""
+    with _parse_cache_lock:
+        _parse_cache.clear()
+
+
+def corpus_generation() -> int:
+    """Return the current corpus generation."""
+    return _corpus_generation
+
+
+def bump_corpus_generation() -> int:
+    """Mark the corpus as changed, invalidating caches keyed on the generation.
+
+    Returns:
+        The new generation
+    """
+    global _corpus_generation
+    with _parse_cache_lock:
+        _corpus_generation += 1
+        return _corpus_generation
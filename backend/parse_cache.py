@@ -0,0 +1,136 @@
+"""Persistent on-disk store of parsed chapter files for fast warm restarts."""
+
+import json
+import os
+import sqlite3
+import threading
+
+from backend.markdown_parser import PARSER_VERSION
+
+
+def _encode(parsed: dict) -> str:
+    """Serialize a parse_markdown result to JSON."""
+    return json.dumps(parsed, ensure_ascii=False, separators=(',', ':'))
+
+
+def _decode(payload: str) -> dict:
+    """Restore a parse_markdown result, turning JSON arrays back into tuples."""
+    parsed = json.loads(payload)
+    parsed['sections'] = [tuple(section) for section in parsed['sections']]
+    parsed['code_blocks'] = [tuple(span) for span in parsed['code_blocks']]
+    return parsed
+
+
+class PersistentParseCache:
+    """SQLite-backed copy of the markdown_parser cache.
+
+    Each row holds one file's parse result (sections, titles, URL, lesson
+    outline) keyed by path and validated by size, mtime and content hash.
+    ``load`` reads every row in one query at startup, so a restart on an
+    unchanged corpus parses no files; ``sync`` writes back only the rows
+    that changed. The file is meant for one chapters directory.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the cache.
+
+        The database file is only created on first use.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        # path -> (mtime_ns, size, content_hash) of the rows on disk
+        self._stored = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS parsed_files (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    parser_version INTEGER NOT NULL,
+                    parsed TEXT NOT NULL
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def load(self) -> dict:
+        """Read every stored parse result in a single query.
+
+        Rows written by another parser version are ignored (and replaced on
+        the next sync).
+
+        Returns:
+            Dictionary mapping path to (mtime_ns, size, content_hash, parsed),
+            ready for markdown_parser.seed_parse_cache()
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT path, mtime_ns, size, content_hash, parser_version, parsed FROM parsed_files"
+            ).fetchall()
+
+        entries = {}
+        stored = {}
+        for path, mtime_ns, size, content_hash, parser_version, payload in rows:
+            if parser_version == PARSER_VERSION:
+                stored[path] = (mtime_ns, size, content_hash)
+                entries[path] = (mtime_ns, size, content_hash, _decode(payload))
+        self._stored = stored
+        return entries
+
+    def sync(self, entries: dict) -> int:
+        """Make the stored rows match the given cache entries.
+
+        Rows are written only for entries whose size, mtime or hash differ
+        from what is on disk; rows for paths not in entries are deleted.
+
+        Args:
+            entries: Dictionary mapping path to (mtime_ns, size, content_hash, parsed)
+
+        Returns:
+            Number of rows written
+        """
+        changed = [
+            (path, entry[0], entry[1], entry[2], PARSER_VERSION, _encode(entry[3]))
+            for path, entry in entries.items()
+            if self._stored.get(path) != entry[:3]
+        ]
+        removed = [(path,) for path in self._stored if path not in entries]
+        if not changed and not removed:
+            return 0
+
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO parsed_files "
+                "(path, mtime_ns, size, content_hash, parser_version, parsed) VALUES (?, ?, ?, ?, ?, ?)",
+                changed
+            )
+            conn.executemany("DELETE FROM parsed_files WHERE path = ?", removed)
+            conn.commit()
+
+        self._stored = {path: entry[:3] for path, entry in entries.items()}
+        return len(changed)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM parsed_files").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
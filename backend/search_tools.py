@@ -2,75 +2,81 @@
 
 import os
 import glob
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import NamedTuple, Optional
 import re
 
-import yaml
+from backend.course_index import CourseIndex
+from backend.markdown_parser import clear_parse_cache, corpus_generation, parse_file, parse_markdown
 
-# Module-level cache for course metadata
-_course_metadata_cache = None
-_cache_file_mtimes = None  # Track file modification times to invalidate cache
+# Course metadata is held in an immutable snapshot that is replaced as a
+# whole, so readers never need a lock and never see a half-built catalogue
+class _MetadataSnapshot(NamedTuple):
+    chapters_dir: str
+    generation: int  # Corpus generation the snapshot was built at
+    file_stamps: tuple  # ((path, mtime_ns, size), ...) of the chapter files
+    metadata: MappingProxyType  # chapter name -> course info (read-only)
+    index: CourseIndex  # Identifier lookups over metadata
+    checked_at: float  # time.monotonic() of the last file check
 
 
-# Tool definitions in Anthropic format
-def _get_chapter_file_mtimes(chapters_dir: str = "data/chapters") -> dict:
-    """Get modification times for all chapter files.
+_metadata_snapshot = None
+_metadata_lock = threading.Lock()  # Serializes rebuilds and file checks
 
-    Args:
-        chapters_dir: Directory containing markdown chapter files
+# Seconds between checks of the chapter files themselves; None relies on the
+# corpus generation alone (set when the chapter watcher is running)
+_revalidate_seconds = 2.0
 
-    Returns:
-        Dictionary mapping file path to modification time
-    """
-    file_mtimes = {}
-    chapter_files = sorted(glob.glob(os.path.join(chapters_dir, "*.md")))
 
-    for chapter_path in chapter_files:
-        try:
-            mtime = os.path.getmtime(chapter_path)
-            file_mtimes[chapter_path] = mtime
-        except OSError:
-            pass
-
-    return file_mtimes
+def configure_outline_cache(revalidate_seconds: Optional[float]) -> None:
+    """Set how often the course metadata cache re-checks the chapter files.
 
+    Args:
+        revalidate_seconds: Seconds between file checks, or None to only
+            invalidate when the corpus generation changes
+    """
+    global _revalidate_seconds
+    _revalidate_seconds = revalidate_seconds
 
-def _cache_is_valid(chapters_dir: str = "data/chapters") -> bool:
-    """Check if cached course metadata is still valid.
 
-    Cache is invalid if:
-    - No cache exists
-    - Files have been added/removed
-    - Files have been modified
+def _get_chapter_file_stamps(chapters_dir: str = "data/chapters") -> tuple:
+    """Get the modification time and size of every chapter file.
 
     Args:
         chapters_dir: Directory containing markdown chapter files
 
     Returns:
-        True if cache is valid, False otherwise
+        Tuple of (path, mtime_ns, size) tuples in path order
     """
-    global _cache_file_mtimes
+    stamps = []
+    for chapter_path in sorted(glob.glob(os.path.join(chapters_dir, "*.md"))):
+        try:
+            stat = os.stat(chapter_path)
+        except OSError:
+            continue
+        stamps.append((chapter_path, stat.st_mtime_ns, stat.st_size))
+    return tuple(stamps)
 
-    if _course_metadata_cache is None:
-        return False
 
-    current_mtimes = _get_chapter_file_mtimes(chapters_dir)
+def _snapshot_is_fresh(snapshot: Optional[_MetadataSnapshot], chapters_dir: str) -> bool:
+    """Check a snapshot without touching the file system.
 
-    if _cache_file_mtimes is None:
-        return False
+    Args:
+        snapshot: Current snapshot, or None
+        chapters_dir: Directory the caller wants metadata for
 
-    # Check if files have changed
-    if set(current_mtimes.keys()) != set(_cache_file_mtimes.keys()):
-        # Files added or removed
+    Returns:
+        True if the snapshot can be served as is
+    """
+    if snapshot is None or snapshot.chapters_dir != chapters_dir:
         return False
-
-    # Check if any file was modified
-    for filepath, current_mtime in current_mtimes.items():
-        if _cache_file_mtimes.get(filepath) != current_mtime:
-            return False
-
-    return True
+    if snapshot.generation != corpus_generation():
+        return False
+    return (_revalidate_seconds is None or
+            time.monotonic() - snapshot.checked_at < _revalidate_seconds)
 
 
 TOOLS = [
@@ -110,54 +116,99 @@ TOOLS = [
 ]
 
 
-def _load_course_metadata(chapters_dir: str = "data/chapters") -> dict:
+def _load_course_metadata(chapters_dir: str = "data/chapters") -> MappingProxyType:
     """Load and cache course metadata from markdown files.
 
-    Cache is automatically invalidated when files are modified.
-
     Args:
         chapters_dir: Directory containing markdown chapter files
 
     Returns:
-        Dictionary mapping chapter names to course information
+        Read-only mapping of chapter names to course information (the
+        course dictionaries are shared and must not be modified)
     """
-    global _course_metadata_cache, _cache_file_mtimes
+    return _load_course_snapshot(chapters_dir).metadata
 
-    # Check if cached data is still valid
-    if _cache_is_valid(chapters_dir):
-        return _course_metadata_cache
 
-    metadata = {}
-    chapter_files = sorted(glob.glob(os.path.join(chapters_dir, "*.md")))
+def _load_course_snapshot(chapters_dir: str = "data/chapters") -> _MetadataSnapshot:
+    """Return the current course metadata snapshot, rebuilding it if stale.
 
-    for chapter_path in chapter_files:
-        chapter_name = Path(chapter_path).stem
+    Most calls return the current snapshot after an in-memory check. The
+    chapter files are only stat'ed once per revalidation interval, by one
+    thread at a time; concurrent callers keep getting the current snapshot
+    meanwhile. The snapshot is rebuilt when the files or the corpus
+    generation changed.
 
-        with open(chapter_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Extract YAML frontmatter
-        frontmatter = _extract_frontmatter(content)
+    Args:
+        chapters_dir: Directory containing markdown chapter files
 
-        # Extract lessons from ## headers
-        lessons = _extract_lessons(content)
+    Returns:
+        Snapshot holding the metadata and its identifier index
+    """
+    global _metadata_snapshot
 
-        # Parse chapter number from filename (chapter1_... -> 1)
-        chapter_num_match = re.search(r'chapter(\d+)', chapter_name)
-        chapter_num = int(chapter_num_match.group(1)) if chapter_num_match else 0
+    snapshot = _metadata_snapshot
+    if _snapshot_is_fresh(snapshot, chapters_dir):
+        return snapshot
 
-        metadata[chapter_name] = {
-            "id": chapter_name,
-            "number": chapter_num,
-            "title": frontmatter.get('title', chapter_name),
-            "url": frontmatter.get('url', ''),
-            "lesson_count": len(lessons),
-            "lessons": lessons
-        }
+    if snapshot is not None and snapshot.chapters_dir == chapters_dir:
+        # Another thread is already checking or rebuilding; serve the
+        # current snapshot rather than queue behind it
+        if not _metadata_lock.acquire(blocking=False):
+            return snapshot
+    else:
+        _metadata_lock.acquire()
 
-    _course_metadata_cache = metadata
-    _cache_file_mtimes = _get_chapter_file_mtimes(chapters_dir)
-    return metadata
+    try:
+        snapshot = _metadata_snapshot
+        if _snapshot_is_fresh(snapshot, chapters_dir):
+            return snapshot
+
+        # Read before parsing, so a re-index that lands mid-build invalidates it
+        generation = corpus_generation()
+        file_stamps = _get_chapter_file_stamps(chapters_dir)
+
+        if (snapshot is not None and snapshot.chapters_dir == chapters_dir and
+                snapshot.generation == generation and snapshot.file_stamps == file_stamps):
+            # Nothing changed; just restart the revalidation interval
+            _metadata_snapshot = snapshot._replace(checked_at=time.monotonic())
+            return _metadata_snapshot
+
+        metadata = {}
+        for chapter_path, _, _ in file_stamps:
+            chapter_name = Path(chapter_path).stem
+
+            # Frontmatter and lessons (## headers) come from the shared parse cache
+            try:
+                parsed = parse_file(chapter_path)
+            except FileNotFoundError:
+                continue  # Deleted since it was listed
+            frontmatter = parsed['frontmatter']
+            lessons = parsed['lessons']
+
+            # Parse chapter number from filename (chapter1_... -> 1)
+            chapter_num_match = re.search(r'chapter(\d+)', chapter_name)
+            chapter_num = int(chapter_num_match.group(1)) if chapter_num_match else 0
+
+            metadata[chapter_name] = {
+                "id": chapter_name,
+                "number": chapter_num,
+                "title": frontmatter.get('title', chapter_name),
+                "url": frontmatter.get('url', ''),
+                "lesson_count": len(lessons),
+                "lessons": lessons
+            }
+
+        _metadata_snapshot = _MetadataSnapshot(
+            chapters_dir=chapters_dir,
+            generation=generation,
+            file_stamps=file_stamps,
+            metadata=MappingProxyType(metadata),
+            index=CourseIndex(metadata),
+            checked_at=time.monotonic()
+        )
+        return _metadata_snapshot
+    finally:
+        _metadata_lock.release()
 
 
 def _extract_frontmatter(content: str) -> dict:
@@ -169,28 +220,7 @@ def _extract_frontmatter(content: str) -> dict:
     Returns:
         Dictionary with frontmatter fields
     """
-    if not content.startswith('---'):
-        return {}
-
-    try:
-        lines = content.split('\n')
-        end_idx = -1
-        for i in range(1, len(lines)):
-            if lines[i].startswith('---'):
-                end_idx = i
-                break
-
-        if end_idx == -1:
-            return {}
-
-        yaml_content = '\n'.join(lines[1:end_idx])
-        frontmatter = yaml.safe_load(yaml_content)
-
-        if frontmatter and isinstance(frontmatter, dict):
-            return frontmatter
-        return {}
-    except Exception:
-        return {}
+    return parse_markdown(content)['frontmatter']
 
 
 def _extract_lessons(content: str) -> list:
@@ -202,64 +232,22 @@ def _extract_lessons(content: str) -> list:
     Returns:
         List of lesson dictionaries with number and title
     """
-    # Remove frontmatter first
-    if content.startswith('---'):
-        lines = content.split('\n')
-        for i in range(1, len(lines)):
-            if lines[i].startswith('---'):
-                content = '\n'.join(lines[i+1:])
-                break
-
-    lessons = []
-    lesson_num = 1
-
-    for line in content.split('\n'):
-        if line.startswith('## '):
-            title = line.replace('## ', '').strip()
-            lessons.append({
-                "number": lesson_num,
-                "title": title
-            })
-            lesson_num += 1
-
-    return lessons
+    return parse_markdown(content)['lessons']
 
 
 def _normalize_course_identifier(course_identifier: str) -> Optional[str]:
     """Normalize course identifier to chapter name.
 
+    Uses the lookup index built with the metadata snapshot: chapter number,
+    exact title or name, then the best-ranked fuzzy match.
+
     Args:
         course_identifier: Chapter number, name, or 'all'
 
     Returns:
         Chapter name or None if not found
     """
-    metadata = _load_course_metadata()
-    identifier_lower = course_identifier.lower().strip()
-
-    # Special case: 'all'
-    if identifier_lower == 'all':
-        return 'all'
-
-    # Try matching by chapter number
-    try:
-        chapter_num = int(identifier_lower)
-        for chapter_name, info in metadata.items():
-            if info['number'] == chapter_num:
-                return chapter_name
-    except ValueError:
-        pass
-
-    # Try fuzzy matching by name
-    for chapter_name, info in metadata.items():
-        title_lower = info['title'].lower()
-        # Check if identifier is in title or title is in identifier
-        if (identifier_lower in title_lower or
-            title_lower.find(identifier_lower) != -1 or
-            chapter_name.lower().find(identifier_lower) != -1):
-            return chapter_name
-
-    return None
+    return _load_course_snapshot().index.resolve(course_identifier)
 
 
 def search_content(query: str, top_k: int = 3, rag_system=None) -> dict:
@@ -317,7 +305,8 @@ def get_course_outline(course_identifier: str) -> dict:
     Returns:
         Dictionary with course information
     """
-    metadata = _load_course_metadata()
+    snapshot = _load_course_snapshot()
+    metadata = snapshot.metadata
 
     # Handle 'all' case
     if course_identifier.lower() == 'all':
@@ -338,15 +327,15 @@ def get_course_outline(course_identifier: str) -> dict:
         }
 
     # Find matching chapter
-    matched_chapter = _normalize_course_identifier(course_identifier)
+    matched_chapter = snapshot.index.resolve(course_identifier)
 
     if matched_chapter is None:
-        # Return error with available courses
+        # Return error with available courses and the closest near misses
         available = sorted(
             [(info['number'], info['title'], name) for name, info in metadata.items()],
             key=lambda x: x[0]
         )
-        return {
+        result = {
             "error": f"No course found matching '{course_identifier}'",
             "available_courses": [
                 {
@@ -357,6 +346,10 @@ def get_course_outline(course_identifier: str) -> dict:
                 for num, title, name in available
             ]
         }
+        suggestions = snapshot.index.search(course_identifier, limit=3)
+        if suggestions:
+            result["suggestions"] = [name for name, _ in suggestions]
+        return result
 
     # Return matched course
     info = metadata[matched_chapter]
@@ -407,7 +400,8 @@ def execute_tool(tool_name: str, tool_input: dict, rag_system=None) -> dict:
 
 
 def clear_course_cache():
-    """Clear the course metadata cache and file modification times."""
-    global _course_metadata_cache, _cache_file_mtimes
-    _course_metadata_cache = None
-    _cache_file_mtimes = None
+    """Clear the course metadata snapshot and parsed files."""
+    global _metadata_snapshot
+    with _metadata_lock:
+        _metadata_snapshot = None
+    clear_parse_cache()
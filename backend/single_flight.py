@@ -0,0 +1,85 @@
+"""Coalesce concurrent identical async calls into one execution."""
+
+import asyncio
+from typing import Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Share one in-flight execution between concurrent callers of the same key.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs wait on that task and get the same result or exception.
+    Callers wait through a shield, so a cancelled caller (a client that
+    disconnected) stops waiting without cancelling the work for the others;
+    the work is only cancelled once every caller has gone. A key is
+    forgotten as soon as its work finishes, so results are never reused by
+    later calls and failures are retried by the next caller.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self):
+        """Initialize the group."""
+        # key -> [task, number of callers waiting on it]
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key, [None])[0] is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved even if every caller left
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable]):
+        """Run factory() for key, or join the execution already in flight.
+
+        Args:
+            key: Identity of the call; callers with equal keys share a result
+            factory: Returns the awaitable doing the work (only called when
+                nothing is in flight for key)
+
+        Returns:
+            Result of the shared execution
+
+        Raises:
+            Whatever the shared execution raised
+        """
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(factory())
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        task = call[0]
+        call[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            call[1] -= 1
+            if call[1] == 0 and not task.done():
+                # Every caller was cancelled; nobody is left to use the result
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                task.cancel()
+                self.abandoned += 1
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict:
+        """Return execution counters.
+
+        Returns:
+            Dictionary with in_flight, executions, coalesced and abandoned
+        """
+        return {
+            'in_flight': len(self._calls),
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'abandoned': self.abandoned
+        }
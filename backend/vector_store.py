@@ -0,0 +1,303 @@
+"""Vector store backends that can sit behind RAGSystem.collection.
+
+RAGSystem talks to its vector store through the small subset of the
+ChromaDB ``Collection`` API it needs: ``count``, ``get``, ``add``,
+``upsert``, ``delete`` and ``query``. A ChromaDB collection satisfies it
+directly; ``NumpyVectorStore`` is an in-process alternative for corpora
+that fit in RAM.
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+VECTOR_BACKENDS = ("chroma", "numpy")
+
+
+class VectorStore(ABC):
+    """Interface shared by the vector store backends."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of stored records."""
+
+    @abstractmethod
+    def get(self, ids: Optional[list] = None, include: Optional[list] = None) -> dict:
+        """Fetch stored records by id, or all records when ids is None."""
+
+    @abstractmethod
+    def add(self, ids: list, embeddings: list, documents: list, metadatas: list) -> None:
+        """Add records, leaving ids that already exist untouched."""
+
+    @abstractmethod
+    def upsert(self, ids: list, embeddings: list, documents: list, metadatas: list) -> None:
+        """Add records, replacing any that already exist."""
+
+    @abstractmethod
+    def delete(self, ids: list) -> None:
+        """Delete records by id."""
+
+    def flush(self) -> None:
+        """Persist pending writes (no-op for stores that write through)."""
+
+    @abstractmethod
+    def query(self, query_embeddings: list, n_results: int = 10, include: Optional[list] = None) -> dict:
+        """Return the nearest records for each query embedding."""
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so a dot product is a cosine similarity."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class NumpyVectorStore(VectorStore):
+    """Exact cosine-similarity index held in a normalised float32 matrix.
+
+    Top-k search is one matrix product plus ``argpartition``, and a batch of
+    queries is answered with a single product. Readers work on an immutable
+    snapshot that writers replace wholesale, so searches never take a lock.
+    When ``path`` is set the index is persisted as ``vectors.npy`` (loaded
+    memory-mapped) plus ``records.json`` with ids, documents and metadata.
+
+    Writes only change the in-memory snapshot and flush() persists it, so a
+    build that adds many batches writes the files once. Appended vectors go
+    into a matrix with spare capacity, so adding N rows in batches copies
+    each row a constant number of times on average.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    RECORDS_FILE = "records.json"
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the store, loading a persisted index if one exists.
+
+        Args:
+            path: Directory holding the persisted index, or None for in-memory only
+        """
+        self.path = path
+        self._write_lock = threading.Lock()
+        # (matrix, ids, documents, metadatas, row_by_id)
+        self._state = (np.zeros((0, 0), dtype=np.float32), [], [], [], {})
+        # Writable matrix whose first count() rows back self._state; rows
+        # past them are free capacity no snapshot can see
+        self._buffer = None
+        self._dirty = False
+
+        if path and os.path.exists(os.path.join(path, self.RECORDS_FILE)):
+            self._load()
+
+    def _load(self) -> None:
+        """Load the persisted index; the matrix stays memory-mapped."""
+        with open(os.path.join(self.path, self.RECORDS_FILE), 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        matrix = np.load(os.path.join(self.path, self.VECTORS_FILE), mmap_mode='r')
+
+        ids = records['ids']
+        if matrix.shape[0] != len(ids):
+            raise ValueError(f"Corrupt vector index in {self.path}: {matrix.shape[0]} vectors for {len(ids)} ids")
+
+        self._state = (
+            matrix, ids, records['documents'], records['metadatas'],
+            {doc_id: row for row, doc_id in enumerate(ids)}
+        )
+
+    def _save(self, state: tuple) -> None:
+        """Persist a snapshot into self.path.
+
+        Each file is replaced atomically, but not the two together: a reader
+        loading the directory while this runs can pair the new vectors with
+        the old records. Only save into a directory no other process loads
+        from yet (see save_to()).
+        """
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        matrix, ids, documents, metadatas, _ = state
+
+        vectors_path = os.path.join(self.path, self.VECTORS_FILE)
+        with open(vectors_path + ".tmp", 'wb') as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+        os.replace(vectors_path + ".tmp", vectors_path)
+
+        records_path = os.path.join(self.path, self.RECORDS_FILE)
+        with open(records_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({'ids': ids, 'documents': documents, 'metadatas': metadatas}, f)
+        os.replace(records_path + ".tmp", records_path)
+
+    def count(self) -> int:
+        return len(self._state[1])
+
+    def get(self, ids: Optional[list] = None, include: Optional[list] = None) -> dict:
+        """Fetch stored records.
+
+        Args:
+            ids: Ids to fetch (unknown ids are skipped), or None for all
+            include: Fields to return: 'documents', 'metadatas', 'embeddings'
+                (default documents and metadatas)
+
+        Returns:
+            ChromaDB-style dictionary of parallel lists
+        """
+        matrix, all_ids, documents, metadatas, row_by_id = self._state
+        include = include if include is not None else ['documents', 'metadatas']
+
+        if ids is None:
+            rows = list(range(len(all_ids)))
+        else:
+            rows = [row_by_id[doc_id] for doc_id in ids if doc_id in row_by_id]
+
+        result = {'ids': [all_ids[row] for row in rows]}
+        result['documents'] = [documents[row] for row in rows] if 'documents' in include else None
+        result['metadatas'] = [metadatas[row] for row in rows] if 'metadatas' in include else None
+        result['embeddings'] = [matrix[row].tolist() for row in rows] if 'embeddings' in include else None
+        return result
+
+    def _append_rows(self, matrix: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        """Return matrix's rows followed by vectors (caller holds the write lock).
+
+        Rows are written into spare capacity of the buffer when matrix is its
+        prefix, so earlier snapshots are never modified.
+        """
+        used = matrix.shape[0]
+        needed = used + vectors.shape[0]
+        buffer = self._buffer
+        if buffer is None or matrix.base is not buffer or buffer.shape[0] < needed:
+            buffer = np.empty((max(needed, 2 * used, 64), vectors.shape[1]), dtype=np.float32)
+            buffer[:used] = matrix
+            self._buffer = buffer
+        buffer[used:needed] = vectors
+        return buffer[:needed]
+
+    def _write(self, ids: list, embeddings: list, documents: list, metadatas: list,
+               overwrite: bool) -> None:
+        """Insert records, optionally overwriting existing ids."""
+        if not ids:
+            return
+        vectors = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+
+        with self._write_lock:
+            matrix, old_ids, old_documents, old_metadatas, row_by_id = self._state
+            if not len(old_ids):
+                matrix = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            all_ids, all_documents, all_metadatas = list(old_ids), list(old_documents), list(old_metadatas)
+            row_by_id = dict(row_by_id)
+            new_rows = []
+            replaced = {}
+
+            for i, doc_id in enumerate(ids):
+                row = row_by_id.get(doc_id)
+                if row is not None:
+                    if overwrite:
+                        replaced[row] = i
+                        all_documents[row] = documents[i]
+                        all_metadatas[row] = metadatas[i]
+                    continue
+                row_by_id[doc_id] = len(all_ids)
+                all_ids.append(doc_id)
+                all_documents.append(documents[i])
+                all_metadatas.append(metadatas[i])
+                new_rows.append(i)
+
+            if replaced:
+                # Rows visible to readers are never changed in place
+                matrix = np.array(matrix, dtype=np.float32)
+                matrix[list(replaced)] = vectors[list(replaced.values())]
+            if new_rows:
+                matrix = self._append_rows(matrix, vectors[new_rows])
+
+            self._state = (matrix, all_ids, all_documents, all_metadatas, row_by_id)
+            self._dirty = True
+
+    def add(self, ids: list, embeddings: list, documents: list, metadatas: list) -> None:
+        """Add records; ids that already exist are left untouched (as in ChromaDB)."""
+        self._write(ids, embeddings, documents, metadatas, overwrite=False)
+
+    def upsert(self, ids: list, embeddings: list, documents: list, metadatas: list) -> None:
+        """Add records, replacing any that already exist."""
+        self._write(ids, embeddings, documents, metadatas, overwrite=True)
+
+    def delete(self, ids: list) -> None:
+        """Delete records by id; unknown ids are ignored."""
+        with self._write_lock:
+            matrix, old_ids, documents, metadatas, row_by_id = self._state
+            doomed = {row_by_id[doc_id] for doc_id in ids if doc_id in row_by_id}
+            if not doomed:
+                return
+
+            keep = [row for row in range(len(old_ids)) if row not in doomed]
+            new_ids = [old_ids[row] for row in keep]
+            state = (
+                np.array(matrix[keep], dtype=np.float32),
+                new_ids,
+                [documents[row] for row in keep],
+                [metadatas[row] for row in keep],
+                {doc_id: row for row, doc_id in enumerate(new_ids)}
+            )
+            self._state = state
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Persist the current snapshot if it changed since the last flush."""
+        with self._write_lock:
+            if self._dirty:
+                self._save(self._state)
+                self._dirty = False
+
+    def save_to(self, path: str) -> None:
+        """Persist the current snapshot into a new directory and keep using it.
+
+        Lets a live store publish its changes without rewriting the files
+        other processes may be loading: the caller points readers at path
+        once this returns.
+
+        Args:
+            path: Directory to write the index to
+        """
+        with self._write_lock:
+            self.path = path
+            self._save(self._state)
+            self._dirty = False
+
+    def query(self, query_embeddings: list, n_results: int = 10, include: Optional[list] = None) -> dict:
+        """Return the n_results nearest records for each query embedding.
+
+        Args:
+            query_embeddings: One or more query vectors
+            n_results: Number of results per query
+            include: Accepted for ChromaDB compatibility; documents, metadatas
+                and distances are always returned
+
+        Returns:
+            ChromaDB-style dictionary of per-query lists; distances are cosine
+            distances (1 - cosine similarity)
+        """
+        matrix, ids, documents, metadatas, _ = self._state
+        num_queries = len(query_embeddings)
+        k = min(n_results, len(ids))
+        if k == 0:
+            return {key: [[] for _ in range(num_queries)] for key in ('ids', 'documents', 'metadatas', 'distances')}
+
+        queries = _normalize_rows(np.asarray(query_embeddings, dtype=np.float32))
+        scores = queries @ matrix.T
+
+        if k < len(ids):
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(len(ids)), (num_queries, 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return {
+            'ids': [[ids[row] for row in rows] for rows in top],
+            'documents': [[documents[row] for row in rows] for rows in top],
+            'metadatas': [[metadatas[row] for row in rows] for rows in top],
+            'distances': (1.0 - top_scores).tolist()
+        }
@@ -0,0 +1,181 @@
+"""Watch the chapters directory and report changed files in debounced batches."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Optional
+
+# inotify(7) event flags
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_WATCH_MASK = _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+
+# struct inotify_event header: wd, mask, cookie, len (name follows)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _open_inotify(directory: str) -> Optional[int]:
+    """Open a non-blocking inotify descriptor watching a directory.
+
+    Returns:
+        The file descriptor, or None where inotify is unavailable
+    """
+    libc_name = ctypes.util.find_library('c')
+    if not libc_name:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        init = libc.inotify_init1
+        add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None  # Not Linux
+
+    fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    if add_watch(fd, os.fsencode(directory), _WATCH_MASK) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class ChapterWatcher:
+    """Background watcher for ``*.md`` files in one directory.
+
+    Uses inotify where available and falls back to polling the directory
+    every ``poll_interval`` seconds. Changes are collected until none have
+    arrived for ``debounce`` seconds (an editor save or a ``git checkout``
+    produces bursts), then ``on_change`` is called once with the set of
+    affected paths (created, modified or deleted), joined onto the directory
+    the same way ``glob`` would. If ``on_change`` raises, the paths are kept
+    and retried after the next debounce period.
+    """
+
+    def __init__(self, directory: str, on_change: Callable[[set], None],
+                 debounce: float = 1.0, poll_interval: float = 2.0,
+                 use_inotify: bool = True):
+        """Initialize the watcher.
+
+        Args:
+            directory: Directory to watch (not recursive)
+            on_change: Callback receiving the set of changed file paths
+            debounce: Quiet period in seconds before changes are reported
+            poll_interval: Seconds between directory scans in polling mode
+            use_inotify: Set False to force polling
+        """
+        self.directory = directory
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend = None  # "inotify" or "polling" once started
+        self.batches = 0
+        self._pending = set()
+        self._last_event = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> "ChapterWatcher":
+        """Start watching on a daemon thread."""
+        fd = _open_inotify(self.directory) if self.use_inotify else None
+        self.backend = "inotify" if fd is not None else "polling"
+        # Take the first snapshot before returning, so changes made right
+        # after start() are not mistaken for the initial state
+        snapshot = self._scan() if fd is None else None
+        self._thread = threading.Thread(
+            target=self._run, args=(fd, snapshot), name="chapter-watcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching and wait for the thread to exit."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _scan(self) -> dict:
+        """Map each markdown file in the directory to its (mtime_ns, size)."""
+        snapshot = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return snapshot
+        for entry in entries:
+            if entry.name.endswith('.md'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                snapshot[os.path.join(self.directory, entry.name)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _add_pending(self, paths) -> None:
+        if paths:
+            self._pending.update(paths)
+            self._last_event = time.monotonic()
+
+    def _read_events(self, fd: int) -> set:
+        """Drain queued inotify events into a set of changed paths."""
+        paths = set()
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return paths
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += name_len
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped; every file may have changed
+                paths.update(self._scan())
+            elif name.endswith('.md'):
+                paths.add(os.path.join(self.directory, name))
+        return paths
+
+    def _flush(self) -> None:
+        """Report pending changes once the debounce period has passed."""
+        if not self._pending or time.monotonic() - self._last_event < self.debounce:
+            return
+        paths, self._pending = self._pending, set()
+        try:
+            self.on_change(paths)
+            self.batches += 1
+        except Exception as e:
+            print(f"Chapter watcher: change handler failed ({e}), retrying")
+            self._add_pending(paths)
+
+    def _run(self, fd: Optional[int], snapshot: Optional[dict]) -> None:
+        next_poll = time.monotonic() + self.poll_interval
+        try:
+            while not self._stop_event.is_set():
+                wait = self.debounce if self._pending else 0.5
+                if fd is not None:
+                    readable, _, _ = select.select([fd], [], [], wait)
+                    if readable:
+                        self._add_pending(self._read_events(fd))
+                else:
+                    self._stop_event.wait(min(wait, max(0.0, next_poll - time.monotonic())))
+                    if time.monotonic() >= next_poll:
+                        current = self._scan()
+                        self._add_pending({
+                            path for path in snapshot.keys() | current.keys()
+                            if snapshot.get(path) != current.get(path)
+                        })
+                        snapshot = current
+                        next_poll = time.monotonic() + self.poll_interval
+                self._flush()
+        finally:
+            if fd is not None:
+                os.close(fd)
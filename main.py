@@ -1,13 +1,22 @@
+import gc
+import json
 import os
+import signal
+import socket
+import threading
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
-from rag_system import RAGSystem
+from backend.jobs import JobConflictError, JobManager
+from backend.search_tools import configure_outline_cache
+from backend.watcher import ChapterWatcher
+from rag_system import RETRIEVAL_MODES, RAGSystem
 
 # Load environment variables
 load_dotenv()
@@ -18,6 +27,19 @@ app = FastAPI(title="Claude Code RAG Chatbot", version="1.0.0")
 # Initialize RAG system (global instance)
 rag_system = None
 
+# Set if the background warm-up failed
+warm_up_error = None
+
+# Index rebuilds run as background jobs, one at a time
+index_jobs = JobManager()
+
+# Watches data/chapters and re-indexes changed files (see _start_watcher)
+chapter_watcher = None
+
+# Whether this process builds new index generations for watched changes;
+# in pre-fork mode only one worker does, the others refresh their documents
+index_owner = True
+
 # Constants for input validation
 MAX_QUESTION_LENGTH = 5000  # Maximum question length in characters
 
@@ -26,6 +48,7 @@ class QueryRequest(BaseModel):
     """Request model for chat queries."""
     question: str
     use_tools: bool = True
+    retrieval_mode: Optional[str] = None  # "vector", "keyword" or "hybrid"
 
 
 class Source(BaseModel):
@@ -40,28 +63,117 @@ class QueryResponse(BaseModel):
     sources: list[Source]
     context_count: int
     tool_calls: list[dict] = []
+    cached: bool = False
+    similarity: Optional[float] = None  # Set when the answer came from the answer cache
+
+
+def _create_rag_system() -> RAGSystem:
+    """Create the RAG system from environment configuration."""
+    return RAGSystem(
+        vector_backend=os.getenv("VECTOR_BACKEND", "chroma"),
+        chunk_strategy=os.getenv("CHUNK_STRATEGY", "sections")
+    )
+
+
+def _warm_up():
+    """Load models and make sure the index is built (runs on a background thread)."""
+    global warm_up_error
+
+    try:
+        rag_system.warm_up("data/chapters", build_index=_build_initial_index)
+        print("RAG system ready")
+    except Exception as e:
+        warm_up_error = str(e)
+        print(f"Error warming up RAG system: {e}")
+        return
+
+    if os.getenv("WATCH_CHAPTERS", "1") == "1":
+        _start_watcher()
+
+
+def _build_initial_index() -> dict:
+    """Build the empty index as an "initialize" job and wait for it.
+
+    Going through index_jobs means POST /api/initialize gets a 409 instead of
+    starting a second build alongside this one; if a rebuild was requested
+    first, warm-up waits for that one instead.
+
+    Returns:
+        The build's status dictionary
+    """
+    def run(job):
+        return rag_system.initialize("data/chapters", progress=job.report, cancel_event=job.cancel_event)
+
+    try:
+        job = index_jobs.start("initialize", run)
+    except JobConflictError as e:
+        job = e.running_job
+    job.wait()
+    return job.result or {'status': 'error', 'message': job.error or "Index build did not finish"}
+
+
+def _on_chapters_changed(paths: set):
+    """Re-index chapter files that changed on disk (called by the watcher).
+
+    Raises:
+        JobConflictError: If a rebuild is already running; the watcher
+            retries the same files after its debounce period
+    """
+    print(f"Chapter files changed: {', '.join(sorted(Path(p).name for p in paths))}")
+
+    # Workers that do not own the index only refresh their documents, but
+    # still as a job so they never overlap a rebuild started through the API
+    def run(job):
+        return rag_system.reindex_files(
+            paths, "data/chapters", embed=index_owner, progress=job.report, cancel_event=job.cancel_event
+        )
+
+    index_jobs.start("reindex", run)
+
+
+def _start_watcher():
+    """Start watching data/chapters for created, modified and deleted files."""
+    global chapter_watcher
+
+    chapter_watcher = ChapterWatcher(
+        "data/chapters",
+        _on_chapters_changed,
+        debounce=float(os.getenv("WATCH_DEBOUNCE_SECONDS", 1.0))
+    ).start()
+    print(f"Watching data/chapters for changes ({chapter_watcher.backend})")
+    # Every change now bumps the corpus generation, so the course outline
+    # cache no longer needs to check the files itself
+    configure_outline_cache(None)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize RAG system on startup."""
+    """Create the RAG system and start warming it up in the background.
+
+    Construction is cheap (heavy components are built lazily), so the server
+    binds its port immediately; /api/ready reports when warm-up is done.
+    """
     global rag_system
 
     try:
-        rag_system = RAGSystem()
-
-        # Check if ChromaDB already has data
-        if rag_system.collection.count() == 0:
-            print("Loading and embedding documents...")
-            result = rag_system.initialize("data/chapters")
-            print(result['message'])
-        else:
-            print(f"ChromaDB already initialized with {rag_system.collection.count()} documents")
-
+        # A pre-fork master has already created (and preloaded) the system
+        if rag_system is None:
+            rag_system = _create_rag_system()
     except Exception as e:
         print(f"Error initializing RAG system: {e}")
         raise
 
+    threading.Thread(target=_warm_up, name="rag-warm-up", daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the chapter watcher and release RAG system worker threads on shutdown."""
+    if chapter_watcher is not None:
+        chapter_watcher.stop()
+    if rag_system is not None:
+        rag_system.shutdown()
+
 
 @app.get("/")
 async def root():
@@ -71,28 +183,60 @@ async def root():
 
 @app.get("/api/health")
 async def health():
-    """Health check endpoint."""
+    """Liveness check endpoint; see /api/ready for readiness."""
     return {
         "status": "healthy",
         "service": "Claude Code RAG Chatbot",
-        "rag_initialized": rag_system is not None and rag_system.collection.count() > 0
+        "rag_initialized": rag_system is not None and bool(rag_system.is_ready())
     }
 
 
-@app.post("/api/query")
-async def query(request: QueryRequest):
-    """Handle chat queries using RAG system.
+@app.get("/api/ready")
+async def ready():
+    """Readiness check endpoint.
 
-    Args:
-        request: QueryRequest with user question
+    Returns:
+        200 once models are loaded and the index is built, 503 while warming
+        up or if warm-up failed
+    """
+    if not rag_system:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+
+    readiness = rag_system.readiness()
+    if warm_up_error:
+        return JSONResponse(status_code=503, content={"status": "failed", "error": warm_up_error, **readiness})
+    if not readiness['ready']:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **readiness})
+
+    return {"status": "ready", **readiness}
+
+
+@app.get("/api/stats")
+async def stats():
+    """Runtime statistics such as cache hit rates.
 
     Returns:
-        QueryResponse with answer and sources
+        Statistics reported by the RAG system
     """
     if not rag_system:
         raise HTTPException(status_code=503, detail="RAG system not initialized")
 
-    # Validate question
+    return rag_system.get_stats()
+
+
+def _validate_question(request: QueryRequest) -> str:
+    """Strip and validate the question of a query request.
+
+    Args:
+        request: QueryRequest with user question
+
+    Returns:
+        The stripped question
+
+    Raises:
+        HTTPException: 400 if the question is empty or too long, or the
+            retrieval mode is unknown
+    """
     question = request.question.strip() if request.question else ""
 
     if not question:
@@ -104,39 +248,270 @@ async def query(request: QueryRequest):
             detail=f"Question exceeds maximum length of {MAX_QUESTION_LENGTH} characters"
         )
 
+    if request.retrieval_mode is not None and request.retrieval_mode not in RETRIEVAL_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"retrieval_mode must be one of {', '.join(RETRIEVAL_MODES)}"
+        )
+
+    return question
+
+
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/query")
+async def query(request: QueryRequest):
+    """Handle chat queries using RAG system.
+
+    Args:
+        request: QueryRequest with user question
+
+    Returns:
+        QueryResponse with answer and sources
+    """
+    if not rag_system:
+        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    if not rag_system.is_ready():
+        raise HTTPException(status_code=503, detail="RAG system is warming up")
+
+    # Validate question
+    question = _validate_question(request)
+
     try:
-        result = rag_system.query(question, use_tools=request.use_tools)
+        result = await rag_system.aquery(
+            question, use_tools=request.use_tools, retrieval_mode=request.retrieval_mode
+        )
         return QueryResponse(
             answer=result['answer'],
             sources=result['sources'],
             context_count=result['context_count'],
-            tool_calls=result.get('tool_calls', [])
+            tool_calls=result.get('tool_calls', []),
+            cached=result.get('cached', False),
+            similarity=result.get('similarity')
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
 
 
-@app.post("/api/initialize")
-async def initialize():
-    """Initialize or rebuild the vector database.
+@app.post("/api/query/stream")
+async def query_stream(request: QueryRequest):
+    """Stream the answer to a chat query as Server-Sent Events.
+
+    Emits a 'sources' event first, then 'token' events with answer text,
+    then 'done' (or 'error' if generation fails part-way).
+
+    Args:
+        request: QueryRequest with user question
 
     Returns:
-        Initialization status
+        text/event-stream response
+    """
+    if not rag_system:
+        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    if not rag_system.is_ready():
+        raise HTTPException(status_code=503, detail="RAG system is warming up")
+
+    question = _validate_question(request)
+
+    async def event_stream():
+        try:
+            async for event in rag_system.astream_query(
+                question, use_tools=request.use_tools, retrieval_mode=request.retrieval_mode
+            ):
+                yield _sse_event(event['event'], event['data'])
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            print(f"Error streaming query: {e}")
+            yield _sse_event("error", {"detail": "Error processing query"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/initialize", status_code=202)
+async def initialize(full: bool = False):
+    """Start rebuilding the vector database in the background.
+
+    Args:
+        full: Re-embed every chunk instead of only new or changed ones
+
+    Returns:
+        The started job; poll /api/initialize/{job_id} for progress
+
+    Raises:
+        HTTPException: 409 if a rebuild is already running
     """
     if not rag_system:
         raise HTTPException(status_code=503, detail="RAG system not available")
 
+    def run(job):
+        return rag_system.initialize(
+            "data/chapters",
+            incremental=not full,
+            progress=job.report,
+            cancel_event=job.cancel_event
+        )
+
     try:
-        result = rag_system.initialize("data/chapters")
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error initializing: {str(e)}")
+        job = index_jobs.start("initialize", run)
+    except JobConflictError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Index rebuild already running (job {e.running_job.id})"
+        )
+
+    return {**job.to_dict(), 'status_url': f"/api/initialize/{job.id}"}
+
+
+@app.get("/api/initialize/{job_id}")
+async def initialize_status(job_id: str):
+    """Report the status and progress of an index rebuild job.
+
+    Args:
+        job_id: Job id returned by POST /api/initialize
+
+    Returns:
+        Job status, progress counters and, once finished, the result
+    """
+    job = index_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job.to_dict()
+
+
+@app.delete("/api/initialize/{job_id}")
+async def cancel_initialize(job_id: str):
+    """Cancel a running index rebuild; the live index keeps serving.
+
+    Args:
+        job_id: Job id returned by POST /api/initialize
+
+    Returns:
+        Job status with cancel_requested set
+    """
+    job = index_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.done:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+
+    index_jobs.cancel(job_id)
+    return job.to_dict()
 
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+def _build_index_if_empty():
+    """Build the index if the vector store is empty (run in a spawned process)."""
+    system = _create_rag_system()
+    if system.collection.count() == 0:
+        print("Loading and embedding documents...")
+        print(system.initialize("data/chapters")['message'])
+    system.shutdown()
+
+
+def _run_worker(sock: socket.socket):
+    """Serve requests on an inherited listening socket (pre-fork worker)."""
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(app, log_level="info"))
+    server.run(sockets=[sock])
+
+
+def _serve_prefork(host: str, port: int, workers: int):
+    """Run uvicorn workers forked from a master that loaded the model once.
+
+    The master loads the embedding model weights, the documents and (for the
+    NumPy backend) the memory-mapped index, freezes the garbage collector so
+    those objects are never written to, then forks. Workers inherit the
+    memory copy-on-write instead of each loading their own copy, and open
+    their own ChromaDB client and API clients after the fork. uvicorn's own
+    --workers spawns fresh interpreters, so it cannot share memory this way.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        workers: Number of worker processes
+    """
+    global rag_system
+    import multiprocessing
+
+    # Building the index runs the model, and torch thread pools started
+    # before fork deadlock in the children, so build in a separate process
+    builder = multiprocessing.get_context("spawn").Process(target=_build_index_if_empty)
+    builder.start()
+    builder.join()
+
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    rag_system = _create_rag_system()
+    if rag_system.vector_backend == "chroma":
+        # ChromaDB keeps each collection's vector index in process memory, so
+        # other workers would not see changes written to the live collection;
+        # every build writes a new generation they reopen instead
+        rag_system.in_place_update_ratio = 0.0
+    rag_system.preload("data/chapters")
+    gc.freeze()
+
+    children = {}  # pid -> worker slot
+    stopping = False
+
+    def spawn(slot):
+        global index_owner
+        pid = os.fork()
+        if pid == 0:
+            # Worker 0 builds index generations for watched changes
+            index_owner = slot == 0
+            try:
+                _run_worker(sock)
+            finally:
+                os._exit(0)
+        children[pid] = slot
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for slot in range(workers):
+        spawn(slot)
+    print(f"Started {workers} pre-forked workers")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        slot = children.pop(pid, None)
+        if not stopping and slot is not None:
+            print(f"Worker {pid} exited with status {status}, restarting")
+            spawn(slot)
+
+    sock.close()
+
+
 def main():
     """Run the application."""
     # Verify API key is set
@@ -149,6 +524,7 @@ def main():
     # Get configuration from environment
     host = os.getenv("HOST", "localhost")
     port = int(os.getenv("PORT", 8000))
+    workers = int(os.getenv("WORKERS", 1))
 
     print(f"\n{'='*50}")
     print("Claude Code RAG Chatbot")
@@ -157,6 +533,10 @@ def main():
     print(f"Open your browser to http://{host}:{port}")
     print(f"{'='*50}\n")
 
+    if workers > 1 and hasattr(os, "fork"):
+        _serve_prefork(host, port, workers)
+        return
+
     # Run uvicorn server
     uvicorn.run(
         "main:app",
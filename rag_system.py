@@ -1,13 +1,60 @@
+import asyncio
+import functools
+import importlib
 import os
 import glob
-import re
+import hashlib
+import json
+import shutil
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Optional
-
-import yaml
-import chromadb
-from sentence_transformers import SentenceTransformer
-from openai import OpenAI
+from typing import Callable, NamedTuple, Optional
+
+from backend.answer_cache import SemanticAnswerCache
+from backend.chunker import CHUNK_STRATEGIES, TokenChunker
+from backend.circuit_breaker import CircuitBreaker
+from backend.embedding_batcher import EmbeddingBatcher
+from backend.embedding_cache import EmbeddingCache
+from backend.keyword_index import KeywordIndex, reciprocal_rank_fusion
+from backend.markdown_parser import (
+    bump_corpus_generation, get_parse_cache_entry, is_parse_cached, parse_file, parse_markdown,
+    seed_parse_cache
+)
+from backend.parse_cache import PersistentParseCache
+from backend.single_flight import SingleFlight
+from backend.ttl_cache import TTLCache
+from backend.vector_store import VECTOR_BACKENDS, NumpyVectorStore
+
+# Heavy dependencies are imported on first use (sentence-transformers alone
+# pulls in torch and takes seconds) so the server can bind its port at once.
+# They stay module attributes so they can be patched.
+chromadb = None
+SentenceTransformer = None
+OpenAI = None
+AsyncOpenAI = None
+
+_DEFERRED_IMPORTS = {
+    'chromadb': ('chromadb', None),
+    'SentenceTransformer': ('sentence_transformers', 'SentenceTransformer'),
+    'OpenAI': ('openai', 'OpenAI'),
+    'AsyncOpenAI': ('openai', 'AsyncOpenAI'),
+}
+
+
+def _require(name: str):
+    """Return a deferred dependency, importing it on first use."""
+    value = globals()[name]
+    if value is None:
+        module_name, attribute = _DEFERRED_IMPORTS[name]
+        value = importlib.import_module(module_name)
+        if attribute:
+            value = getattr(value, attribute)
+        globals()[name] = value
+    return value
 
 # Import backend tools if available
 try:
@@ -15,41 +62,454 @@ try:
 except ImportError:
     execute_tool = None
 
+RAG_SYSTEM_PROMPT = """You are a helpful assistant specializing in Claude Code.
+You answer questions about Claude Code features, tools, and best practices.
+Always cite the source chapters when providing information.
+If you don't know the answer based on the provided context, say so clearly.
+Be concise and practical in your responses."""
+
+TOOLS_SYSTEM_PROMPT = """You are a helpful assistant specializing in Claude Code.
+You have access to tools to help answer questions:
+
+1. **search_content**: Search the documentation for specific information
+   - Use when: User asks "how to", needs details about a feature, or wants examples
+
+2. **get_course_outline**: Get the structure and lesson list for a course
+   - Use when: User asks "what's in chapter X", "show me topics", or wants navigation
+
+Guidelines:
+- You can use both tools in sequence if needed
+- Always cite sources when presenting search results
+- Format course outlines clearly with lesson numbers and titles
+- Be concise and practical"""
+
+RETRIEVAL_MODES = ("vector", "keyword", "hybrid")
+
+COLLECTION_NAME = "claude_code_lessons"
+GENERATION_FILE = "active_generation"
+
+MAX_ITERATIONS_ANSWER = "I encountered complexity processing your request. Please try rephrasing your question."
+
+
+class IndexBuildCancelled(Exception):
+    """Raised inside an index build when its cancel event is set."""
+
+
+class _Corpus(NamedTuple):
+    """Loaded chunks and the BM25 index built over exactly those chunks.
+
+    Replaced as a whole, so a query never pairs keyword hits from one
+    version of the corpus with the chunks of another.
+    """
+    documents: dict
+    keyword_index: KeywordIndex
+
+
+def _check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    """Abort an index build if cancellation was requested."""
+    if cancel_event is not None and cancel_event.is_set():
+        raise IndexBuildCancelled("Index build cancelled")
+
+
+def _report(progress: Optional[Callable], **counters) -> None:
+    """Send progress counters to an optional callback."""
+    if progress is not None:
+        progress(**counters)
+
+
+def _load_chapter(chapter_path: str, chunker: Optional[TokenChunker] = None) -> list:
+    """Parse and chunk one chapter file.
+
+    Module-level so ingestion can run it in worker processes.
+
+    Args:
+        chapter_path: Path to the markdown chapter file
+        chunker: Token chunker that splits sections further, or None to
+            keep one chunk per ## section
+
+    Returns:
+        List of (chunk_id, document) tuples in chunk order
+    """
+    chapter_name = Path(chapter_path).stem
+
+    # One cached pass yields the frontmatter URL and the ## sections
+    parsed = parse_file(chapter_path)
+    url = parsed['url']
+
+    chunks = []
+    for chunk_idx, (chunk_title, chunk_text) in enumerate(parsed['sections']):
+        if not chunk_text.strip():
+            continue
+        if chunker is None:
+            parts = [(f"{chapter_name}_chunk_{chunk_idx}", chunk_text)]
+        else:
+            parts = [
+                (f"{chapter_name}_chunk_{chunk_idx}_{part_idx}", part)
+                for part_idx, part in enumerate(chunker.split(chunk_text))
+            ]
+        for chunk_id, text in parts:
+            doc = {
+                'chapter': chapter_name,
+                'title': chunk_title,
+                'content': text,
+                'url': url
+            }
+            if chunker is not None:
+                doc['parent_section'] = chunk_title
+            # Hash of the indexed text lets create_embeddings skip unchanged chunks
+            doc['content_hash'] = RAGSystem._hash_document(doc)
+            chunks.append((chunk_id, doc))
+    return chunks
+
+
+def _ingest_chapter(chapter_path: str, chunker: Optional[TokenChunker] = None) -> tuple:
+    """Chunk one chapter file in a worker process.
+
+    Returns the file's parse cache entry along with its chunks so the
+    parent process can keep (and persist) the parse.
+
+    Args:
+        chapter_path: Path to the markdown chapter file
+        chunker: Token chunker, or None for one chunk per ## section
+
+    Returns:
+        (chunks, parse cache entry) tuple
+    """
+    chunks = _load_chapter(chapter_path, chunker)
+    return chunks, get_parse_cache_entry(chapter_path)
+
 
 class RAGSystem:
     """RAG System for Claude Code chatbot using ChromaDB and Anthropic API."""
 
-    def __init__(self, db_path: str = "data/chroma_db", model_name: str = "all-MiniLM-L6-v2"):
+    # Components built on first access: attribute name -> loader method
+    _LAZY_COMPONENTS = {
+        'client': '_load_client',
+        'collection': '_load_collection',
+        'embedding_model': '_load_embedding_model',
+        'openai_client': '_load_openai_client',
+        'async_openai_client': '_load_async_openai_client',
+    }
+
+    def __init__(self, db_path: str = "data/chroma_db", model_name: str = "all-MiniLM-L6-v2",
+                 embed_batch_size: int = 64, write_batch_size: int = 1000,
+                 embedding_cache_path: Optional[str] = "data/embedding_cache.db",
+                 embedding_cache_size: int = 100_000,
+                 query_cache_size: int = 1024, query_cache_ttl: Optional[float] = 3600,
+                 io_workers: int = 16, query_batch_size: int = 32,
+                 query_batch_wait_ms: float = 2.0, vector_backend: str = "chroma",
+                 index_path: str = "data/vector_index", retrieval_mode: str = "vector",
+                 keyword_candidates: int = 10, rrf_k: int = 60, keep_generations: int = 2,
+                 ingest_workers: Optional[int] = None, parallel_ingest_min_files: int = 64,
+                 chunk_strategy: str = "sections", max_chunk_tokens: int = 200,
+                 chunk_overlap_tokens: int = 32,
+                 parse_cache_path: Optional[str] = "data/parse_cache.db",
+                 answer_cache_path: Optional[str] = "data/answer_cache.db",
+                 answer_cache_size: int = 1000, answer_cache_ttl: Optional[float] = 24 * 3600,
+                 answer_cache_threshold: float = 0.95, tool_workers: int = 4,
+                 tool_timeout: Optional[float] = 30.0, tool_failure_threshold: float = 0.5,
+                 tool_failure_window: int = 20, tool_circuit_reset: float = 30.0,
+                 in_place_update_ratio: float = 0.1):
         """Initialize the RAG system.
 
         Args:
             db_path: Path to ChromaDB storage
             model_name: Sentence transformer model name
+            embed_batch_size: Number of chunks encoded per model call
+            write_batch_size: Number of chunks written per ChromaDB call
+            embedding_cache_path: SQLite file for cached chunk embeddings, or None to disable
+            embedding_cache_size: Maximum number of cached chunk embeddings
+            query_cache_size: Maximum number of cached query embeddings
+            query_cache_ttl: Seconds a cached query embedding stays valid, or None
+            io_workers: Threads used by the async path for ChromaDB and tool calls
+            query_batch_size: Maximum number of concurrent queries encoded together
+            query_batch_wait_ms: How long a query waits for others to batch with
+            vector_backend: "chroma" (ChromaDB) or "numpy" (in-process exact index)
+            index_path: Directory of the persisted NumPy index
+            retrieval_mode: Default retrieval mode: "vector", "keyword" or "hybrid"
+            keyword_candidates: Number of BM25 hits fused with the vector hits in hybrid mode
+            rrf_k: Reciprocal rank fusion damping constant
+            keep_generations: Index generations kept on disk (the live one and
+                its predecessors, so in-flight queries finish on the old one)
+            ingest_workers: Processes used to parse chapter files (default: CPU count)
+            parallel_ingest_min_files: Smallest corpus parsed in worker processes;
+                below it process start-up costs more than it saves
+            chunk_strategy: "sections" (one chunk per ## section) or "tokens"
+                (sections split further to at most max_chunk_tokens)
+            max_chunk_tokens: Token limit per chunk for the "tokens" strategy;
+                kept below the model's sequence limit (256 for MiniLM) to
+                leave room for the chapter/title prefix
+            chunk_overlap_tokens: Tokens repeated between consecutive chunks
+                of a section for the "tokens" strategy
+            parse_cache_path: SQLite file for parsed chapter files, or None to disable
+            answer_cache_path: SQLite file backing the semantic answer cache, or
+                None to keep it in memory
+            answer_cache_size: Maximum number of cached answers (0 disables the cache)
+            answer_cache_ttl: Seconds a cached answer stays valid, or None
+            answer_cache_threshold: Minimum cosine similarity between two
+                questions for one to be answered with the other's answer
+            tool_workers: Threads running the tool calls of one model turn concurrently
+            tool_timeout: Seconds the tool calls of one turn may take before
+                the slow ones are reported to the model as timed out, or None
+            tool_failure_threshold: Share of failed tool-calling answers, over
+                the last tool_failure_window, at which queries stop trying
+                tool calling and go straight to classic RAG
+            tool_failure_window: Number of recent tool-calling answers the
+                failure rate is computed over
+            tool_circuit_reset: Seconds before tool calling is tried again
+                after it was switched off
+            in_place_update_ratio: Largest share of the live chunks an
+                incremental build may add, change or remove in place on the
+                live vector store; larger changes and full builds write a new
+                index generation (0 always writes a new generation)
         """
+        if vector_backend not in VECTOR_BACKENDS:
+            raise ValueError(f"Unknown vector backend '{vector_backend}', expected one of {VECTOR_BACKENDS}")
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{retrieval_mode}', expected one of {RETRIEVAL_MODES}")
+        if chunk_strategy not in CHUNK_STRATEGIES:
+            raise ValueError(f"Unknown chunk strategy '{chunk_strategy}', expected one of {CHUNK_STRATEGIES}")
+        if chunk_overlap_tokens >= max_chunk_tokens:
+            raise ValueError("chunk_overlap_tokens must be smaller than max_chunk_tokens")
+
+        self._lazy_lock = threading.RLock()
         self.db_path = db_path
         self.model_name = model_name
+        self.vector_backend = vector_backend
+        self.index_path = index_path
+        self.embed_batch_size = embed_batch_size
+        self.write_batch_size = write_batch_size
+        self.retrieval_mode = retrieval_mode
+        self.keyword_candidates = keyword_candidates
+        self.rrf_k = rrf_k
+        self.keep_generations = max(keep_generations, 2)
+        self.ingest_workers = ingest_workers or os.cpu_count() or 1
+        self.parallel_ingest_min_files = parallel_ingest_min_files
+        self.chunk_strategy = chunk_strategy
+        self.max_chunk_tokens = max_chunk_tokens
+        self.chunk_overlap_tokens = chunk_overlap_tokens
+
+        # Chunk embeddings survive rebuilds and restarts in an on-disk cache
+        self.embedding_cache = (
+            EmbeddingCache(embedding_cache_path, max_entries=embedding_cache_size)
+            if embedding_cache_path else None
+        )
 
-        # Initialize ChromaDB
-        self.client = chromadb.PersistentClient(path=db_path)
-        self.collection = self.client.get_or_create_collection(
-            name="claude_code_lessons",
-            metadata={"hnsw:space": "cosine"}
+        # Parsed chapter files survive restarts too, so a warm start on an
+        # unchanged corpus reads one table instead of re-parsing every file
+        self.parse_cache = PersistentParseCache(parse_cache_path) if parse_cache_path else None
+        self._parse_cache_loaded = False
+
+        # Rephrasings of earlier questions are answered from the semantic
+        # answer cache, skipping retrieval and the LLM call
+        self.answer_cache = SemanticAnswerCache(
+            answer_cache_path,
+            max_entries=answer_cache_size,
+            ttl=answer_cache_ttl,
+            threshold=answer_cache_threshold
+        ) if answer_cache_size > 0 else None
+
+        # Identical questions arriving while one is being answered wait for
+        # that answer instead of running the pipeline again
+        self._inflight_queries = SingleFlight()
+
+        # Hot questions and repeated tool searches skip the encoder entirely
+        self.query_embedding_cache = TTLCache(maxsize=query_cache_size, ttl=query_cache_ttl)
+
+        # The vector store client and collection, the embedding model and the
+        # OpenAI clients are built on first access (see __getattr__) or by
+        # warm_up(). Both vector store backends expose the same
+        # collection-style API (count/get/add/upsert/delete/query). Builds
+        # write a new index generation and then switch self.collection to it,
+        # so queries never see a half-built index; small incremental changes
+        # are applied to the live store instead (see create_embeddings)
+        self._build_lock = threading.Lock()
+        self._ready = threading.Event()
+        self.in_place_update_ratio = in_place_update_ratio
+        self._generation_stamp = self._pointer_stamp()
+        self.index_generation, self._index_store = self._read_pointer()
+
+        # Query encoding runs on one dedicated thread that batches queries
+        # arriving within a few milliseconds; blocking ChromaDB/tool work for
+        # the async path runs on a separate pool
+        self._query_batcher = EmbeddingBatcher(
+            self._encode_query_batch,
+            max_batch_size=query_batch_size,
+            max_wait_ms=query_batch_wait_ms
+        )
+        self._io_executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="rag-io")
+        # Tool calls get their own pool: the async path runs the tool loop
+        # on the I/O pool, which must not wait on itself
+        self._tool_executor = ThreadPoolExecutor(max_workers=tool_workers, thread_name_prefix="rag-tool")
+        self.tool_timeout = tool_timeout
+        # Once tool calling keeps failing, queries skip it (and the wasted
+        # model round trip) until a probe succeeds again
+        self.tool_breaker = CircuitBreaker(
+            "tool_calling",
+            failure_threshold=tool_failure_threshold,
+            window=tool_failure_window,
+            reset_timeout=tool_circuit_reset
+        )
+
+        # Store documents info and the BM25 index built over them
+        self._corpus = _Corpus({}, KeywordIndex())
+
+    @property
+    def documents(self) -> dict:
+        """Loaded chunks keyed by chunk id."""
+        return self._corpus.documents
+
+    @documents.setter
+    def documents(self, documents: dict) -> None:
+        self._corpus = _Corpus(documents, KeywordIndex.build(documents))
+
+    @property
+    def keyword_index(self) -> KeywordIndex:
+        """BM25 index over the loaded chunks."""
+        return self._corpus.keyword_index
+
+    def __getattr__(self, name: str):
+        """Build a lazy component on first access.
+
+        Only called when normal lookup fails, so once a component is stored
+        in the instance dictionary (or assigned directly) this is bypassed.
+        """
+        loader = self._LAZY_COMPONENTS.get(name)
+        if loader is None or '_lazy_lock' not in self.__dict__:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        with self._lazy_lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = getattr(self, loader)()
+            return self.__dict__[name]
+
+    def _load_client(self):
+        """Create the ChromaDB client (None for the NumPy backend)."""
+        if self.vector_backend == "numpy":
+            return None
+        return _require('chromadb').PersistentClient(path=self.db_path)
+
+    def _load_collection(self):
+        """Open the live index generation."""
+        return self._open_generation(self._index_store)
+
+    def _load_embedding_model(self):
+        """Load the sentence transformer weights."""
+        return _require('SentenceTransformer')(self.model_name)
+
+    def _make_chunker(self) -> Optional[TokenChunker]:
+        """Build the token chunker for the configured strategy (None for "sections").
+
+        Tokens are counted with the embedding model's own tokenizer, so the
+        chunk limit is measured the same way the model truncates.
+        """
+        if self.chunk_strategy != "tokens":
+            return None
+        return TokenChunker(
+            max_tokens=self.max_chunk_tokens,
+            overlap_tokens=self.chunk_overlap_tokens,
+            tokenizer=getattr(self.embedding_model, 'tokenizer', None)
         )
 
-        # Initialize embedding model
-        self.embedding_model = SentenceTransformer(model_name)
+    def _load_openai_client(self):
+        """Create the OpenAI client used by query()."""
+        return _require('OpenAI')()
+
+    def _load_async_openai_client(self):
+        """Create the OpenAI client used by aquery()."""
+        return _require('AsyncOpenAI')()
+
+    def preload(self, chapters_dir: Optional[str] = None) -> None:
+        """Load shareable state before a pre-fork server forks its workers.
+
+        Loads the embedding model weights, the documents and keyword index
+        and, for the NumPy backend, the memory-mapped index, so workers
+        inherit them copy-on-write. Nothing that must not cross a fork is
+        created: no threads, no encode (torch's thread pools do not survive
+        fork), no SQLite connections (ChromaDB, embedding and parse caches)
+        and no HTTP clients. Each worker opens those itself when it needs them.
+
+        Args:
+            chapters_dir: Directory containing chapter files, or None to skip
+        """
+        self.embedding_model
+        if self.vector_backend == "numpy":
+            self.collection
+        if chapters_dir is not None:
+            self.load_documents(chapters_dir)
+        # load_documents() read and synced the parse cache; each worker
+        # reopens the database on its next sync
+        if self.parse_cache is not None:
+            self.parse_cache.close()
+
+    def warm_up(self, chapters_dir: Optional[str] = None,
+                build_index: Optional[Callable[[], dict]] = None) -> dict:
+        """Build every lazy component and run one encode so the first query is fast.
+
+        With chapters_dir, also make sure the index is populated: build it if
+        the vector store is empty, otherwise load the documents (needed for
+        keyword retrieval). The system reports ready once this completes.
+
+        Args:
+            chapters_dir: Directory containing chapter files, or None to skip indexing
+            build_index: Function building the empty index and returning its
+                status (default: initialize(chapters_dir)); the server runs
+                it as a tracked job so no other rebuild can overlap it
+
+        Returns:
+            Readiness dictionary (see readiness())
+
+        Raises:
+            RuntimeError: If building the initial index fails
+        """
+        for name in self._LAZY_COMPONENTS:
+            getattr(self, name)
+        self.embedding_model.encode(["warm up"], batch_size=1)
+
+        if chapters_dir is not None:
+            doc_count = self.collection.count()
+            if doc_count == 0:
+                print("Loading and embedding documents...")
+                result = build_index() if build_index is not None else self.initialize(chapters_dir)
+                print(result['message'])
+                if result['status'] != 'success':
+                    raise RuntimeError(result['message'])
+            else:
+                print(f"Vector store already initialized with {doc_count} documents")
+                # Chunks are still needed in memory for the keyword index
+                # (already there if preload() ran before a fork)
+                if not self.documents:
+                    self.load_documents(chapters_dir)
+
+        self._ready.set()
+        return self.readiness()
 
-        # Initialize OpenAI client
-        self.openai_client = OpenAI()
+    def is_ready(self) -> bool:
+        """Whether warm_up() has completed."""
+        return self._ready.is_set()
 
-        # Store documents info
-        self.documents = {}
+    def readiness(self) -> dict:
+        """Report which components are loaded.
+
+        Returns:
+            Dictionary with 'ready' and per-component 'components' flags
+        """
+        return {
+            'ready': self.is_ready(),
+            'components': {name: name in self.__dict__ for name in self._LAZY_COMPONENTS}
+        }
 
-    def load_documents(self, chapters_dir: str = "data/chapters") -> int:
+    def load_documents(self, chapters_dir: str = "data/chapters",
+                       progress: Optional[Callable] = None,
+                       cancel_event: Optional[threading.Event] = None) -> int:
         """Load markdown documents from chapters directory.
 
+        Files whose size and mtime (or content hash) match the persistent
+        parse cache are not parsed again.
+
         Args:
             chapters_dir: Directory containing markdown chapter files
+            progress: Optional callback receiving files_parsed/files_total counters
+            cancel_event: Optional event that aborts loading when set
 
         Returns:
             Number of documents loaded
@@ -59,35 +519,97 @@ class RAGSystem:
         if not chapter_files:
             raise FileNotFoundError(f"No markdown files found in {chapters_dir}")
 
-        doc_count = 0
-
-        for chapter_path in chapter_files:
-            chapter_name = Path(chapter_path).stem
+        # Rebuild the chunk table from scratch so that chunks belonging to
+        # deleted files or removed sections do not linger between loads
+        documents = {}
+        _report(progress, files_total=len(chapter_files), files_parsed=0)
+
+        if self.parse_cache is not None and not self._parse_cache_loaded:
+            seed_parse_cache(self.parse_cache.load())
+            self._parse_cache_loaded = True
+
+        # Only files whose cached parse is stale are worth sending to worker
+        # processes; the rest are chunked in-process from the cache
+        chunker = self._make_chunker()
+        stale_files = [path for path in chapter_files if not is_parse_cached(path)]
+
+        # Large batches of stale files are parsed in worker processes. map()
+        # yields results in file order, so chunk ids and dictionary order do
+        # not depend on which worker finishes first
+        workers = min(self.ingest_workers, len(stale_files))
+        pool = None
+        if workers > 1 and len(stale_files) >= self.parallel_ingest_min_files:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            worker_results = pool.map(
+                functools.partial(_ingest_chapter, chunker=chunker), stale_files,
+                chunksize=max(1, len(stale_files) // (workers * 4))
+            )
+            stale = set(stale_files)
 
-            with open(chapter_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+        try:
+            for file_idx, chapter_path in enumerate(chapter_files, start=1):
+                if pool is not None and chapter_path in stale:
+                    chunks, entry = next(worker_results)
+                    seed_parse_cache({chapter_path: entry})
+                else:
+                    chunks = _load_chapter(chapter_path, chunker)
+                _check_cancelled(cancel_event)
+                documents.update(chunks)
+                _report(progress, files_parsed=file_idx)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        if self.parse_cache is not None:
+            self.parse_cache.sync({path: get_parse_cache_entry(path) for path in chapter_files})
+
+        # Exact identifiers (tool names, CLI flags) are matched by BM25; the
+        # index is built before the chunks and it are swapped in together
+        self._corpus = _Corpus(documents, KeywordIndex.build(documents))
+        bump_corpus_generation()
+
+        return len(documents)
+
+    def update_documents(self, chapter_paths, chapters_dir: str = "data/chapters") -> int:
+        """Reload only the given chapter files into the loaded documents.
+
+        Chunks of the affected chapters are replaced (or dropped, for deleted
+        files); every other chapter keeps its chunks without being checked.
 
-            # Extract YAML frontmatter and URL
-            url = self._extract_frontmatter_url(content)
+        Args:
+            chapter_paths: Paths of created, modified or deleted chapter files
+            chapters_dir: Directory containing markdown chapter files
 
-            # Remove YAML frontmatter from content before processing
-            content = self._remove_frontmatter(content)
+        Returns:
+            Number of documents loaded
+        """
+        chapter_paths = sorted(set(chapter_paths))
+        chapters = {Path(path).stem for path in chapter_paths}
+        chunker = self._make_chunker()
 
-            # Split into chunks (approximate by splitting on ## headers)
-            chunks = self._split_into_chunks(content, chapter_name)
+        documents = {
+            doc_id: doc for doc_id, doc in self.documents.items()
+            if doc['chapter'] not in chapters
+        }
+        for chapter_path in chapter_paths:
+            if os.path.exists(chapter_path):
+                documents.update(_load_chapter(chapter_path, chunker))
+
+        # Keep the chapter order a full load produces (sorting is stable, so
+        # chunks stay in order within a chapter)
+        documents = dict(sorted(documents.items(), key=lambda item: item[1]['chapter']))
+
+        if self.parse_cache is not None:
+            entries = {
+                path: get_parse_cache_entry(path)
+                for path in glob.glob(os.path.join(chapters_dir, "*.md"))
+            }
+            self.parse_cache.sync({path: entry for path, entry in entries.items() if entry is not None})
 
-            for chunk_idx, (chunk_title, chunk_text) in enumerate(chunks):
-                if chunk_text.strip():
-                    chunk_id = f"{chapter_name}_chunk_{chunk_idx}"
-                    self.documents[chunk_id] = {
-                        'chapter': chapter_name,
-                        'title': chunk_title,
-                        'content': chunk_text,
-                        'url': url
-                    }
-                    doc_count += 1
+        self._corpus = _Corpus(documents, KeywordIndex.build(documents))
+        bump_corpus_generation()
 
-        return doc_count
+        return len(documents)
 
     def _extract_frontmatter_url(self, content: str) -> str:
         """Extract URL from YAML frontmatter in markdown.
@@ -98,30 +620,7 @@ class RAGSystem:
         Returns:
             URL string, or empty string if not found
         """
-        if not content.startswith('---'):
-            return ''
-
-        try:
-            # Find the closing --- of frontmatter
-            lines = content.split('\n')
-            end_idx = -1
-            for i in range(1, len(lines)):
-                if lines[i].startswith('---'):
-                    end_idx = i
-                    break
-
-            if end_idx == -1:
-                return ''
-
-            # Extract YAML content
-            yaml_content = '\n'.join(lines[1:end_idx])
-            frontmatter = yaml.safe_load(yaml_content)
-
-            if frontmatter and isinstance(frontmatter, dict):
-                return frontmatter.get('url', '')
-            return ''
-        except Exception:
-            return ''
+        return parse_markdown(content)['url']
 
     def _remove_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content.
@@ -132,18 +631,7 @@ class RAGSystem:
         Returns:
             Content without frontmatter
         """
-        if not content.startswith('---'):
-            return content
-
-        try:
-            lines = content.split('\n')
-            for i in range(1, len(lines)):
-                if lines[i].startswith('---'):
-                    # Return content after the closing ---
-                    return '\n'.join(lines[i+1:])
-            return content
-        except Exception:
-            return content
+        return parse_markdown(content)['body']
 
     def _split_into_chunks(self, content: str, chapter_name: str) -> list:
         """Split document content into logical chunks.
@@ -157,104 +645,516 @@ class RAGSystem:
         Returns:
             List of (title, text) tuples
         """
-        chunks = []
-        lines = content.split('\n')
-        current_chunk = []
-        current_title = chapter_name
-        in_code_block = False
-
-        for line in lines:
-            # Track code block boundaries (triple backticks)
-            if line.strip().startswith('```'):
-                in_code_block = not in_code_block
-                current_chunk.append(line)
-                continue
-
-            # Check for header (## with optional space) - but only outside code blocks
-            if not in_code_block and re.match(r'^##\s*\S', line):
-                # Start of new section
-                if current_chunk:
-                    chunk_text = '\n'.join(current_chunk)
-                    chunks.append((current_title, chunk_text))
-                    current_chunk = []
-                # Extract title from header (remove ## and whitespace)
-                current_title = re.sub(r'^##\s*', '', line).strip()
+        return parse_markdown(content, default_title=chapter_name)['sections']
+
+    @staticmethod
+    def _document_text(doc: dict) -> str:
+        """Build the text that is embedded and stored for a chunk.
+
+        Args:
+            doc: Document chunk dictionary
+
+        Returns:
+            Text in the form "{chapter}: {title}\n{content}"
+        """
+        return f"{doc['chapter']}: {doc['title']}\n{doc['content']}"
+
+    @classmethod
+    def _hash_document(cls, doc: dict) -> str:
+        """Hash everything about a chunk that ends up in the vector store.
+
+        Args:
+            doc: Document chunk dictionary
+
+        Returns:
+            Hex SHA-256 digest of the chunk text and its metadata
+        """
+        payload = f"{cls._document_text(doc)}\x00{doc.get('url', '')}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _document_metadata(self, doc: dict) -> dict:
+        """Build the ChromaDB metadata stored alongside a chunk.
+
+        Args:
+            doc: Document chunk dictionary
+
+        Returns:
+            Metadata dictionary
+        """
+        metadata = {
+            'chapter': doc['chapter'],
+            'title': doc['title'],
+            'url': doc.get('url', ''),
+            'content_hash': doc.get('content_hash') or self._hash_document(doc)
+        }
+        if doc.get('parent_section'):
+            metadata['parent_section'] = doc['parent_section']
+        return metadata
+
+    def _embed_texts(self, texts: list, progress: Optional[Callable] = None,
+                     cancel_event: Optional[threading.Event] = None) -> list:
+        """Encode texts in real model batches.
+
+        Vectors already in the embedding cache are reused. The remaining texts
+        are sorted by length before batching so each batch pads to a similar
+        sequence length, then the vectors are put back in input order.
+
+        Args:
+            texts: Texts to encode
+            progress: Optional callback receiving the chunks_embedded counter
+            cancel_event: Optional event that aborts encoding between batches
+
+        Returns:
+            List of embedding vectors (lists of floats), aligned with texts
+        """
+        embeddings = [None] * len(texts)
+        text_hashes = [EmbeddingCache.hash_text(text) for text in texts]
+
+        if self.embedding_cache is not None:
+            cached = self.embedding_cache.get_many(self.model_name, text_hashes)
+            for idx, text_hash in enumerate(text_hashes):
+                embeddings[idx] = cached.get(text_hash)
+
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        order = sorted(missing, key=lambda idx: len(texts[idx]), reverse=True)
+        _report(progress, chunks_embedded=len(texts) - len(missing))
+
+        for i in range(0, len(order), self.embed_batch_size):
+            _check_cancelled(cancel_event)
+            batch_idx = order[i:i+self.embed_batch_size]
+            vectors = self.embedding_model.encode(
+                [texts[idx] for idx in batch_idx],
+                batch_size=self.embed_batch_size
+            )
+            for idx, vector in zip(batch_idx, vectors):
+                embeddings[idx] = vector.tolist()
+
+            if self.embedding_cache is not None:
+                self.embedding_cache.put_many(
+                    self.model_name,
+                    {text_hashes[idx]: embeddings[idx] for idx in batch_idx}
+                )
+            _report(progress, chunks_embedded=len(texts) - len(missing) + i + len(batch_idx))
+
+        return embeddings
+
+    def _generation_root(self) -> str:
+        """Directory holding the active generation pointer file."""
+        return self.index_path if self.vector_backend == "numpy" else self.db_path
+
+    def _read_pointer(self) -> tuple:
+        """Read the live index generation and the vector store serving it.
+
+        The pointer file holds "<generation>" or, after in-place updates,
+        "<generation> <store>": every build gets a new generation number
+        (answer cache entries and other processes key on it), but an
+        in-place update of a ChromaDB collection keeps serving the store of
+        an earlier one.
+
+        Returns:
+            (generation, store generation); (0, 0), the unversioned index, if unset
+        """
+        try:
+            with open(os.path.join(self._generation_root(), GENERATION_FILE), 'r') as f:
+                fields = [int(field) for field in f.read().split()]
+        except (FileNotFoundError, ValueError):
+            return 0, 0
+        if not fields:
+            return 0, 0
+        return fields[0], fields[-1]
+
+    def _read_active_generation(self) -> int:
+        """Read the live index generation (0, the unversioned index, if unset)."""
+        return self._read_pointer()[0]
+
+    def _pointer_stamp(self) -> Optional[tuple]:
+        """Identity of the generation pointer file, or None if unset.
+
+        The writer replaces the file, which gives it a new inode, so the
+        inode catches switches that land within one mtime tick (or restore
+        an older mtime).
+
+        Returns:
+            (inode, mtime in ns, size) of the pointer file
+        """
+        try:
+            stat = os.stat(os.path.join(self._generation_root(), GENERATION_FILE))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _current_collection(self):
+        """Return the live collection, following switches made by other processes.
+
+        Pre-fork workers share one index directory; when another worker
+        publishes a new generation, the pointer file changes and this worker
+        opens the new generation on its next query.
+        """
+        stamp = self._pointer_stamp()
+        if stamp != self._generation_stamp:
+            generation, store = self._read_pointer()
+            if generation != self.index_generation:
+                # Reopened even for the same store, to load in-place updates
+                self.collection = self._open_generation(store)
+                self.index_generation, self._index_store = generation, store
+            self._generation_stamp = stamp
+        return self.collection
+
+    def _write_active_generation(self, generation: int, store: Optional[int] = None) -> None:
+        """Persist the live index generation (and the store serving it) atomically."""
+        os.makedirs(self._generation_root(), exist_ok=True)
+        pointer_path = os.path.join(self._generation_root(), GENERATION_FILE)
+        with open(pointer_path + ".tmp", 'w') as f:
+            f.write(str(generation) if store is None or store == generation else f"{generation} {store}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(pointer_path + ".tmp", pointer_path)
+
+    def _generation_name(self, generation: int) -> str:
+        """ChromaDB collection name or NumPy index directory of a generation."""
+        if self.vector_backend == "numpy":
+            return self.index_path if generation == 0 else os.path.join(self.index_path, f"gen-{generation}")
+        return COLLECTION_NAME if generation == 0 else f"{COLLECTION_NAME}_v{generation}"
+
+    def _open_generation(self, generation: int):
+        """Open (creating if needed) the vector store of a generation."""
+        if self.vector_backend == "numpy":
+            return NumpyVectorStore(self._generation_name(generation))
+        return self.client.get_or_create_collection(
+            name=self._generation_name(generation),
+            metadata={"hnsw:space": "cosine"}
+        )
+
+    def _list_generations(self) -> list:
+        """Return the generations present on disk, oldest first."""
+        if self.vector_backend == "numpy":
+            generations = [0] if os.path.exists(os.path.join(self.index_path, NumpyVectorStore.RECORDS_FILE)) else []
+            if os.path.isdir(self.index_path):
+                generations += [
+                    int(entry[len("gen-"):]) for entry in os.listdir(self.index_path)
+                    if entry.startswith("gen-") and entry[len("gen-"):].isdigit()
+                ]
+        else:
+            names = [getattr(c, 'name', c) for c in self.client.list_collections()]
+            generations = [0] if COLLECTION_NAME in names else []
+            generations += [
+                int(name[len(COLLECTION_NAME) + 2:]) for name in names
+                if name.startswith(f"{COLLECTION_NAME}_v") and name[len(COLLECTION_NAME) + 2:].isdigit()
+            ]
+        return sorted(generations)
+
+    def _drop_generation(self, generation: int) -> None:
+        """Delete the vector store of a generation."""
+        if self.vector_backend == "numpy":
+            if generation == 0:
+                for filename in (NumpyVectorStore.VECTORS_FILE, NumpyVectorStore.RECORDS_FILE):
+                    path = os.path.join(self.index_path, filename)
+                    if os.path.exists(path):
+                        os.remove(path)
             else:
-                current_chunk.append(line)
+                shutil.rmtree(self._generation_name(generation), ignore_errors=True)
+        else:
+            try:
+                self.client.delete_collection(self._generation_name(generation))
+            except ValueError:
+                pass  # Already gone
+
+    def _collect_old_generations(self) -> None:
+        """Drop generations older than the ones we keep, never the live one."""
+        generations = [g for g in self._list_generations() if g != self._index_store]
+        for generation in generations[:max(len(generations) - (self.keep_generations - 1), 0)]:
+            self._drop_generation(generation)
+
+    def _update_in_place(self, live, documents: dict, doc_ids: list, removed_ids: list,
+                         progress: Optional[Callable] = None,
+                         cancel_event: Optional[threading.Event] = None) -> int:
+        """Apply a small incremental change to the live vector store.
+
+        Only the changed chunks are embedded and written, so a one-line edit
+        costs one embedding and a small upsert instead of re-reading and
+        re-adding the whole index. Queries in this process may see the
+        change half applied while the writes run. The pointer file then gets
+        a new generation number, so other processes reopen the store and
+        answers cached against the old generation are dropped. ChromaDB
+        writes are transactional and stay in the live collection; the NumPy
+        store is saved into the new generation's directory instead, because
+        its two files cannot be replaced together under a reader. Caller
+        holds the build lock.
 
-        # Add final chunk
-        if current_chunk:
-            chunk_text = '\n'.join(current_chunk)
-            chunks.append((current_title, chunk_text))
+        Args:
+            live: Live vector store
+            documents: Loaded chunks
+            doc_ids: Ids of new or changed chunks
+            removed_ids: Ids of chunks no longer loaded
+            progress: Optional progress callback (see create_embeddings())
+            cancel_event: Optional event that aborts the update before the
+                live store is written
 
-        return chunks
+        Returns:
+            Number of embeddings created
+        """
+        # Only the new and changed chunks are written
+        _report(
+            progress,
+            chunks_to_embed=len(doc_ids), chunks_embedded=0,
+            chunks_total=len(doc_ids), chunks_written=0
+        )
+        texts = [self._document_text(documents[doc_id]) for doc_id in doc_ids]
+        embeddings = self._embed_texts(texts, progress=progress, cancel_event=cancel_event)
+        # Last chance to cancel: past this point the live store changes
+        _check_cancelled(cancel_event)
+
+        write_batch_size = min(
+            self.write_batch_size,
+            getattr(self.client, 'max_batch_size', self.write_batch_size)
+        )
+        for i in range(0, len(doc_ids), write_batch_size):
+            batch_ids = doc_ids[i:i+write_batch_size]
+            live.upsert(
+                ids=batch_ids,
+                embeddings=embeddings[i:i+write_batch_size],
+                documents=texts[i:i+write_batch_size],
+                metadatas=[self._document_metadata(documents[doc_id]) for doc_id in batch_ids]
+            )
+            _report(progress, chunks_written=i + len(batch_ids))
+        for i in range(0, len(removed_ids), write_batch_size):
+            live.delete(ids=removed_ids[i:i+write_batch_size])
+
+        generation = max(self._list_generations() + [self.index_generation]) + 1
+        store = self._index_store
+        if self.vector_backend == "numpy":
+            self._drop_generation(generation)  # A crashed build may have left one behind
+            live.save_to(self._generation_name(generation))
+            store = generation
+        else:
+            self._flush_collection(live)
+
+        self._write_active_generation(generation, store)
+        self._generation_stamp = self._pointer_stamp()
+        self.index_generation, self._index_store = generation, store
+        self._collect_old_generations()
+
+        return len(doc_ids)
+
+    @staticmethod
+    def _flush_collection(collection) -> None:
+        """Persist staged writes of a NumPy store (ChromaDB writes through)."""
+        flush = getattr(collection, 'flush', None)
+        if flush is not None:
+            flush()
+
+    def create_embeddings(self, incremental: bool = True, progress: Optional[Callable] = None,
+                          cancel_event: Optional[threading.Event] = None) -> int:
+        """Build a new index generation and switch queries over to it.
+
+        In incremental mode only chunks whose content hash differs from the
+        live one are embedded. When the added, changed and removed chunks
+        are at most in_place_update_ratio of the live index, they are
+        written to the live vector store directly (see _update_in_place()),
+        which keeps small edits cheap.
+
+        Otherwise the live vector store is not modified. A new generation is
+        built beside it, with the vectors of unchanged chunks copied over
+        (incremental) or every chunk re-embedded (full build). Once complete,
+        the generation pointer is replaced atomically, self.collection is
+        swapped, and generations older than the previous one are dropped.
+        Copying rebuilds the whole vector index, so this costs about as much
+        as a full build minus the embedding.
 
-    def create_embeddings(self) -> int:
-        """Create embeddings for all documents and store in ChromaDB.
+        Args:
+            incremental: Only re-embed new or changed chunks (default True)
+            progress: Optional callback receiving chunks_to_embed/chunks_embedded
+                and chunks_total/chunks_written counters
+            cancel_event: Optional event that aborts the build when set; the
+                staging generation is dropped and the live one keeps serving
 
         Returns:
             Number of embeddings created
+
+        Raises:
+            IndexBuildCancelled: If cancel_event was set during the build
         """
         if not self.documents:
             raise ValueError("No documents loaded. Call load_documents() first.")
 
-        # Clear existing collection
-        if self.collection.count() > 0:
-            # Get all IDs and delete
-            all_data = self.collection.get()
-            if all_data['ids']:
-                self.collection.delete(ids=all_data['ids'])
-
-        # Process documents in batches
-        batch_size = 10
-        doc_ids = list(self.documents.keys())
-
-        for i in range(0, len(doc_ids), batch_size):
-            batch_ids = doc_ids[i:i+batch_size]
-            batch_docs = []
-            batch_metadatas = []
-            batch_embeddings = []
-
-            for doc_id in batch_ids:
-                doc = self.documents[doc_id]
-                text = f"{doc['chapter']}: {doc['title']}\n{doc['content']}"
-
-                # Generate embedding
-                embedding = self.embedding_model.encode(text).tolist()
-
-                batch_docs.append(text)
-                batch_embeddings.append(embedding)
-                batch_metadatas.append({
-                    'chapter': doc['chapter'],
-                    'title': doc['title'],
-                    'url': doc.get('url', '')
-                })
+        with self._build_lock:
+            documents = self.documents
+            live = self._current_collection()
+
+            existing_hashes = {}
+            if live.count() > 0:
+                # Fetch ids and stored hashes only, never the documents or vectors
+                all_data = live.get(include=['metadatas'])
+                for doc_id, metadata in zip(all_data['ids'], all_data['metadatas']):
+                    existing_hashes[doc_id] = (metadata or {}).get('content_hash')
+
+            if incremental:
+                reused_ids = [
+                    doc_id for doc_id, doc in documents.items()
+                    if existing_hashes.get(doc_id) == doc['content_hash']
+                ]
+                if len(reused_ids) == len(documents) == len(existing_hashes):
+                    return 0  # Nothing changed; keep serving the live generation
+            else:
+                reused_ids = []
+            reused = set(reused_ids)
+            doc_ids = [doc_id for doc_id in documents if doc_id not in reused]
+
+            removed_ids = [doc_id for doc_id in existing_hashes if doc_id not in documents]
+            if incremental and existing_hashes and (
+                    len(doc_ids) + len(removed_ids) <= self.in_place_update_ratio * len(existing_hashes)):
+                return self._update_in_place(live, documents, doc_ids, removed_ids, progress, cancel_event)
+
+            _report(
+                progress,
+                chunks_to_embed=len(doc_ids), chunks_embedded=0,
+                chunks_total=len(documents), chunks_written=0
+            )
 
-            # Add to collection
-            self.collection.add(
-                ids=batch_ids,
-                embeddings=batch_embeddings,
-                documents=batch_docs,
-                metadatas=batch_metadatas
+            # Start the staging generation from scratch (a crashed build may
+            # have left one behind)
+            generation = max(self._list_generations() + [self.index_generation]) + 1
+            self._drop_generation(generation)
+            staging = self._open_generation(generation)
+
+            # ChromaDB rejects batches above its own limit (the NumPy store has none)
+            write_batch_size = min(
+                self.write_batch_size,
+                getattr(self.client, 'max_batch_size', self.write_batch_size)
             )
 
-        return len(self.documents)
+            try:
+                # Copy unchanged chunks from the live generation
+                written = 0
+                for i in range(0, len(reused_ids), write_batch_size):
+                    _check_cancelled(cancel_event)
+                    batch = live.get(
+                        ids=reused_ids[i:i+write_batch_size],
+                        include=['embeddings', 'documents', 'metadatas']
+                    )
+                    staging.add(
+                        ids=batch['ids'],
+                        embeddings=[
+                            vector.tolist() if hasattr(vector, 'tolist') else list(vector)
+                            for vector in batch['embeddings']
+                        ],
+                        documents=batch['documents'],
+                        metadatas=batch['metadatas']
+                    )
+                    written += len(batch['ids'])
+                    _report(progress, chunks_written=written)
+
+                texts = [self._document_text(documents[doc_id]) for doc_id in doc_ids]
+                embeddings = self._embed_texts(texts, progress=progress, cancel_event=cancel_event)
+
+                for i in range(0, len(doc_ids), write_batch_size):
+                    _check_cancelled(cancel_event)
+                    batch_ids = doc_ids[i:i+write_batch_size]
+                    staging.add(
+                        ids=batch_ids,
+                        embeddings=embeddings[i:i+write_batch_size],
+                        documents=texts[i:i+write_batch_size],
+                        metadatas=[self._document_metadata(documents[doc_id]) for doc_id in batch_ids]
+                    )
+                    written += len(batch_ids)
+                    _report(progress, chunks_written=written)
+                self._flush_collection(staging)
+            except BaseException:
+                self._drop_generation(generation)
+                raise
+
+            # Blue/green switch: persist the pointer, then swap the reference
+            # queries read from (a single attribute assignment)
+            self._write_active_generation(generation)
+            self.collection = staging
+            self._generation_stamp = self._pointer_stamp()
+            self.index_generation = self._index_store = generation
+            self._collect_old_generations()
+
+            return len(doc_ids)
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Normalize a query for embedding cache lookups.
+
+        Collapses whitespace and case-folds; the default all-MiniLM-L6-v2
+        tokenizer is uncased, so this does not change the embedding.
 
-    def retrieve_context(self, query: str, top_k: int = 3) -> list:
-        """Retrieve relevant context for a query.
+        Args:
+            query: Raw query text
+
+        Returns:
+            Normalized query text
+        """
+        return ' '.join(query.split()).casefold()
+
+    def _embed_query(self, query: str) -> list:
+        """Embed a query, reusing cached vectors for repeated questions.
 
         Args:
             query: User query
-            top_k: Number of top results to return
 
         Returns:
-            List of relevant document chunks with metadata
+            Query embedding as a list of floats
         """
-        # Generate query embedding
-        query_embedding = self.embedding_model.encode(query).tolist()
+        normalized = self._normalize_query(query)
+        embedding = self.query_embedding_cache.get(normalized)
+        if embedding is None:
+            embedding = self._encode_query(normalized)
+        return embedding
+
+    async def _aembed_query(self, query: str) -> list:
+        """Embed a query without blocking the event loop.
+
+        Args:
+            query: User query
 
-        # Search in ChromaDB
-        results = self.collection.query(
+        Returns:
+            Query embedding as a list of floats
+        """
+        normalized = self._normalize_query(query)
+        embedding = self.query_embedding_cache.get(normalized)
+        if embedding is None:
+            embedding = await asyncio.wrap_future(self._query_batcher.submit(normalized))
+            self.query_embedding_cache.set(normalized, embedding)
+        return embedding
+
+    def _encode_query(self, normalized_query: str) -> list:
+        """Encode a normalized query through the batcher and cache the result.
+
+        Args:
+            normalized_query: Output of _normalize_query()
+
+        Returns:
+            Query embedding as a list of floats
+        """
+        embedding = self._query_batcher.encode(normalized_query)
+        self.query_embedding_cache.set(normalized_query, embedding)
+        return embedding
+
+    def _encode_query_batch(self, normalized_queries: list) -> list:
+        """Encode a batch of queries collected by the batcher in one model call.
+
+        Args:
+            normalized_queries: Normalized query texts
+
+        Returns:
+            Array of query embeddings
+        """
+        return self.embedding_model.encode(normalized_queries, batch_size=len(normalized_queries))
+
+    def _query_collection(self, query_embedding: list, top_k: int) -> list:
+        """Search the vector store with a query embedding.
+
+        Args:
+            query_embedding: Embedded user query
+            top_k: Number of top results to return
+
+        Returns:
+            List of (chunk_id, context_item) tuples, best first
+        """
+        # Search in the vector store
+        results = self._current_collection().query(
             query_embeddings=[query_embedding],
             n_results=top_k
         )
@@ -263,80 +1163,364 @@ class RAGSystem:
             return []
 
         # Format results
-        context = []
+        hits = []
         for i, doc in enumerate(results['documents'][0]):
             metadata = results['metadatas'][0][i]
             distance = results['distances'][0][i] if 'distances' in results else 0
 
-            context.append({
+            hits.append((results['ids'][0][i], {
                 'content': doc,
                 'chapter': metadata.get('chapter', 'Unknown'),
                 'title': metadata.get('title', 'Unknown'),
                 'url': metadata.get('url', ''),
                 'relevance': 1 - (distance / 2) if distance else 0.8  # Convert distance to relevance
-            })
+            }))
 
+        return hits
+
+    def _search_collection(self, query_embedding: list, top_k: int) -> list:
+        """Search the vector store with a query embedding and format the hits.
+
+        Args:
+            query_embedding: Embedded user query
+            top_k: Number of top results to return
+
+        Returns:
+            List of relevant document chunks with metadata
+        """
+        return [item for _, item in self._query_collection(query_embedding, top_k)]
+
+    def _search_keywords(self, query: str, top_k: int) -> list:
+        """Search the BM25 keyword index.
+
+        Args:
+            query: User query
+            top_k: Number of top results to return
+
+        Returns:
+            List of (chunk_id, context_item) tuples, best first, with content
+            formatted as stored in the vector store; relevance is the BM25
+            score relative to the best hit
+        """
+        # Read both from one snapshot; a rebuild may swap in another meanwhile
+        corpus = self._corpus
+        hits = corpus.keyword_index.search(query, top_k=top_k)
+        if not hits:
+            return []
+
+        best_score = hits[0][1]
+        results = []
+        for doc_id, score in hits:
+            doc = corpus.documents[doc_id]
+            results.append((doc_id, {
+                'content': self._document_text(doc),
+                'chapter': doc['chapter'],
+                'title': doc['title'],
+                'url': doc['url'],
+                'relevance': score / best_score if best_score else 0.0
+            }))
+        return results
+
+    def _fuse(self, vector_hits: list, keyword_hits: list, top_k: int) -> list:
+        """Merge vector and keyword hits with reciprocal rank fusion.
+
+        Args:
+            vector_hits: (chunk_id, context_item) tuples from the vector store
+            keyword_hits: (chunk_id, context_item) tuples from the keyword index
+            top_k: Number of results to return
+
+        Returns:
+            List of relevant document chunks; relevance is the fused score
+            scaled so that ranking first on both sides gives 1.0
+        """
+        items = dict(keyword_hits)
+        items.update(vector_hits)
+        fused = reciprocal_rank_fusion(
+            [[doc_id for doc_id, _ in vector_hits], [doc_id for doc_id, _ in keyword_hits]],
+            k=self.rrf_k
+        )
+
+        max_score = 2.0 / (self.rrf_k + 1)
+        context = []
+        for doc_id, score in fused[:top_k]:
+            item = dict(items[doc_id])
+            item['relevance'] = score / max_score
+            context.append(item)
         return context
 
-    def generate_response(self, query: str, context: list) -> tuple:
-        """Generate response using OpenAI API with retrieved context.
+    def _resolve_mode(self, mode: Optional[str]) -> str:
+        """Validate a retrieval mode, defaulting to the configured one.
+
+        Keyword and hybrid retrieval need the documents in memory; without
+        them (e.g. a server started on an existing index) fall back to vector.
+        """
+        mode = mode or self.retrieval_mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}', expected one of {RETRIEVAL_MODES}")
+        if mode != "vector" and not len(self.keyword_index):
+            return "vector"
+        return mode
+
+    def retrieve_context(self, query: str, top_k: int = 3, mode: Optional[str] = None) -> list:
+        """Retrieve relevant context for a query.
+
+        Args:
+            query: User query
+            top_k: Number of top results to return
+            mode: "vector", "keyword" or "hybrid" (default: the configured mode)
+
+        Returns:
+            List of relevant document chunks with metadata
+        """
+        mode = self._resolve_mode(mode)
+
+        if mode == "keyword":
+            return [item for _, item in self._search_keywords(query, top_k)]
+
+        # Generate query embedding
+        query_embedding = self._embed_query(query)
+
+        if mode == "vector":
+            return self._search_collection(query_embedding, top_k)
+
+        return self._fuse(
+            self._query_collection(query_embedding, top_k),
+            self._search_keywords(query, max(top_k, self.keyword_candidates)),
+            top_k
+        )
+
+    async def aretrieve_context(self, query: str, top_k: int = 3, mode: Optional[str] = None) -> list:
+        """Async variant of retrieve_context that never blocks the event loop.
+
+        Embedding runs on the query batcher's thread and the vector search
+        on the I/O thread pool. The keyword search is in-memory and runs
+        inline.
+
+        Args:
+            query: User query
+            top_k: Number of top results to return
+            mode: "vector", "keyword" or "hybrid" (default: the configured mode)
+
+        Returns:
+            List of relevant document chunks with metadata
+        """
+        mode = self._resolve_mode(mode)
+
+        if mode == "keyword":
+            return [item for _, item in self._search_keywords(query, top_k)]
+
+        query_embedding = await self._aembed_query(query)
+
+        loop = asyncio.get_running_loop()
+        if mode == "vector":
+            return await loop.run_in_executor(
+                self._io_executor, self._search_collection, query_embedding, top_k
+            )
+
+        vector_hits = await loop.run_in_executor(
+            self._io_executor, self._query_collection, query_embedding, top_k
+        )
+        return self._fuse(
+            vector_hits,
+            self._search_keywords(query, max(top_k, self.keyword_candidates)),
+            top_k
+        )
+
+    def _build_rag_messages(self, query: str, context: list) -> tuple:
+        """Build the chat messages and source list for a classic RAG answer.
+
+        Args:
+            query: User query
+            context: Retrieved context chunks
+
+        Returns:
+            Tuple of (messages, sources_list)
+        """
+        # Format context
+        context_text = ""
+        sources = []
+        seen_chapters = set()
+
+        if context:
+            context_text = "\n\n".join([
+                f"From {item['chapter']} - {item['title']}:\n{item['content']}"
+                for item in context
+            ])
+            # Build sources list with unique chapters and their URLs
+            for item in context:
+                if item['chapter'] not in seen_chapters:
+                    sources.append({
+                        'chapter': item['chapter'],
+                        'url': item.get('url', '')
+                    })
+                    seen_chapters.add(item['chapter'])
+
+        # Build user message with context
+        if context_text:
+            user_message = f"""Based on the following Claude Code documentation:
+
+{context_text}
+
+---
+
+Please answer this question: {query}"""
+        else:
+            user_message = f"Question: {query}\n\nNote: I don't have specific documentation on this topic."
+
+        messages = [
+            {"role": "system", "content": RAG_SYSTEM_PROMPT},
+            {"role": "user", "content": user_message}
+        ]
+        return messages, sources
+
+    def generate_response(self, query: str, context: list) -> tuple:
+        """Generate response using OpenAI API with retrieved context.
+
+        Args:
+            query: User query
+            context: Retrieved context chunks
+
+        Returns:
+            Tuple of (response_text, sources_list)
+        """
+        messages, sources = self._build_rag_messages(query, context)
+
+        # Call OpenAI API
+        response = self.openai_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            max_tokens=1024,
+            messages=messages
+        )
+
+        return response.choices[0].message.content, sources
+
+    async def agenerate_response(self, query: str, context: list) -> tuple:
+        """Async variant of generate_response using AsyncOpenAI.
+
+        Args:
+            query: User query
+            context: Retrieved context chunks
+
+        Returns:
+            Tuple of (response_text, sources_list)
+        """
+        messages, sources = self._build_rag_messages(query, context)
+
+        response = await self.async_openai_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            max_tokens=1024,
+            messages=messages
+        )
+
+        return response.choices[0].message.content, sources
+
+    @staticmethod
+    def _tool_call_key(tool_name: str, tool_input) -> tuple:
+        """Identify a tool call by name and canonical (key-sorted JSON) input."""
+        return tool_name, json.dumps(tool_input, sort_keys=True, default=str)
+
+    def _run_tool_calls(self, assistant_content: list, tool_calls_made: list,
+                        tool_memo: Optional[dict] = None) -> list:
+        """Execute the tool use blocks of one assistant turn.
+
+        The calls run concurrently on the tool pool and their results are
+        returned in the order the model requested them. A call still running
+        tool_timeout seconds after the turn started is reported to the model
+        as a timeout error (its thread is left to finish in the background).
+
+        Calls identical to one already made for the same query (same tool,
+        same input) reuse its result instead of running again; they are
+        recorded in tool_calls_made with deduplicated=True. Error results
+        (including timeouts) are not remembered, so a later turn retries them.
+
+        Args:
+            assistant_content: Content blocks of the assistant response
+            tool_calls_made: List that each executed call is appended to
+            tool_memo: Results of earlier calls for this query, keyed by
+                _tool_call_key(); updated in place
+
+        Returns:
+            List of tool_result content blocks
+        """
+        tool_uses = [block for block in assistant_content if block.type == "tool_use"]
+        if not tool_uses:
+            return []
+        if tool_memo is None:
+            tool_memo = {}
+
+        keys = [self._tool_call_key(block.name, block.input) for block in tool_uses]
+        futures = {}
+        for content_block, key in zip(tool_uses, keys):
+            if key not in tool_memo and key not in futures:
+                futures[key] = self._tool_executor.submit(
+                    execute_tool, content_block.name, content_block.input, self
+                )
+        deadline = time.monotonic() + self.tool_timeout if self.tool_timeout is not None else None
+
+        tool_results = []
+        for content_block, key in zip(tool_uses, keys):
+            tool_name = content_block.name
+            tool_input = content_block.input
+            tool_use_id = content_block.id
+
+            deduplicated = key in tool_memo
+            if deduplicated:
+                tool_result = tool_memo[key]
+            else:
+                future = futures[key]
+                try:
+                    remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+                    tool_result = future.result(timeout=remaining)
+                    if not (isinstance(tool_result, dict) and "error" in tool_result):
+                        tool_memo[key] = tool_result
+                except FutureTimeoutError:
+                    future.cancel()  # Drops it if it never started
+                    tool_result = {"error": f"Tool execution timed out after {self.tool_timeout}s"}
+
+            # Track tool call
+            tool_calls_made.append({
+                "tool": tool_name,
+                "input": tool_input,
+                "result_summary": str(tool_result)[:200] if isinstance(tool_result, dict) else str(tool_result)[:200],
+                "deduplicated": deduplicated
+            })
+
+            # Add tool result to messages
+            tool_results.append({
+                "type": "tool_result",
+                "tool_use_id": tool_use_id,
+                "content": str(tool_result)
+            })
+
+        return tool_results
+
+    @staticmethod
+    def _final_tool_answer(response, tool_calls_made: list) -> tuple:
+        """Extract the answer from the final (end_turn) response of the tool loop.
 
         Args:
-            query: User query
-            context: Retrieved context chunks
+            response: Final model response
+            tool_calls_made: Tool calls executed during the loop
 
         Returns:
-            Tuple of (response_text, sources_list)
+            Tuple of (response_text, sources_list, tool_calls_made)
         """
-        # Format context
-        context_text = ""
+        # Extract final response
+        final_text = ""
         sources = []
-        seen_chapters = set()
-
-        if context:
-            context_text = "\n\n".join([
-                f"From {item['chapter']} - {item['title']}:\n{item['content']}"
-                for item in context
-            ])
-            # Build sources list with unique chapters and their URLs
-            for item in context:
-                if item['chapter'] not in seen_chapters:
-                    sources.append({
-                        'chapter': item['chapter'],
-                        'url': item.get('url', '')
-                    })
-                    seen_chapters.add(item['chapter'])
-
-        # Build system prompt
-        system_prompt = """You are a helpful assistant specializing in Claude Code.
-You answer questions about Claude Code features, tools, and best practices.
-Always cite the source chapters when providing information.
-If you don't know the answer based on the provided context, say so clearly.
-Be concise and practical in your responses."""
-
-        # Build user message with context
-        if context_text:
-            user_message = f"""Based on the following Claude Code documentation:
 
-{context_text}
-
----
-
-Please answer this question: {query}"""
-        else:
-            user_message = f"Question: {query}\n\nNote: I don't have specific documentation on this topic."
+        for content_block in response.content:
+            if hasattr(content_block, 'text'):
+                final_text += content_block.text
 
-        # Call OpenAI API
-        response = self.openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            max_tokens=1024,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-        )
+        # Extract sources from tool calls if any search_content calls were made
+        for tool_call in tool_calls_made:
+            if tool_call['tool'] == 'search_content':
+                # Try to extract sources from the tool result
+                # This is a simplified approach - sources come from the search results
+                pass
 
-        return response.choices[0].message.content, sources
+        return final_text, sources, tool_calls_made
 
     def generate_response_with_tools(self, query: str, tools: list = None, max_iterations: int = 5) -> tuple:
         """Generate response using Claude API with tool calling.
@@ -355,28 +1539,13 @@ Please answer this question: {query}"""
         if not tools:
             tools = []
 
-        # Build system prompt with tool descriptions
-        system_prompt = """You are a helpful assistant specializing in Claude Code.
-You have access to tools to help answer questions:
-
-1. **search_content**: Search the documentation for specific information
-   - Use when: User asks "how to", needs details about a feature, or wants examples
-
-2. **get_course_outline**: Get the structure and lesson list for a course
-   - Use when: User asks "what's in chapter X", "show me topics", or wants navigation
-
-Guidelines:
-- You can use both tools in sequence if needed
-- Always cite sources when presenting search results
-- Format course outlines clearly with lesson numbers and titles
-- Be concise and practical"""
-
         # Initialize conversation
         messages = [
             {"role": "user", "content": query}
         ]
 
         tool_calls_made = []
+        tool_memo = {}
         current_iteration = 0
 
         while current_iteration < max_iterations:
@@ -384,7 +1553,7 @@ Guidelines:
 
             # Call OpenAI API with tools
             messages_with_system = [
-                {"role": "system", "content": system_prompt}
+                {"role": "system", "content": TOOLS_SYSTEM_PROMPT}
             ] + messages
 
             response = self.openai_client.chat.completions.create(
@@ -406,29 +1575,7 @@ Guidelines:
                 })
 
                 # Process each tool use block
-                tool_results = []
-                for content_block in assistant_content:
-                    if content_block.type == "tool_use":
-                        tool_name = content_block.name
-                        tool_input = content_block.input
-                        tool_use_id = content_block.id
-
-                        # Execute tool
-                        tool_result = execute_tool(tool_name, tool_input, self)
-
-                        # Track tool call
-                        tool_calls_made.append({
-                            "tool": tool_name,
-                            "input": tool_input,
-                            "result_summary": str(tool_result)[:200] if isinstance(tool_result, dict) else str(tool_result)[:200]
-                        })
-
-                        # Add tool result to messages
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_use_id,
-                            "content": str(tool_result)
-                        })
+                tool_results = self._run_tool_calls(assistant_content, tool_calls_made, tool_memo)
 
                 # Add tool results as user message
                 if tool_results:
@@ -438,41 +1585,168 @@ Guidelines:
                     })
 
             elif response.stop_reason == "end_turn":
-                # Extract final response
-                final_text = ""
-                sources = []
+                return self._final_tool_answer(response, tool_calls_made)
+
+            else:
+                # Unexpected stop reason
+                break
+
+        # Fallback if max iterations reached
+        return MAX_ITERATIONS_ANSWER, [], tool_calls_made
+
+    async def agenerate_response_with_tools(self, query: str, tools: list = None,
+                                            max_iterations: int = 5) -> tuple:
+        """Async variant of generate_response_with_tools.
+
+        Model calls go through AsyncOpenAI and tool execution, which embeds
+        and searches synchronously, runs on the I/O thread pool.
+
+        Args:
+            query: User query
+            tools: List of tool definitions in Anthropic format
+            max_iterations: Maximum number of tool calling iterations
+
+        Returns:
+            Tuple of (response_text, sources_list, tool_calls_made)
+        """
+        if execute_tool is None:
+            raise RuntimeError("Tool calling not available. Backend module not imported.")
+
+        if not tools:
+            tools = []
+
+        loop = asyncio.get_running_loop()
+        messages = [
+            {"role": "user", "content": query}
+        ]
+        tool_calls_made = []
+        tool_memo = {}
+
+        for _ in range(max_iterations):
+            response = await self.async_openai_client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                max_tokens=1024,
+                tools=tools,
+                messages=[{"role": "system", "content": TOOLS_SYSTEM_PROMPT}] + messages
+            )
+
+            if response.stop_reason == "tool_use":
+                assistant_content = response.content
+                messages.append({
+                    "role": "assistant",
+                    "content": assistant_content
+                })
 
-                for content_block in response.content:
-                    if hasattr(content_block, 'text'):
-                        final_text += content_block.text
+                tool_results = await loop.run_in_executor(
+                    self._io_executor, self._run_tool_calls, assistant_content, tool_calls_made, tool_memo
+                )
 
-                # Extract sources from tool calls if any search_content calls were made
-                for tool_call in tool_calls_made:
-                    if tool_call['tool'] == 'search_content':
-                        # Try to extract sources from the tool result
-                        # This is a simplified approach - sources come from the search results
-                        pass
+                if tool_results:
+                    messages.append({
+                        "role": "user",
+                        "content": tool_results
+                    })
 
-                return final_text, sources, tool_calls_made
+            elif response.stop_reason == "end_turn":
+                return self._final_tool_answer(response, tool_calls_made)
 
             else:
                 # Unexpected stop reason
                 break
 
-        # Fallback if max iterations reached
-        return "I encountered complexity processing your request. Please try rephrasing your question.", [], tool_calls_made
+        return MAX_ITERATIONS_ANSWER, [], tool_calls_made
+
+    def _answer_variant(self, use_tools: bool, retrieval_mode: Optional[str]) -> str:
+        """Name the pipeline a question is answered with, for the answer cache."""
+        if use_tools and execute_tool is not None:
+            return "tools"
+        return f"rag:{retrieval_mode or self.retrieval_mode}"
+
+    def _lookup_answer(self, user_question: str, variant: str) -> tuple:
+        """Look a question up in the semantic answer cache.
+
+        The query embedding computed here lands in the query embedding
+        cache, so retrieval on a miss does not encode the question again.
+
+        Args:
+            user_question: Question from user
+            variant: Output of _answer_variant()
+
+        Returns:
+            (cached result or None, query embedding, index generation)
+        """
+        if self.answer_cache is None:
+            return None, None, None
+        embedding = self._embed_query(user_question)
+        # Follow generations switched by other processes before keying on it
+        self._current_collection()
+        generation = self.index_generation
+        cached = self.answer_cache.get(embedding, generation, variant)
+        return ({**cached, 'cached': True} if cached is not None else None), embedding, generation
+
+    async def _alookup_answer(self, user_question: str, variant: str) -> tuple:
+        """Async variant of _lookup_answer()."""
+        if self.answer_cache is None:
+            return None, None, None
+        embedding = await self._aembed_query(user_question)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._io_executor, self._current_collection)
+        generation = self.index_generation
+        cached = await loop.run_in_executor(
+            self._io_executor, self.answer_cache.get, embedding, generation, variant
+        )
+        return ({**cached, 'cached': True} if cached is not None else None), embedding, generation
+
+    def _store_answer(self, user_question: str, embedding, generation, variant: str, result: dict) -> None:
+        """Remember an answer for similar future questions.
+
+        Answers that did not complete (empty, or the tool loop gave up) are
+        not cached.
+        """
+        if self.answer_cache is None or not result.get('answer') or result['answer'] == MAX_ITERATIONS_ANSWER:
+            return
+        try:
+            self.answer_cache.put(self._normalize_query(user_question), embedding, generation, variant, result)
+        except Exception as e:
+            # Caching is best-effort; the caller already has its answer
+            print(f"Could not cache answer: {e}")
+
+    def query(self, user_question: str, use_tools: bool = True,
+              retrieval_mode: Optional[str] = None) -> dict:
+        """Answer a question, from the semantic answer cache when possible.
+
+        Args:
+            user_question: Question from user
+            use_tools: Whether to use tool calling (default True)
+            retrieval_mode: Retrieval mode for classic RAG (default: the configured mode)
+
+        Returns:
+            Dictionary with answer, sources, context_count, and optional
+            tool_calls; cached answers also carry cached=True and the
+            similarity of the question they were produced for
+        """
+        variant = self._answer_variant(use_tools, retrieval_mode)
+        cached, embedding, generation = self._lookup_answer(user_question, variant)
+        if cached is not None:
+            return cached
 
-    def query(self, user_question: str, use_tools: bool = True) -> dict:
+        result = self._run_query(user_question, use_tools, retrieval_mode)
+        self._store_answer(user_question, embedding, generation, variant, result)
+        return result
+
+    def _run_query(self, user_question: str, use_tools: bool = True,
+                   retrieval_mode: Optional[str] = None) -> dict:
         """End-to-end RAG pipeline: retrieve context and generate response.
 
         Args:
             user_question: Question from user
             use_tools: Whether to use tool calling (default True)
+            retrieval_mode: Retrieval mode for classic RAG (default: the configured mode)
 
         Returns:
             Dictionary with answer, sources, context_count, and optional tool_calls
         """
-        if use_tools and execute_tool is not None:
+        if use_tools and execute_tool is not None and self.tool_breaker.allow():
             # Use tool calling approach
             try:
                 from backend.search_tools import TOOLS
@@ -481,20 +1755,22 @@ Guidelines:
                     tools=TOOLS,
                     max_iterations=5
                 )
+            except Exception as e:
+                # Fall back to traditional RAG on tool calling error
+                self.tool_breaker.record_failure()
+                print(f"Tool calling failed, falling back to traditional RAG: {e}")
+            else:
+                self.tool_breaker.record_success()
                 return {
                     'answer': answer,
                     'sources': sources,
                     'context_count': len(sources),
                     'tool_calls': tool_calls
                 }
-            except Exception as e:
-                # Fall back to traditional RAG on tool calling error
-                print(f"Tool calling failed, falling back to traditional RAG: {e}")
-                pass
 
         # Traditional RAG pipeline (fallback or when use_tools=False)
         # Retrieve context
-        context = self.retrieve_context(user_question)
+        context = self.retrieve_context(user_question, mode=retrieval_mode)
 
         # Generate response
         answer, sources = self.generate_response(user_question, context)
@@ -505,29 +1781,307 @@ Guidelines:
             'context_count': len(context)
         }
 
-    def initialize(self, chapters_dir: str = "data/chapters") -> dict:
+    async def aquery(self, user_question: str, use_tools: bool = True,
+                     retrieval_mode: Optional[str] = None) -> dict:
+        """Async query() that keeps the event loop free.
+
+        Identical questions (same normalized text, tool use and retrieval
+        mode) asked while one is being answered share that execution.
+
+        Args:
+            user_question: Question from user
+            use_tools: Whether to use tool calling (default True)
+            retrieval_mode: Retrieval mode for classic RAG (default: the configured mode)
+
+        Returns:
+            Dictionary with answer, sources, context_count, and optional
+            tool_calls (see query())
+        """
+        variant = self._answer_variant(use_tools, retrieval_mode)
+        # Concurrent duplicates share one execution; each caller gets its own copy
+        result = await self._inflight_queries.do(
+            (self._normalize_query(user_question), variant),
+            lambda: self._aanswer(user_question, use_tools, retrieval_mode, variant)
+        )
+        return dict(result)
+
+    async def _aanswer(self, user_question: str, use_tools: bool,
+                       retrieval_mode: Optional[str], variant: str) -> dict:
+        """Answer a question from the answer cache or the pipeline (see aquery())."""
+        cached, embedding, generation = await self._alookup_answer(user_question, variant)
+        if cached is not None:
+            return cached
+
+        result = await self._arun_query(user_question, use_tools, retrieval_mode)
+        await asyncio.get_running_loop().run_in_executor(
+            self._io_executor, self._store_answer, user_question, embedding, generation, variant, result
+        )
+        return result
+
+    async def _arun_query(self, user_question: str, use_tools: bool = True,
+                          retrieval_mode: Optional[str] = None) -> dict:
+        """Async end-to-end RAG pipeline that keeps the event loop free.
+
+        Args:
+            user_question: Question from user
+            use_tools: Whether to use tool calling (default True)
+            retrieval_mode: Retrieval mode for classic RAG (default: the configured mode)
+
+        Returns:
+            Dictionary with answer, sources, context_count, and optional tool_calls
+        """
+        if use_tools and execute_tool is not None and self.tool_breaker.allow():
+            try:
+                from backend.search_tools import TOOLS
+                answer, sources, tool_calls = await self.agenerate_response_with_tools(
+                    user_question,
+                    tools=TOOLS,
+                    max_iterations=5
+                )
+            except Exception as e:
+                # Fall back to traditional RAG on tool calling error
+                self.tool_breaker.record_failure()
+                print(f"Tool calling failed, falling back to traditional RAG: {e}")
+            else:
+                self.tool_breaker.record_success()
+                return {
+                    'answer': answer,
+                    'sources': sources,
+                    'context_count': len(sources),
+                    'tool_calls': tool_calls
+                }
+
+        context = await self.aretrieve_context(user_question, mode=retrieval_mode)
+        answer, sources = await self.agenerate_response(user_question, context)
+
+        return {
+            'answer': answer,
+            'sources': sources,
+            'context_count': len(context)
+        }
+
+    async def astream_query(self, user_question: str, use_tools: bool = True,
+                            retrieval_mode: Optional[str] = None):
+        """Stream the answer to a question, from the answer cache when possible.
+
+        A cached answer is sent as one 'token' event between 'sources' and
+        'done'; 'done' then carries cached=True. Streamed answers are cached
+        once complete.
+
+        Args:
+            user_question: Question from user
+            use_tools: Whether to use tool calling (default True)
+            retrieval_mode: Retrieval mode for classic RAG (default: the configured mode)
+
+        Yields:
+            Event dictionaries (see _astream_query())
+        """
+        variant = self._answer_variant(use_tools, retrieval_mode)
+        cached, embedding, generation = await self._alookup_answer(user_question, variant)
+        if cached is not None:
+            yield {'event': 'sources', 'data': cached['sources']}
+            if cached['answer']:
+                yield {'event': 'token', 'data': cached['answer']}
+            yield {'event': 'done', 'data': {
+                'context_count': cached['context_count'],
+                'tool_calls': cached.get('tool_calls', []),
+                'cached': True
+            }}
+            return
+
+        sources = []
+        tokens = []
+        async for event in self._astream_query(user_question, use_tools, retrieval_mode):
+            if event['event'] == 'sources':
+                sources = event['data']
+            elif event['event'] == 'token':
+                tokens.append(event['data'])
+            elif event['event'] == 'done':
+                result = {
+                    'answer': ''.join(tokens),
+                    'sources': sources,
+                    'context_count': event['data']['context_count'],
+                    'tool_calls': event['data']['tool_calls']
+                }
+                await asyncio.get_running_loop().run_in_executor(
+                    self._io_executor, self._store_answer, user_question, embedding, generation, variant, result
+                )
+            yield event
+
+    async def _astream_query(self, user_question: str, use_tools: bool = True,
+                             retrieval_mode: Optional[str] = None):
+        """Stream the answer to a question as it is generated.
+
+        Yields event dictionaries with an 'event' name and its 'data':
+        'sources' first, then 'token' events carrying answer text, then
+        'done' with context_count and any tool calls. Classic RAG streams
+        the model's tokens as they arrive; in tool mode the final turn of
+        the tool loop is emitted as soon as it completes.
+
+        Args:
+            user_question: Question from user
+            use_tools: Whether to use tool calling (default True)
+            retrieval_mode: Retrieval mode for classic RAG (default: the configured mode)
+
+        Yields:
+            Event dictionaries
+        """
+        if use_tools and execute_tool is not None and self.tool_breaker.allow():
+            try:
+                from backend.search_tools import TOOLS
+                answer, sources, tool_calls = await self.agenerate_response_with_tools(
+                    user_question,
+                    tools=TOOLS,
+                    max_iterations=5
+                )
+            except Exception as e:
+                # Fall back to traditional RAG on tool calling error
+                self.tool_breaker.record_failure()
+                print(f"Tool calling failed, falling back to traditional RAG: {e}")
+            else:
+                self.tool_breaker.record_success()
+                yield {'event': 'sources', 'data': sources}
+                if answer:
+                    yield {'event': 'token', 'data': answer}
+                yield {'event': 'done', 'data': {'context_count': len(sources), 'tool_calls': tool_calls}}
+                return
+
+        context = await self.aretrieve_context(user_question, mode=retrieval_mode)
+        messages, sources = self._build_rag_messages(user_question, context)
+
+        # Sources are known before generation starts, so send them first
+        yield {'event': 'sources', 'data': sources}
+
+        stream = await self.async_openai_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            max_tokens=1024,
+            messages=messages,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield {'event': 'token', 'data': chunk.choices[0].delta.content}
+
+        yield {'event': 'done', 'data': {'context_count': len(context), 'tool_calls': []}}
+
+    def shutdown(self) -> None:
+        """Release executor threads and the cache connections."""
+        self._query_batcher.close()
+        self._io_executor.shutdown(wait=False)
+        self._tool_executor.shutdown(wait=False)
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+        if self.parse_cache is not None:
+            self.parse_cache.close()
+        if self.answer_cache is not None:
+            self.answer_cache.close()
+
+    def get_stats(self) -> dict:
+        """Return runtime statistics for caches and other components.
+
+        Returns:
+            Dictionary of component statistics
+        """
+        return {
+            'index_generation': self.index_generation,
+            'query_embedding_cache': self.query_embedding_cache.stats(),
+            'answer_cache': self.answer_cache.stats() if self.answer_cache is not None else None,
+            'query_coalescing': self._inflight_queries.stats(),
+            'tool_circuit': self.tool_breaker.stats(),
+            'query_embedding_batcher': self._query_batcher.stats()
+        }
+
+    def initialize(self, chapters_dir: str = "data/chapters", incremental: bool = True,
+                   progress: Optional[Callable] = None,
+                   cancel_event: Optional[threading.Event] = None) -> dict:
         """Initialize the RAG system by loading and embedding documents.
 
+        If the build fails or is cancelled, the previously loaded documents
+        are restored so they keep matching the live index.
+
         Args:
             chapters_dir: Directory containing chapter files
+            incremental: Only re-embed chunks that changed since the last build
+            progress: Optional callback receiving progress counters as keyword
+                arguments (files_parsed, chunks_embedded, chunks_written, ...)
+            cancel_event: Optional event that cancels the build when set
 
         Returns:
             Initialization status dictionary
         """
-        try:
+        def build():
             # Load documents
-            doc_count = self.load_documents(chapters_dir)
+            doc_count = self.load_documents(chapters_dir, progress=progress, cancel_event=cancel_event)
 
             # Create embeddings
-            embed_count = self.create_embeddings()
+            embed_count = self.create_embeddings(
+                incremental=incremental, progress=progress, cancel_event=cancel_event
+            )
+
+            return {
+                'status': 'success',
+                'documents_loaded': doc_count,
+                'embeddings_created': embed_count,
+                'message': f'RAG system initialized with {doc_count} documents ({embed_count} embedded)'
+            }
+
+        return self._run_build(build)
+
+    def reindex_files(self, chapter_paths, chapters_dir: str = "data/chapters", embed: bool = True,
+                      progress: Optional[Callable] = None,
+                      cancel_event: Optional[threading.Event] = None) -> dict:
+        """Re-parse changed chapter files and re-embed only their chunks.
+
+        Called by the chapter watcher. Like initialize(), the previously
+        loaded documents are restored if the build fails or is cancelled.
+
+        Args:
+            chapter_paths: Paths of created, modified or deleted chapter files
+            chapters_dir: Directory containing chapter files
+            embed: Also build a new index generation; pre-fork workers that
+                do not own the index only refresh their documents
+            progress: Optional callback receiving progress counters
+            cancel_event: Optional event that cancels the build when set
+
+        Returns:
+            Re-index status dictionary
+        """
+        def build():
+            doc_count = self.update_documents(chapter_paths, chapters_dir)
+            embed_count = self.create_embeddings(
+                incremental=True, progress=progress, cancel_event=cancel_event
+            ) if embed else 0
 
             return {
                 'status': 'success',
+                'files_changed': len(chapter_paths),
                 'documents_loaded': doc_count,
                 'embeddings_created': embed_count,
-                'message': f'RAG system initialized with {embed_count} documents'
+                'message': f'Re-indexed {len(chapter_paths)} changed files ({embed_count} chunks embedded)'
+            }
+
+        return self._run_build(build)
+
+    def _run_build(self, build: Callable[[], dict]) -> dict:
+        """Run a document/index build, restoring the documents on failure.
+
+        Args:
+            build: Function performing the build and returning its status
+
+        Returns:
+            The build's status dictionary, or a 'cancelled'/'error' status
+        """
+        previous = self._corpus
+        try:
+            return build()
+        except IndexBuildCancelled as e:
+            self._corpus = previous
+            return {
+                'status': 'cancelled',
+                'message': str(e)
             }
         except Exception as e:
+            self._corpus = previous
             return {
                 'status': 'error',
                 'message': str(e)
@@ -1,7 +1,7 @@
 """Tests for FastAPI endpoints (Bugs #4, #5)."""
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
 @pytest.fixture
@@ -12,9 +12,10 @@ def client_with_rag(mocker):
     # Mock the global rag_system
     mock_rag = MagicMock()
     mock_rag.collection.count.return_value = 25
+    mock_rag.aquery = AsyncMock()
 
     # Setup default query response
-    mock_rag.query.return_value = {
+    mock_rag.aquery.return_value = {
         "answer": "Test answer",
         "sources": [{"chapter": "Ch1", "url": "http://example.com"}],
         "context_count": 1
@@ -65,6 +66,22 @@ class TestEndpoints:
         assert "sources" in data
         assert "context_count" in data
 
+    def test_query_reports_cached_answer(self, client_with_rag):
+        """Test that /api/query passes the answer-cache flag through."""
+        client, mock_rag = client_with_rag
+
+        fresh = client.post("/api/query", json={"question": "What is Python?"}).json()
+        mock_rag.aquery.return_value = {
+            **mock_rag.aquery.return_value,
+            "cached": True,
+            "similarity": 0.97
+        }
+        hit = client.post("/api/query", json={"question": "What's Python?"}).json()
+
+        assert fresh["cached"] is False and fresh["similarity"] is None
+        assert hit["cached"] is True
+        assert hit["similarity"] == pytest.approx(0.97)
+
     def test_query_before_startup(self, mocker):
         """Test query when RAG system not initialized (Bug #4)."""
         from main import app
@@ -119,7 +136,7 @@ class TestEndpoints:
         client, mock_rag = client_with_rag
 
         # Setup responses for concurrent calls
-        mock_rag.query.side_effect = [
+        mock_rag.aquery.side_effect = [
             {
                 "answer": "Response 1",
                 "sources": [],
@@ -187,9 +204,9 @@ class TestEndpoints:
         )
 
         assert response.status_code == 200
-        mock_rag.query.assert_called()
+        mock_rag.aquery.assert_called()
         # Check use_tools was passed
-        call_args = mock_rag.query.call_args
+        call_args = mock_rag.aquery.call_args
         assert "use_tools" in call_args.kwargs or (len(call_args.args) > 1)
 
     def test_root_endpoint(self, client_with_rag):
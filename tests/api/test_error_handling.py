@@ -1,7 +1,7 @@
 """Tests for error handling consistency (Bugs #2, #5, #7)."""
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from anthropic import APIError
 
 
@@ -12,6 +12,7 @@ def client_with_errors(mocker):
 
     mock_rag = MagicMock()
     mock_rag.collection.count.return_value = 25
+    mock_rag.aquery = AsyncMock()
     mocker.patch("main.rag_system", mock_rag)
 
     return TestClient(app), mock_rag
@@ -61,7 +62,7 @@ class TestErrorHandling:
         client, mock_rag = client_with_errors
 
         # Mock API error
-        mock_rag.query.side_effect = APIError(
+        mock_rag.aquery.side_effect = APIError(
             message="API key invalid",
             response=MagicMock(status_code=401),
             body={"error": {"type": "authentication_error"}}
@@ -84,7 +85,7 @@ class TestErrorHandling:
         client, mock_rag = client_with_errors
 
         # Mock authentication error
-        mock_rag.query.side_effect = APIError(
+        mock_rag.aquery.side_effect = APIError(
             message="No API key provided",
             response=MagicMock(status_code=401),
             body={"error": {"type": "authentication_error"}}
@@ -104,7 +105,7 @@ class TestErrorHandling:
         """Test error response when ChromaDB fails."""
         client, mock_rag = client_with_errors
 
-        mock_rag.query.side_effect = ConnectionError(
+        mock_rag.aquery.side_effect = ConnectionError(
             "ChromaDB connection failed"
         )
 
@@ -122,7 +123,7 @@ class TestErrorHandling:
         """Test error response for timeout (Bug #7)."""
         client, mock_rag = client_with_errors
 
-        mock_rag.query.side_effect = TimeoutError(
+        mock_rag.aquery.side_effect = TimeoutError(
             "Query timed out after 30 seconds"
         )
 
@@ -174,7 +175,7 @@ class TestErrorHandling:
         """Test that exception tracebacks are not exposed (security)."""
         client, mock_rag = client_with_errors
 
-        mock_rag.query.side_effect = Exception("Internal error details")
+        mock_rag.aquery.side_effect = Exception("Internal error details")
 
         response = client.post(
             "/api/query",
@@ -195,7 +196,7 @@ class TestErrorHandling:
         client, mock_rag = client_with_errors
 
         # Mock a very large response
-        mock_rag.query.return_value = {
+        mock_rag.aquery.return_value = {
             "answer": "A" * 100000,  # 100KB response
             "sources": [],
             "context_count": 0
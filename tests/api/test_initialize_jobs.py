@@ -0,0 +1,208 @@
+"""Tests for the background /api/initialize job endpoints."""
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock
+
+from backend.jobs import JobManager
+
+
+def _wait_until_done(client, job_id, timeout=5.0):
+    """Poll a job until it finishes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/initialize/{job_id}").json()
+        if job['status'] in ("succeeded", "failed", "cancelled"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+@pytest.fixture
+def jobs_client(mocker):
+    """Create a test client with a mocked RAG system and a fresh job manager."""
+    from main import app
+
+    mock_rag = MagicMock()
+    mocker.patch("main.rag_system", mock_rag)
+    mocker.patch("main.index_jobs", JobManager())
+
+    return TestClient(app), mock_rag
+
+
+class TestInitializeJobs:
+    """Test starting, polling and cancelling rebuild jobs."""
+
+    def test_rebuild_runs_in_background(self, jobs_client):
+        client, mock_rag = jobs_client
+
+        def initialize(chapters_dir, incremental, progress, cancel_event):
+            progress(files_parsed=2, files_total=2)
+            progress(chunks_embedded=5, chunks_to_embed=5, chunks_written=9, chunks_total=9)
+            return {'status': 'success', 'documents_loaded': 9, 'embeddings_created': 5}
+
+        mock_rag.initialize.side_effect = initialize
+
+        response = client.post("/api/initialize?full=true")
+
+        assert response.status_code == 202
+        started = response.json()
+        assert started['status_url'] == f"/api/initialize/{started['job_id']}"
+
+        job = _wait_until_done(client, started['job_id'])
+        assert job['status'] == "succeeded"
+        assert job['progress']['files_parsed'] == 2
+        assert job['progress']['chunks_written'] == 9
+        assert job['result']['embeddings_created'] == 5
+        assert mock_rag.initialize.call_args.kwargs['incremental'] is False
+
+    def test_concurrent_rebuild_rejected(self, jobs_client):
+        client, mock_rag = jobs_client
+        release = threading.Event()
+        mock_rag.initialize.side_effect = lambda *args, **kwargs: release.wait(5) and {'status': 'success'}
+
+        first = client.post("/api/initialize")
+        second = client.post("/api/initialize")
+        release.set()
+
+        assert first.status_code == 202
+        assert second.status_code == 409
+        assert first.json()['job_id'] in second.json()['detail']
+        _wait_until_done(client, first.json()['job_id'])
+
+    def test_cancel_running_job(self, jobs_client):
+        client, mock_rag = jobs_client
+        started = threading.Event()
+
+        def initialize(chapters_dir, incremental, progress, cancel_event):
+            started.set()
+            cancel_event.wait(5)
+            return {'status': 'cancelled', 'message': "Index build cancelled"}
+
+        mock_rag.initialize.side_effect = initialize
+        job_id = client.post("/api/initialize").json()['job_id']
+        started.wait(5)
+
+        response = client.delete(f"/api/initialize/{job_id}")
+
+        assert response.status_code == 200
+        assert response.json()['cancel_requested'] is True
+        assert _wait_until_done(client, job_id)['status'] == "cancelled"
+        assert client.delete(f"/api/initialize/{job_id}").status_code == 409
+
+    def test_failed_rebuild_reported(self, jobs_client):
+        client, mock_rag = jobs_client
+        mock_rag.initialize.return_value = {'status': 'error', 'message': "No markdown files found"}
+
+        job_id = client.post("/api/initialize").json()['job_id']
+        job = _wait_until_done(client, job_id)
+
+        assert job['status'] == "failed"
+        assert job['error'] == "No markdown files found"
+
+    def test_unknown_job(self, jobs_client):
+        client, _ = jobs_client
+
+        assert client.get("/api/initialize/nope").status_code == 404
+        assert client.delete("/api/initialize/nope").status_code == 404
+
+
+class TestBuildsShareTheJobGuard:
+    """Test that warm-up and watcher builds cannot overlap an API rebuild."""
+
+    def test_rebuild_rejected_during_warm_up_build(self, jobs_client):
+        import main
+
+        client, mock_rag = jobs_client
+        started, release = threading.Event(), threading.Event()
+
+        def initialize(chapters_dir, progress, cancel_event):
+            started.set()
+            release.wait(5)
+            return {'status': 'success', 'message': "built"}
+
+        mock_rag.initialize.side_effect = initialize
+        results = []
+        warm_up = threading.Thread(target=lambda: results.append(main._build_initial_index()))
+        warm_up.start()
+        started.wait(5)
+
+        response = client.post("/api/initialize")
+        release.set()
+        warm_up.join(5)
+
+        assert response.status_code == 409
+        assert results == [{'status': 'success', 'message': "built"}]
+        assert mock_rag.initialize.call_count == 1
+
+    def test_warm_up_waits_for_rebuild_already_running(self, jobs_client):
+        import main
+
+        client, mock_rag = jobs_client
+        release = threading.Event()
+        mock_rag.initialize.side_effect = lambda *args, **kwargs: release.wait(5) and {'status': 'success'}
+        client.post("/api/initialize")
+
+        threading.Timer(0.05, release.set).start()
+        result = main._build_initial_index()
+
+        assert result == {'status': 'success'}
+        assert mock_rag.initialize.call_count == 1
+
+    def test_watcher_refresh_in_non_owner_runs_as_job(self, jobs_client, mocker):
+        import main
+
+        client, mock_rag = jobs_client
+        mocker.patch("main.index_owner", False)
+        mock_rag.reindex_files.return_value = {'status': 'success', 'message': "refreshed"}
+
+        main._on_chapters_changed({"data/chapters/chapter1_intro.md"})
+        job = next(iter(main.index_jobs._jobs.values()))
+        job.wait(5)
+
+        assert job.kind == "reindex"
+        assert job.status == "succeeded"
+        assert mock_rag.reindex_files.call_args.kwargs['embed'] is False
+
+
+class TestInitializeCancellation:
+    """Test progress and cancellation inside RAGSystem.initialize."""
+
+    def test_progress_counters(self, fake_rag_system, tmp_path):
+        chapters = tmp_path / "chapters"
+        chapters.mkdir()
+        (chapters / "chapter1_intro.md").write_text("## One\nBody one\n\n## Two\nBody two\n")
+        counters = {}
+
+        result = fake_rag_system.initialize(str(chapters), progress=lambda **c: counters.update(c))
+
+        assert result['status'] == "success"
+        assert counters == {
+            'files_parsed': 1, 'files_total': 1,
+            'chunks_to_embed': 2, 'chunks_embedded': 2,
+            'chunks_total': 2, 'chunks_written': 2
+        }
+
+    def test_cancelled_build_keeps_live_index(self, fake_rag_system, tmp_path):
+        chapters = tmp_path / "chapters"
+        chapters.mkdir()
+        (chapters / "chapter1_intro.md").write_text("## One\nBody one\n")
+        fake_rag_system.initialize(str(chapters))
+        live, documents = fake_rag_system.collection, fake_rag_system.documents
+
+        (chapters / "chapter2_tools.md").write_text("## Tools\nTool body\n")
+        cancel_event = threading.Event()
+
+        def cancel_after_parsing(**counters):
+            if counters.get('files_parsed') == 2:
+                cancel_event.set()
+
+        result = fake_rag_system.initialize(
+            str(chapters), incremental=False, progress=cancel_after_parsing, cancel_event=cancel_event
+        )
+
+        assert result['status'] == "cancelled"
+        assert fake_rag_system.collection is live
+        assert fake_rag_system.documents is documents
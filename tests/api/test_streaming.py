@@ -0,0 +1,102 @@
+"""Tests for the Server-Sent Events query endpoint."""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock
+
+
+def _parse_sse(body):
+    """Split an SSE body into (event, data) pairs."""
+    events = []
+    for raw in body.strip().split("\n\n"):
+        lines = raw.split("\n")
+        name = next(line[len("event: "):] for line in lines if line.startswith("event: "))
+        data = next(line[len("data: "):] for line in lines if line.startswith("data: "))
+        events.append((name, json.loads(data)))
+    return events
+
+
+@pytest.fixture
+def streaming_client(mocker):
+    """Create a test client whose RAG system streams a canned answer."""
+    from main import app
+
+    mock_rag = MagicMock()
+    mock_rag.collection.count.return_value = 25
+
+    async def astream_query(question, use_tools=True, retrieval_mode=None):
+        yield {'event': 'sources', 'data': [{"chapter": "Ch1", "url": "http://example.com"}]}
+        yield {'event': 'token', 'data': "Hello"}
+        yield {'event': 'token', 'data': " world"}
+        yield {'event': 'done', 'data': {'context_count': 1, 'tool_calls': []}}
+
+    mock_rag.astream_query = astream_query
+    mocker.patch("main.rag_system", mock_rag)
+
+    return TestClient(app), mock_rag
+
+
+class TestStreamingEndpoint:
+    """Test /api/query/stream."""
+
+    def test_streams_sources_then_tokens(self, streaming_client):
+        client, _ = streaming_client
+
+        response = client.post("/api/query/stream", json={"question": "Hi?"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(response.text)
+        assert [name for name, _ in events] == ["sources", "token", "token", "done"]
+        assert "".join(data for name, data in events if name == "token") == "Hello world"
+
+    def test_empty_question_rejected(self, streaming_client):
+        client, _ = streaming_client
+
+        response = client.post("/api/query/stream", json={"question": "  "})
+
+        assert response.status_code == 400
+
+    def test_error_mid_stream_reported_in_band(self, streaming_client):
+        client, mock_rag = streaming_client
+
+        async def failing_stream(question, use_tools=True, retrieval_mode=None):
+            yield {'event': 'sources', 'data': []}
+            raise RuntimeError("secret internal failure")
+
+        mock_rag.astream_query = failing_stream
+
+        response = client.post("/api/query/stream", json={"question": "Hi?"})
+
+        events = _parse_sse(response.text)
+        assert [name for name, _ in events] == ["sources", "error"]
+        assert "secret" not in response.text
+
+
+class TestAstreamQuery:
+    """Test RAGSystem.astream_query token streaming."""
+
+    @pytest.mark.asyncio
+    async def test_classic_rag_streams_tokens(self, fake_rag_system, tmp_path):
+        chapters = tmp_path / "chapters"
+        chapters.mkdir()
+        (chapters / "chapter1_intro.md").write_text("## Reading files\nUse the Read tool.\n")
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+
+        async def token_stream():
+            for piece in ["Use ", "Read", None]:
+                yield MagicMock(choices=[MagicMock(delta=MagicMock(content=piece))])
+
+        async def create(**kwargs):
+            assert kwargs["stream"] is True
+            return token_stream()
+
+        fake_rag_system.async_openai_client.chat.completions.create = create
+
+        events = [event async for event in fake_rag_system.astream_query("read?", use_tools=False)]
+
+        assert events[0]['event'] == 'sources'
+        assert [e['data'] for e in events if e['event'] == 'token'] == ["Use ", "Read"]
+        assert events[-1] == {'event': 'done', 'data': {'context_count': 1, 'tool_calls': []}}
@@ -1,9 +1,11 @@
 """Shared test fixtures and mocks for RAG chatbot tests."""
+import hashlib
 import os
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, MagicMock
 
+import numpy as np
 import pytest
 import chromadb
 from sentence_transformers import SentenceTransformer
@@ -223,3 +225,41 @@ def mock_fastapi_app(mock_rag_system, mocker):
     mocker.patch('main.rag_system', mock_rag_system)
 
     return TestClient(app)
+
+
+def _fake_vector(text):
+    """Deterministic 8-dim vector derived from the text hash."""
+    digest = hashlib.sha256(text.encode('utf-8')).digest()
+    return np.frombuffer(digest[:8], dtype=np.uint8).astype(np.float32) + 1.0
+
+
+@pytest.fixture
+def fake_embedding_model():
+    """Embedding model stand-in that records every text it encodes."""
+    encoder = MagicMock()
+    encoder.encoded = []
+
+    def encode(texts, **kwargs):
+        if isinstance(texts, str):
+            encoder.encoded.append(texts)
+            return _fake_vector(texts)
+        encoder.encoded.extend(texts)
+        return np.stack([_fake_vector(t) for t in texts]) if texts else np.zeros((0, 8), dtype=np.float32)
+
+    encoder.encode.side_effect = encode
+    return encoder
+
+
+@pytest.fixture
+def fake_rag_system(tmp_path, fake_embedding_model, mocker):
+    """RAGSystem backed by a throwaway on-disk ChromaDB and a fake encoder."""
+    mocker.patch('rag_system.SentenceTransformer', return_value=fake_embedding_model)
+    mocker.patch('rag_system.OpenAI')
+    mocker.patch('rag_system.AsyncOpenAI')
+    from rag_system import RAGSystem
+    return RAGSystem(
+        db_path=str(tmp_path / "chroma_db"),
+        embedding_cache_path=str(tmp_path / "embedding_cache.db"),
+        parse_cache_path=str(tmp_path / "parse_cache.db"),
+        answer_cache_path=str(tmp_path / "answer_cache.db")
+    )
@@ -0,0 +1,69 @@
+"""Integration tests for the non-blocking async query path."""
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+def _chat_response(text):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=text))])
+
+
+@pytest.fixture
+def indexed_rag(fake_rag_system, tmp_path):
+    chapters = tmp_path / "chapters"
+    chapters.mkdir()
+    (chapters / "chapter1_intro.md").write_text("## Reading files\nUse the Read tool.\n")
+    fake_rag_system.load_documents(str(chapters))
+    fake_rag_system.create_embeddings()
+    return fake_rag_system
+
+
+class TestAsyncPipeline:
+    """Test aquery and its helpers."""
+
+    @pytest.mark.asyncio
+    async def test_aquery_classic_rag(self, indexed_rag):
+        indexed_rag.async_openai_client.chat.completions.create = AsyncMock(
+            return_value=_chat_response("Async answer")
+        )
+
+        result = await indexed_rag.aquery("How do I read files?", use_tools=False)
+
+        assert result['answer'] == "Async answer"
+        assert result['context_count'] == 1
+        assert result['sources'][0]['chapter'] == "chapter1_intro"
+
+    @pytest.mark.asyncio
+    async def test_embedding_runs_on_dedicated_thread(self, indexed_rag, fake_embedding_model):
+        threads = []
+        encode = fake_embedding_model.encode.side_effect
+
+        def recording_encode(texts, **kwargs):
+            threads.append(threading.current_thread().name)
+            return encode(texts, **kwargs)
+
+        fake_embedding_model.encode.side_effect = recording_encode
+
+        await indexed_rag.aretrieve_context("a brand new question")
+
+        assert threads and threads[0].startswith("rag-embed")
+
+    @pytest.mark.asyncio
+    async def test_slow_llm_calls_overlap(self, indexed_rag):
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.3)
+            return _chat_response("done")
+
+        indexed_rag.async_openai_client.chat.completions.create = slow_create
+
+        start = time.monotonic()
+        results = await asyncio.gather(*[
+            indexed_rag.aquery(f"question {i}", use_tools=False) for i in range(5)
+        ])
+        elapsed = time.monotonic() - start
+
+        assert [r['answer'] for r in results] == ["done"] * 5
+        assert elapsed < 1.0
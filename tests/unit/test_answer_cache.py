@@ -0,0 +1,153 @@
+"""Unit tests for the semantic answer cache."""
+import numpy as np
+import pytest
+
+from backend.answer_cache import SemanticAnswerCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def vector(*values):
+    return np.array(values, dtype=np.float32)
+
+
+RESULT = {'answer': "Use /help", 'sources': [{'chapter': "chapter1_intro", 'url': ''}], 'context_count': 1}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = SemanticAnswerCache(str(tmp_path / "answers.db"), max_entries=3, ttl=60, threshold=0.9, timer=clock)
+    yield cache
+    cache.close()
+
+
+class TestSemanticAnswerCache:
+    """Test similarity lookup, invalidation and eviction."""
+
+    def test_similar_question_hits_with_original_sources(self, cache):
+        cache.put("how do i get help", vector(1, 0, 0), 1, "tools", RESULT)
+
+        hit = cache.get(vector(0.98, 0.1, 0), 1, "tools")
+
+        assert hit['answer'] == "Use /help"
+        assert hit['sources'] == RESULT['sources']
+        assert hit['similarity'] > 0.9
+
+    def test_dissimilar_question_misses(self, cache):
+        cache.put("how do i get help", vector(1, 0, 0), 1, "tools", RESULT)
+
+        assert cache.get(vector(0.5, 0.8, 0), 1, "tools") is None
+        assert cache.stats()['misses'] == 1
+
+    def test_variant_must_match(self, cache):
+        cache.put("how do i get help", vector(1, 0, 0), 1, "tools", RESULT)
+
+        assert cache.get(vector(1, 0, 0), 1, "rag:hybrid") is None
+
+    def test_new_generation_invalidates(self, cache):
+        cache.put("how do i get help", vector(1, 0, 0), 1, "tools", RESULT)
+
+        assert cache.get(vector(1, 0, 0), 2, "tools") is None
+        assert len(cache) == 0
+
+    def test_answer_from_replaced_generation_not_stored(self, cache):
+        cache.get(vector(1, 0, 0), 2, "tools")
+
+        cache.put("how do i get help", vector(1, 0, 0), 1, "tools", RESULT)
+
+        assert len(cache) == 0
+
+    def test_entries_expire(self, cache, clock):
+        cache.put("how do i get help", vector(1, 0, 0), 1, "tools", RESULT)
+        clock.now += 61
+
+        assert cache.get(vector(1, 0, 0), 1, "tools") is None
+
+    def test_least_recently_used_evicted(self, cache):
+        for i, v in enumerate([vector(1, 0, 0), vector(0, 1, 0), vector(0, 0, 1)]):
+            cache.put(f"q{i}", v, 1, "tools", RESULT)
+        cache.get(vector(1, 0, 0), 1, "tools")  # q0 is now the most recent
+
+        cache.put("q3", vector(1, 1, 0), 1, "tools", RESULT)
+
+        assert cache.get(vector(0, 1, 0), 1, "tools") is None
+        assert cache.get(vector(1, 0, 0), 1, "tools") is not None
+
+    def test_entries_survive_restart(self, cache, clock):
+        cache.put("how do i get help", vector(1, 0, 0), 1, "tools", RESULT)
+        cache.close()
+
+        reopened = SemanticAnswerCache(cache.path, threshold=0.9, timer=clock)
+
+        assert reopened.get(vector(1, 0, 0), 1, "tools")['answer'] == "Use /help"
+        reopened.close()
+
+
+class TestQueryAnswerCache:
+    """Test the answer cache in front of RAGSystem.query."""
+
+    def test_repeated_question_served_from_cache(self, fake_rag_system, mocker):
+        run = mocker.patch.object(fake_rag_system, '_run_query', return_value=dict(RESULT))
+
+        first = fake_rag_system.query("How do I get help?", use_tools=False)
+        second = fake_rag_system.query("  how do I get HELP? ", use_tools=False)
+
+        assert run.call_count == 1
+        assert 'cached' not in first
+        assert second['cached'] is True
+        assert second['sources'] == RESULT['sources']
+        assert fake_rag_system.get_stats()['answer_cache']['hits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_query_shares_cache(self, fake_rag_system, mocker):
+        run = mocker.patch.object(fake_rag_system, '_arun_query', return_value=dict(RESULT))
+
+        await fake_rag_system.aquery("How do I get help?")
+        second = await fake_rag_system.aquery("How do I get help?")
+
+        assert run.await_count == 1
+        assert second['cached'] is True
+
+    def test_incomplete_answers_not_cached(self, fake_rag_system, mocker):
+        from rag_system import MAX_ITERATIONS_ANSWER
+        run = mocker.patch.object(
+            fake_rag_system, '_run_query', return_value={**RESULT, 'answer': MAX_ITERATIONS_ANSWER}
+        )
+
+        fake_rag_system.query("How do I get help?")
+        fake_rag_system.query("How do I get help?")
+
+        assert run.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_streamed_answer_cached_and_replayed(self, fake_rag_system, mocker):
+        calls = []
+
+        async def fake_stream(question, use_tools, retrieval_mode):
+            calls.append(question)
+            yield {'event': 'sources', 'data': RESULT['sources']}
+            yield {'event': 'token', 'data': "Use "}
+            yield {'event': 'token', 'data': "/help"}
+            yield {'event': 'done', 'data': {'context_count': 1, 'tool_calls': []}}
+
+        mocker.patch.object(fake_rag_system, '_astream_query', side_effect=fake_stream)
+
+        first = [event async for event in fake_rag_system.astream_query("How do I get help?")]
+        second = [event async for event in fake_rag_system.astream_query("How do I get help?")]
+
+        assert len(calls) == 1
+        assert [e['event'] for e in second] == ['sources', 'token', 'done']
+        assert second[1]['data'] == "Use /help"
+        assert second[2]['data']['cached'] is True
+        assert first[-1]['data'] == {'context_count': 1, 'tool_calls': []}
@@ -0,0 +1,47 @@
+"""Unit tests for batched embedding in create_embeddings."""
+
+
+class TestBatchedEmbedding:
+    """Test that chunks are encoded in real batches."""
+
+    def test_encode_receives_batches(self, fake_rag_system, fake_embedding_model):
+        fake_rag_system.embed_batch_size = 4
+        texts = [f"text {i} " + "x" * i for i in range(10)]
+
+        fake_rag_system._embed_texts(texts)
+
+        calls = fake_embedding_model.encode.call_args_list
+        assert len(calls) == 3
+        assert all(isinstance(call.args[0], list) for call in calls)
+        assert [len(call.args[0]) for call in calls] == [4, 4, 2]
+
+    def test_batches_are_length_sorted(self, fake_rag_system, fake_embedding_model):
+        fake_rag_system.embed_batch_size = 2
+        texts = ["a", "a" * 50, "a" * 10, "a" * 30]
+
+        fake_rag_system._embed_texts(texts)
+
+        batches = [call.args[0] for call in fake_embedding_model.encode.call_args_list]
+        assert batches == [["a" * 50, "a" * 30], ["a" * 10, "a"]]
+
+    def test_embeddings_keep_input_order(self, fake_rag_system, fake_embedding_model):
+        fake_rag_system.embed_batch_size = 3
+        texts = ["short", "a much longer piece of text", "mid length"]
+
+        embeddings = fake_rag_system._embed_texts(texts)
+
+        for text, embedding in zip(texts, embeddings):
+            assert embedding == fake_embedding_model.encode(text).tolist()
+
+    def test_chroma_writes_use_large_batches(self, fake_rag_system, tmp_path, mocker):
+        chapters = tmp_path / "chapters"
+        chapters.mkdir()
+        body = "\n".join(f"## Section {i}\nBody {i}\n" for i in range(25))
+        (chapters / "chapter1_big.md").write_text(body)
+        fake_rag_system.load_documents(str(chapters))
+        add = mocker.spy(type(fake_rag_system.collection), 'add')
+
+        fake_rag_system.create_embeddings()
+
+        assert add.call_count == 1
+        assert len(add.call_args.kwargs['ids']) == 25
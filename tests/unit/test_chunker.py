@@ -0,0 +1,115 @@
+"""Unit tests for token-aware chunking."""
+import pytest
+
+from backend.chunker import TokenChunker
+
+
+class WhitespaceTokenizer:
+    """Tokenizer stand-in: one token per whitespace-separated word."""
+
+    name_or_path = "whitespace"
+
+    def encode(self, text, add_special_tokens=True):
+        return text.split()
+
+
+def words(start, count):
+    return " ".join(f"w{i}" for i in range(start, start + count))
+
+
+class TestTokenChunker:
+    """Test chunk limits, split boundaries and overlap."""
+
+    def test_short_text_is_one_chunk(self):
+        chunker = TokenChunker(max_tokens=50, overlap_tokens=5, tokenizer=WhitespaceTokenizer())
+
+        assert chunker.split("First paragraph.\n\nSecond paragraph.") == ["First paragraph.\n\nSecond paragraph."]
+
+    def test_chunks_respect_token_limit(self):
+        tokenizer = WhitespaceTokenizer()
+        chunker = TokenChunker(max_tokens=20, overlap_tokens=4, tokenizer=tokenizer)
+        text = "\n\n".join(words(i * 8, 8) + "." for i in range(10))
+
+        chunks = chunker.split(text)
+
+        assert len(chunks) > 1
+        assert all(len(tokenizer.encode(chunk)) <= 20 for chunk in chunks)
+
+    def test_splits_on_paragraphs_then_sentences(self):
+        chunker = TokenChunker(max_tokens=10, overlap_tokens=0, tokenizer=WhitespaceTokenizer())
+        text = "Alpha beta gamma.\n\nOne two three four five six. Seven eight nine ten eleven twelve."
+
+        chunks = chunker.split(text)
+
+        assert chunks == [
+            "Alpha beta gamma.\n\nOne two three four five six.",
+            "Seven eight nine ten eleven twelve."
+        ]
+
+    def test_overlong_sentence_split_between_words(self):
+        chunker = TokenChunker(max_tokens=10, overlap_tokens=0, tokenizer=WhitespaceTokenizer())
+
+        chunks = chunker.split(words(0, 25))
+
+        assert chunks == [words(0, 10), words(10, 10), words(20, 5)]
+
+    def test_overlap_repeats_tail_of_previous_chunk(self):
+        chunker = TokenChunker(max_tokens=10, overlap_tokens=3, tokenizer=WhitespaceTokenizer())
+
+        chunks = chunker.split(f"{words(0, 8)}.\n\n{words(8, 6)}.")
+
+        assert chunks[0] == f"{words(0, 8)}."
+        assert chunks[1].startswith("w5 w6 w7.")
+        assert chunks[1].endswith(f"{words(8, 6)}.")
+
+    def test_code_fences_stay_intact(self):
+        chunker = TokenChunker(max_tokens=8, overlap_tokens=2, tokenizer=WhitespaceTokenizer())
+        code = "```bash\nclaude --help\n\nclaude --version and other long flags here\n```"
+        text = f"Intro words here.\n\n{code}\n\nOutro words here."
+
+        chunks = chunker.split(text)
+
+        assert code in chunks
+        assert all(chunk.count("```") in (0, 2) for chunk in chunks)
+        # The chunk after a code block does not start with a piece of it
+        assert chunks[chunks.index(code) + 1] == "Outro words here."
+
+    def test_approximate_count_without_tokenizer(self):
+        chunker = TokenChunker(max_tokens=10, overlap_tokens=0)
+
+        assert chunker.count_tokens("claude --help, please") == 6
+
+    def test_overlap_must_be_below_limit(self):
+        with pytest.raises(ValueError):
+            TokenChunker(max_tokens=10, overlap_tokens=10)
+
+
+class TestTokenChunkStrategy:
+    """Test the "tokens" chunk strategy in RAGSystem.load_documents."""
+
+    def test_long_section_split_with_parent_section(self, fake_rag_system, fake_embedding_model, tmp_path):
+        chapters = tmp_path / "chapters"
+        chapters.mkdir()
+        body = "\n\n".join(words(i * 30, 30) + "." for i in range(4))
+        (chapters / "chapter1_intro.md").write_text(f"## Short\nTiny section\n\n## Long\n{body}\n")
+        fake_embedding_model.tokenizer = WhitespaceTokenizer()
+        fake_rag_system.chunk_strategy = "tokens"
+        fake_rag_system.max_chunk_tokens = 64
+        fake_rag_system.chunk_overlap_tokens = 8
+
+        fake_rag_system.load_documents(str(chapters))
+
+        docs = fake_rag_system.documents
+        long_ids = [doc_id for doc_id, doc in docs.items() if doc['parent_section'] == "Long"]
+        assert "chapter1_intro_chunk_0_0" in docs
+        assert long_ids == [f"chapter1_intro_chunk_1_{i}" for i in range(len(long_ids))]
+        assert len(long_ids) == 3  # 60, 8 + 30 and 8 + 30 tokens
+        assert all(docs[doc_id]['title'] == "Long" for doc_id in long_ids)
+        assert fake_rag_system._document_metadata(docs[long_ids[0]])['parent_section'] == "Long"
+
+    def test_unknown_strategy_rejected(self, fake_embedding_model, mocker):
+        mocker.patch('rag_system.SentenceTransformer', return_value=fake_embedding_model)
+        from rag_system import RAGSystem
+
+        with pytest.raises(ValueError):
+            RAGSystem(chunk_strategy="paragraphs", embedding_cache_path=None)
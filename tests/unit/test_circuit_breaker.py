@@ -0,0 +1,112 @@
+"""Unit tests for the tool-calling circuit breaker."""
+import pytest
+
+from backend.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=0.5, window=10, min_calls=4, reset_timeout=30, timer=clock)
+
+
+class TestCircuitBreaker:
+    """Test state transitions and counters."""
+
+    def test_opens_at_failure_rate(self, breaker):
+        for _ in range(2):
+            breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()  # 2 of 4 failed
+
+        assert breaker.state == OPEN
+        assert breaker.allow() is False
+        assert breaker.stats()['rejected'] == 1
+
+    def test_needs_min_calls_before_opening(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+
+        assert breaker.state == CLOSED
+        assert breaker.allow() is True
+
+    def test_half_open_probe_success_closes(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now += 30
+
+        assert breaker.allow() is True
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is False  # Only one probe at a time
+
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        assert breaker.stats()['failure_rate'] == 0.0
+
+    def test_half_open_probe_failure_reopens(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now += 30
+        breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.allow() is False
+        assert breaker.stats()['trips'] == 2
+
+    def test_lost_probe_is_replaced(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now += 30
+        breaker.allow()  # Probe never reports back
+
+        clock.now += 30
+
+        assert breaker.allow() is True
+
+
+class TestToolCircuit:
+    """Test the breaker in front of the tool-calling path."""
+
+    def test_failing_tool_path_is_skipped_once_open(self, fake_rag_system, mocker):
+        tools = mocker.patch.object(
+            fake_rag_system, 'generate_response_with_tools', side_effect=RuntimeError("bad tool schema")
+        )
+        mocker.patch.object(fake_rag_system, 'retrieve_context', return_value=[])
+        mocker.patch.object(fake_rag_system, 'generate_response', return_value=("RAG answer", []))
+        fake_rag_system.answer_cache = None
+
+        answers = [fake_rag_system.query(f"question {i}")['answer'] for i in range(8)]
+
+        assert answers == ["RAG answer"] * 8
+        assert tools.call_count == 5
+        stats = fake_rag_system.get_stats()['tool_circuit']
+        assert stats['state'] == OPEN
+        assert stats['rejected'] == 3
+
+    def test_successes_keep_circuit_closed(self, fake_rag_system, mocker):
+        mocker.patch.object(
+            fake_rag_system, 'generate_response_with_tools', return_value=("Tool answer", [], [])
+        )
+        fake_rag_system.answer_cache = None
+
+        for i in range(5):
+            assert fake_rag_system.query(f"question {i}")['answer'] == "Tool answer"
+
+        assert fake_rag_system.get_stats()['tool_circuit']['state'] == CLOSED
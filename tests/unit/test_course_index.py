@@ -0,0 +1,77 @@
+"""Unit tests for the course identifier lookup index."""
+import pytest
+
+from backend.course_index import CourseIndex
+
+
+def course(number, title):
+    return {'number': number, 'title': title}
+
+
+@pytest.fixture
+def index():
+    return CourseIndex({
+        "chapter1_intro": course(1, "Introduction to Claude Code"),
+        "chapter2_install": course(2, "Installation and Setup"),
+        "chapter3_commands": course(3, "Slash Commands"),
+        "chapter12_hooks": course(12, "Hooks and Automation"),
+    })
+
+
+class TestResolve:
+    """Test identifier resolution order and matching."""
+
+    @pytest.mark.parametrize("identifier", ["3", "chapter 3", "Chapter3", "ch3", "#3"])
+    def test_number_forms(self, index, identifier):
+        assert index.resolve(identifier) == "chapter3_commands"
+
+    def test_number_does_not_match_by_substring(self, index):
+        # "2" used to match chapter12 by substring of its name
+        assert index.resolve("2") == "chapter2_install"
+        assert index.resolve("7") is None
+
+    def test_exact_title_and_name(self, index):
+        assert index.resolve("Slash Commands") == "chapter3_commands"
+        assert index.resolve("slash-commands") == "chapter3_commands"
+        assert index.resolve("chapter12_hooks") == "chapter12_hooks"
+
+    def test_fuzzy_match_is_ranked_not_first_hit(self, index):
+        # Every title contains an "a"; the old scan returned the first chapter
+        assert index.resolve("automation") == "chapter12_hooks"
+        assert index.resolve("instal") == "chapter2_install"
+        assert index.resolve("intro") == "chapter1_intro"
+
+    def test_weak_match_is_rejected(self, index):
+        assert index.resolve("kubernetes") is None
+
+    def test_all(self, index):
+        assert index.resolve(" ALL ") == "all"
+
+
+class TestSearch:
+    """Test ranked fuzzy search."""
+
+    def test_results_ranked_best_first(self, index):
+        results = index.search("setup commands")
+
+        assert [name for name, _ in results][:2] in (
+            ["chapter2_install", "chapter3_commands"], ["chapter3_commands", "chapter2_install"]
+        )
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_ties_go_to_lowest_chapter_number(self):
+        index = CourseIndex({
+            "chapter9_b": course(9, "Memory"),
+            "chapter4_a": course(4, "Memory"),
+        })
+
+        assert index.resolve("memor") == "chapter4_a"
+
+    def test_large_catalogue_scores_only_candidates(self):
+        metadata = {f"chapter{i}_topic{i}": course(i, f"Topic number {i} overview") for i in range(1, 501)}
+        metadata["chapter999_git"] = course(999, "Git worktrees")
+        index = CourseIndex(metadata)
+
+        assert index.resolve("worktree") == "chapter999_git"
+        assert len(index.search("worktree", limit=50)) == 1
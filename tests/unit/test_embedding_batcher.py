@@ -0,0 +1,91 @@
+"""Unit tests for the query embedding micro-batcher."""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from backend.embedding_batcher import EmbeddingBatcher
+
+
+class RecordingEncoder:
+    """Encoder that records batch sizes and returns len(text) vectors."""
+
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        time.sleep(self.delay)
+        return np.array([[float(len(t))] for t in texts])
+
+
+class TestEmbeddingBatcher:
+    """Test batching, result dispatch and error handling."""
+
+    def test_single_request(self):
+        encoder = RecordingEncoder()
+        batcher = EmbeddingBatcher(encoder, max_wait_ms=1)
+
+        assert batcher.encode("abc") == [3.0]
+        batcher.close()
+
+    def test_concurrent_requests_share_a_batch(self):
+        encoder = RecordingEncoder()
+        batcher = EmbeddingBatcher(encoder, max_batch_size=16, max_wait_ms=50)
+        results = {}
+
+        def worker(text):
+            results[text] = batcher.encode(text)
+
+        threads = [threading.Thread(target=worker, args=("x" * i,)) for i in range(1, 9)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == {"x" * i: [float(i)] for i in range(1, 9)}
+        assert len(encoder.batches) < 8
+        assert batcher.stats()['items'] == 8
+        batcher.close()
+
+    def test_batch_size_is_bounded(self):
+        encoder = RecordingEncoder(delay=0.05)
+        batcher = EmbeddingBatcher(encoder, max_batch_size=3, max_wait_ms=20)
+
+        futures = [batcher.submit(str(i)) for i in range(7)]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert max(len(batch) for batch in encoder.batches) <= 3
+        batcher.close()
+
+    def test_encoder_errors_reach_every_caller(self):
+        def failing(texts):
+            raise RuntimeError("model crashed")
+
+        batcher = EmbeddingBatcher(failing, max_wait_ms=20)
+        futures = [batcher.submit("a"), batcher.submit("b")]
+
+        for future in futures:
+            with pytest.raises(RuntimeError, match="model crashed"):
+                future.result(timeout=5)
+
+        # The worker survives and serves later requests
+        batcher._encode_batch = RecordingEncoder()
+        assert batcher.encode("ok") == [2.0]
+        batcher.close()
+
+    def test_cancelled_requests_are_skipped(self):
+        encoder = RecordingEncoder(delay=0.1)
+        batcher = EmbeddingBatcher(encoder, max_batch_size=1, max_wait_ms=0)
+
+        first = batcher.submit("first")
+        cancelled = batcher.submit("cancelled")
+        assert cancelled.cancel()
+        first.result(timeout=5)
+        batcher.encode("last")
+
+        assert ["cancelled"] not in encoder.batches
+        batcher.close()
@@ -0,0 +1,79 @@
+"""Unit tests for the persistent embedding cache."""
+import time
+
+import pytest
+
+from backend.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache" / "embeddings.db"), max_entries=3)
+    yield cache
+    cache.close()
+
+
+class TestEmbeddingCache:
+    """Test lookups, persistence and eviction."""
+
+    def test_roundtrip(self, cache):
+        key = EmbeddingCache.hash_text("hello")
+        cache.put_many("model-a", {key: [0.5, 0.25, -1.0]})
+
+        assert cache.get_many("model-a", [key]) == {key: [0.5, 0.25, -1.0]}
+
+    def test_keyed_by_model(self, cache):
+        key = EmbeddingCache.hash_text("hello")
+        cache.put_many("model-a", {key: [1.0]})
+
+        assert cache.get_many("model-b", [key]) == {}
+
+    def test_persists_across_instances(self, cache, tmp_path):
+        key = EmbeddingCache.hash_text("hello")
+        cache.put_many("model-a", {key: [1.0, 2.0]})
+        cache.close()
+
+        reopened = EmbeddingCache(cache.path)
+        assert reopened.get_many("model-a", [key]) == {key: [1.0, 2.0]}
+        reopened.close()
+
+    def test_evicts_least_recently_used(self, cache):
+        keys = [EmbeddingCache.hash_text(str(i)) for i in range(3)]
+        cache.put_many("m", {keys[0]: [0.0]})
+        time.sleep(0.01)
+        cache.put_many("m", {keys[1]: [1.0]})
+        time.sleep(0.01)
+        cache.put_many("m", {keys[2]: [2.0]})
+        time.sleep(0.01)
+        cache.get_many("m", [keys[0]])  # refresh the oldest entry
+        time.sleep(0.01)
+
+        cache.put_many("m", {EmbeddingCache.hash_text("new"): [3.0]})
+
+        assert len(cache) == 3
+        assert keys[1] not in cache.get_many("m", keys)
+        assert keys[0] in cache.get_many("m", keys)
+
+    def test_large_lookup(self, cache):
+        cache.max_entries = 2000
+        vectors = {EmbeddingCache.hash_text(str(i)): [float(i)] for i in range(1500)}
+        cache.put_many("m", vectors)
+
+        assert len(cache.get_many("m", list(vectors))) == 1500
+
+
+class TestEmbeddingCacheIntegration:
+    """Test that create_embeddings consults the cache before the model."""
+
+    def test_rebuild_skips_model(self, fake_rag_system, fake_embedding_model, tmp_path):
+        chapters = tmp_path / "chapters"
+        chapters.mkdir()
+        (chapters / "chapter1_intro.md").write_text("## One\nBody one\n\n## Two\nBody two\n")
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+        fake_embedding_model.encoded.clear()
+
+        created = fake_rag_system.create_embeddings(incremental=False)
+
+        assert created == len(fake_rag_system.documents)
+        assert fake_embedding_model.encoded == []
@@ -0,0 +1,83 @@
+"""Unit tests for hash-based incremental re-indexing in create_embeddings."""
+from pathlib import Path
+
+
+def _write_chapters(chapters_dir, second_section="Second body"):
+    chapters_dir.mkdir(exist_ok=True)
+    (chapters_dir / "chapter1_intro.md").write_text(
+        "---\nurl: https://example.com/1\n---\n\n## First\nFirst body\n\n## Second\n" + second_section + "\n"
+    )
+    (chapters_dir / "chapter2_tools.md").write_text("## Tools\nTool body\n")
+
+
+class TestIncrementalIndexing:
+    """Test that only changed chunks are re-embedded."""
+
+    def test_first_build_embeds_everything(self, fake_rag_system, tmp_path, fake_embedding_model):
+        chapters = tmp_path / "chapters"
+        _write_chapters(chapters)
+
+        fake_rag_system.load_documents(str(chapters))
+        created = fake_rag_system.create_embeddings()
+
+        assert created == len(fake_rag_system.documents)
+        assert fake_rag_system.collection.count() == len(fake_rag_system.documents)
+        assert len(fake_embedding_model.encoded) == len(fake_rag_system.documents)
+
+    def test_unchanged_corpus_embeds_nothing(self, fake_rag_system, tmp_path, fake_embedding_model):
+        chapters = tmp_path / "chapters"
+        _write_chapters(chapters)
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+        fake_embedding_model.encoded.clear()
+
+        fake_rag_system.load_documents(str(chapters))
+        created = fake_rag_system.create_embeddings()
+
+        assert created == 0
+        assert fake_embedding_model.encoded == []
+
+    def test_edit_reembeds_only_changed_chunk(self, fake_rag_system, tmp_path, fake_embedding_model):
+        chapters = tmp_path / "chapters"
+        _write_chapters(chapters)
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+        fake_embedding_model.encoded.clear()
+
+        _write_chapters(chapters, second_section="Edited body")
+        fake_rag_system.load_documents(str(chapters))
+        created = fake_rag_system.create_embeddings()
+
+        assert created == 1
+        assert len(fake_embedding_model.encoded) == 1
+        assert "Edited body" in fake_embedding_model.encoded[0]
+        stored = fake_rag_system.collection.get(ids=["chapter1_intro_chunk_2"])
+        assert "Edited body" in stored['documents'][0]
+
+    def test_removed_chunks_are_deleted(self, fake_rag_system, tmp_path):
+        chapters = tmp_path / "chapters"
+        _write_chapters(chapters)
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+
+        Path(chapters / "chapter2_tools.md").unlink()
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+
+        ids = fake_rag_system.collection.get()['ids']
+        assert not any(doc_id.startswith("chapter2_tools") for doc_id in ids)
+        assert fake_rag_system.collection.count() == len(fake_rag_system.documents)
+
+    def test_full_rebuild_reembeds_everything(self, fake_rag_system, tmp_path, fake_embedding_model):
+        # Without the embedding cache a full rebuild must hit the model again
+        fake_rag_system.embedding_cache = None
+        chapters = tmp_path / "chapters"
+        _write_chapters(chapters)
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+        fake_embedding_model.encoded.clear()
+
+        created = fake_rag_system.create_embeddings(incremental=False)
+
+        assert created == len(fake_rag_system.documents)
+        assert len(fake_embedding_model.encoded) == len(fake_rag_system.documents)
@@ -0,0 +1,185 @@
+"""Unit tests for blue/green index generations in create_embeddings."""
+import pytest
+
+
+def _write_chapter(chapters_dir, body="First body"):
+    chapters_dir.mkdir(exist_ok=True)
+    (chapters_dir / "chapter1_intro.md").write_text(f"## First\n{body}\n\n## Second\nSecond body\n")
+
+
+def _write_long_chapter(chapters_dir, edited=None, sections=20):
+    chapters_dir.mkdir(exist_ok=True)
+    (chapters_dir / "chapter2_long.md").write_text("".join(
+        f"## Section {i}\n{'Edited' if i == edited else 'Body'} {i}\n\n" for i in range(sections)
+    ))
+
+
+@pytest.fixture
+def chapters(tmp_path):
+    chapters_dir = tmp_path / "chapters"
+    _write_chapter(chapters_dir)
+    return chapters_dir
+
+
+class TestIndexGenerations:
+    """Test that builds swap in a complete new generation."""
+
+    def test_build_switches_generation(self, fake_rag_system, chapters):
+        assert fake_rag_system.index_generation == 0
+
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+
+        assert fake_rag_system.index_generation == 1
+        assert fake_rag_system._read_active_generation() == 1
+        assert fake_rag_system.collection.count() == 2
+        assert fake_rag_system.get_stats()['index_generation'] == 1
+
+    def test_live_collection_untouched_during_build(self, fake_rag_system, chapters, tmp_path):
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+        live = fake_rag_system.collection
+        seen_during_build = []
+        embed_texts = fake_rag_system._embed_texts
+
+        def observing_embed_texts(texts, **kwargs):
+            seen_during_build.append((fake_rag_system.collection is live, live.count()))
+            return embed_texts(texts, **kwargs)
+
+        fake_rag_system._embed_texts = observing_embed_texts
+        _write_chapter(chapters, body="Edited body")
+        fake_rag_system.load_documents(str(chapters))
+        created = fake_rag_system.create_embeddings()
+
+        assert created == 1
+        assert seen_during_build == [(True, 2)]
+        assert fake_rag_system.collection is not live
+        assert fake_rag_system.collection.count() == 2
+        first_id = next(doc_id for doc_id, doc in fake_rag_system.documents.items() if doc['title'] == "First")
+        stored = fake_rag_system.collection.get(ids=[first_id])
+        assert "Edited body" in stored['documents'][0]
+
+    def test_unchanged_corpus_keeps_generation(self, fake_rag_system, chapters):
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+
+        assert fake_rag_system.create_embeddings() == 0
+        assert fake_rag_system.index_generation == 1
+
+    def test_old_generations_are_collected(self, fake_rag_system, chapters):
+        fake_rag_system.load_documents(str(chapters))
+        for _ in range(3):
+            fake_rag_system.create_embeddings(incremental=False)
+
+        assert fake_rag_system.index_generation == 3
+        assert fake_rag_system._list_generations() == [2, 3]
+
+    def test_failed_build_keeps_live_generation(self, fake_rag_system, chapters, mocker):
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+        live = fake_rag_system.collection
+        mocker.patch.object(fake_rag_system, '_embed_texts', side_effect=RuntimeError("model crashed"))
+
+        with pytest.raises(RuntimeError):
+            fake_rag_system.create_embeddings(incremental=False)
+
+        assert fake_rag_system.collection is live
+        assert fake_rag_system.index_generation == 1
+        assert 2 not in fake_rag_system._list_generations()
+
+    def test_restart_opens_active_generation(self, fake_embedding_model, tmp_path, chapters, mocker):
+        mocker.patch('rag_system.SentenceTransformer', return_value=fake_embedding_model)
+        mocker.patch('rag_system.OpenAI')
+        mocker.patch('rag_system.AsyncOpenAI')
+        from rag_system import RAGSystem
+
+        kwargs = dict(vector_backend="numpy", index_path=str(tmp_path / "index"), embedding_cache_path=None,
+                      parse_cache_path=None)
+        rag = RAGSystem(**kwargs)
+        rag.load_documents(str(chapters))
+        rag.create_embeddings()
+        rag.create_embeddings(incremental=False)
+
+        reopened = RAGSystem(**kwargs)
+
+        assert reopened.index_generation == 2
+        assert reopened.collection.count() == 2
+        assert reopened._list_generations() == [1, 2]
+
+
+class TestInPlaceUpdates:
+    """Test that small incremental changes are applied to the live store."""
+
+    @pytest.fixture
+    def long_chapters(self, tmp_path):
+        chapters_dir = tmp_path / "long"
+        _write_long_chapter(chapters_dir)
+        return chapters_dir
+
+    def test_small_edit_updates_live_store(self, fake_rag_system, long_chapters):
+        fake_rag_system.load_documents(str(long_chapters))
+        fake_rag_system.create_embeddings()
+        live = fake_rag_system.collection
+        generations = fake_rag_system._list_generations()
+
+        _write_long_chapter(long_chapters, edited=3)
+        fake_rag_system.load_documents(str(long_chapters))
+        created = fake_rag_system.create_embeddings()
+
+        assert created == 1
+        assert fake_rag_system.collection is live
+        assert fake_rag_system.index_generation == 2
+        assert fake_rag_system._list_generations() == generations
+        assert fake_rag_system._read_pointer() == (2, 1)
+        stored = live.get(ids=["chapter2_long_chunk_3"])
+        assert "Edited 3" in stored['documents'][0]
+
+    def test_progress_counts_only_written_chunks(self, fake_rag_system, long_chapters):
+        fake_rag_system.load_documents(str(long_chapters))
+        fake_rag_system.create_embeddings()
+        counters = {}
+
+        _write_long_chapter(long_chapters, edited=3)
+        fake_rag_system.load_documents(str(long_chapters))
+        fake_rag_system.create_embeddings(progress=lambda **update: counters.update(update))
+
+        assert counters['chunks_written'] == counters['chunks_total'] == 1
+
+    def test_removed_chunks_deleted_in_place(self, fake_rag_system, long_chapters):
+        fake_rag_system.load_documents(str(long_chapters))
+        fake_rag_system.create_embeddings()
+        generations = fake_rag_system._list_generations()
+
+        _write_long_chapter(long_chapters, sections=19)
+        fake_rag_system.load_documents(str(long_chapters))
+        fake_rag_system.create_embeddings()
+
+        assert fake_rag_system.collection.count() == 19
+        assert fake_rag_system.collection.get(ids=["chapter2_long_chunk_19"])['ids'] == []
+        assert fake_rag_system._list_generations() == generations
+
+    def test_large_change_builds_new_generation(self, fake_rag_system, long_chapters):
+        fake_rag_system.load_documents(str(long_chapters))
+        fake_rag_system.create_embeddings()
+        live = fake_rag_system.collection
+
+        _write_long_chapter(long_chapters, sections=10)
+        fake_rag_system.load_documents(str(long_chapters))
+        fake_rag_system.create_embeddings()
+
+        assert fake_rag_system.collection is not live
+        assert fake_rag_system.index_generation == 2
+        assert fake_rag_system.collection.count() == 10
+
+    def test_next_full_build_follows_in_place_generation(self, fake_rag_system, long_chapters):
+        fake_rag_system.load_documents(str(long_chapters))
+        fake_rag_system.create_embeddings()
+        _write_long_chapter(long_chapters, edited=3)
+        fake_rag_system.load_documents(str(long_chapters))
+        fake_rag_system.create_embeddings()
+
+        fake_rag_system.create_embeddings(incremental=False)
+
+        assert fake_rag_system.index_generation == 3
+        assert fake_rag_system._read_pointer() == (3, 3)
+        assert fake_rag_system._list_generations()[-2:] == [1, 3]
@@ -0,0 +1,138 @@
+"""Unit tests for the BM25 keyword index and hybrid retrieval."""
+import pytest
+
+from backend.keyword_index import KeywordIndex, reciprocal_rank_fusion, tokenize
+
+
+class TestTokenize:
+    """Test that identifiers survive tokenization."""
+
+    def test_keeps_flags_and_identifiers(self):
+        tokens = tokenize("Run claude --dangerously-skip-permissions, then edit CLAUDE.md via search_content.")
+
+        assert "--dangerously-skip-permissions" in tokens
+        assert "claude.md" in tokens
+        assert "search_content" in tokens
+
+
+class TestKeywordIndex:
+    """Test BM25 scoring."""
+
+    @pytest.fixture
+    def index(self):
+        index = KeywordIndex()
+        index.add("a", "Use the Read tool to open files")
+        index.add("b", "Pass --dangerously-skip-permissions to skip prompts")
+        index.add("c", "Hooks run shell commands after tool use and tool errors")
+        return index
+
+    def test_exact_identifier_ranks_first(self, index):
+        results = index.search("what does --dangerously-skip-permissions do", top_k=3)
+
+        assert results[0][0] == "b"
+        assert len(results) == 1
+
+    def test_term_frequency_and_idf(self, index):
+        results = index.search("tool", top_k=3)
+
+        assert [doc_id for doc_id, _ in results] == ["c", "a"]
+        assert results[0][1] > results[1][1] > 0
+
+    def test_no_match_and_empty_index(self, index):
+        assert index.search("nonexistent") == []
+        assert KeywordIndex().search("tool") == []
+
+    def test_average_length_tracks_every_add(self, index):
+        index.add("d", "tool")
+
+        assert index._avg_length == pytest.approx(sum(index._doc_lengths) / 4)
+
+
+class TestReciprocalRankFusion:
+    """Test rank fusion."""
+
+    def test_items_ranked_on_both_lists_win(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+
+        assert [doc_id for doc_id, _ in fused] == ["b", "a", "d", "c"]
+
+
+class TestHybridRetrieval:
+    """Test retrieval modes on RAGSystem."""
+
+    @pytest.fixture
+    def indexed_rag(self, fake_rag_system, tmp_path):
+        chapters = tmp_path / "chapters"
+        chapters.mkdir()
+        (chapters / "chapter1_intro.md").write_text(
+            "## Reading\nUse the Read tool to open files.\n\n"
+            "## Permissions\nPass --dangerously-skip-permissions to skip prompts.\n\n"
+            "## Hooks\nHooks run shell commands.\n"
+        )
+        fake_rag_system.load_documents(str(chapters))
+        fake_rag_system.create_embeddings()
+        return fake_rag_system
+
+    def test_keyword_index_built_on_load(self, indexed_rag):
+        assert len(indexed_rag.keyword_index) == 3
+
+    def test_keyword_mode_skips_encoder(self, indexed_rag, fake_embedding_model):
+        fake_embedding_model.encode.reset_mock()
+
+        context = indexed_rag.retrieve_context("--dangerously-skip-permissions", top_k=1, mode="keyword")
+
+        assert context[0]['title'] == "Permissions"
+        assert context[0]['relevance'] == 1.0
+        fake_embedding_model.encode.assert_not_called()
+
+    def test_hybrid_mode_surfaces_keyword_match(self, indexed_rag):
+        context = indexed_rag.retrieve_context("--dangerously-skip-permissions", top_k=3, mode="hybrid")
+
+        assert "Permissions" in [item['title'] for item in context]
+        assert all(0.0 < item['relevance'] <= 1.0 for item in context)
+        assert len(context) == 3
+
+    def test_vector_is_the_default_mode(self, indexed_rag, mocker):
+        keywords = mocker.spy(indexed_rag, '_search_keywords')
+
+        indexed_rag.retrieve_context("hooks", top_k=2)
+
+        keywords.assert_not_called()
+
+    def test_keyword_hits_formatted_like_vector_hits(self, indexed_rag):
+        keyword = indexed_rag.retrieve_context("--dangerously-skip-permissions", top_k=1, mode="keyword")
+        vector = indexed_rag.retrieve_context("anything", top_k=3, mode="vector")
+
+        stored = {item['title']: item['content'] for item in vector}
+        assert keyword[0]['content'] == stored["Permissions"]
+        assert keyword[0]['content'].startswith("chapter1_intro: Permissions\n")
+
+    def test_hybrid_without_documents_falls_back_to_vector(self, fake_rag_system, mocker):
+        collection = mocker.patch.object(fake_rag_system, 'collection')
+        collection.query.return_value = {
+            'ids': [["doc1"]], 'documents': [["text"]],
+            'metadatas': [[{'chapter': "ch1", 'title': "T"}]], 'distances': [[0.2]]
+        }
+
+        context = fake_rag_system.retrieve_context("question", mode="hybrid")
+
+        assert context[0]['relevance'] == pytest.approx(0.9)
+
+    def test_keyword_search_reads_one_corpus_snapshot(self, indexed_rag, mocker):
+        old_index = indexed_rag.keyword_index
+        search = old_index.search
+
+        def search_during_rebuild(query, top_k):
+            hits = search(query, top_k=top_k)
+            indexed_rag.documents = {}  # A rebuild swaps in another corpus meanwhile
+            return hits
+
+        mocker.patch.object(old_index, 'search', side_effect=search_during_rebuild)
+
+        context = indexed_rag.retrieve_context("--dangerously-skip-permissions", top_k=1, mode="keyword")
+
+        assert context[0]['title'] == "Permissions"
+
+    def test_unknown_mode_rejected(self, indexed_rag):
+        with pytest.raises(ValueError, match="Unknown retrieval mode"):
+            indexed_rag.retrieve_context("question", mode="fuzzy")
@@ -0,0 +1,114 @@
+"""Unit tests for lazy component construction, warm-up and readiness."""
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock
+
+
+@pytest.fixture
+def chapters(tmp_path):
+    chapters_dir = tmp_path / "chapters"
+    chapters_dir.mkdir()
+    (chapters_dir / "chapter1_intro.md").write_text("## One\nBody one\n\n## Two\nBody two\n")
+    return chapters_dir
+
+
+class TestLazyComponents:
+    """Test that heavy components are only built when needed."""
+
+    def test_construction_builds_nothing_heavy(self, fake_rag_system):
+        import rag_system
+
+        rag_system.SentenceTransformer.assert_not_called()
+        rag_system.OpenAI.assert_not_called()
+        rag_system.AsyncOpenAI.assert_not_called()
+        assert fake_rag_system.readiness() == {
+            'ready': False,
+            'components': {
+                'client': False, 'collection': False, 'embedding_model': False,
+                'openai_client': False, 'async_openai_client': False
+            }
+        }
+
+    def test_component_built_once_on_first_access(self, fake_rag_system, fake_embedding_model):
+        import rag_system
+
+        assert fake_rag_system.embedding_model is fake_embedding_model
+        assert fake_rag_system.embedding_model is fake_embedding_model
+        rag_system.SentenceTransformer.assert_called_once_with("all-MiniLM-L6-v2")
+        assert fake_rag_system.readiness()['components']['embedding_model'] is True
+
+    def test_unknown_attribute_still_raises(self, fake_rag_system):
+        with pytest.raises(AttributeError):
+            fake_rag_system.not_a_component
+
+
+class TestWarmUp:
+    """Test warm_up() and readiness."""
+
+    def test_warm_up_builds_empty_index(self, fake_rag_system, chapters):
+        readiness = fake_rag_system.warm_up(str(chapters))
+
+        assert readiness['ready'] is True
+        assert all(readiness['components'].values())
+        assert fake_rag_system.collection.count() == 2
+
+    def test_warm_up_loads_documents_for_existing_index(self, fake_rag_system, chapters, mocker):
+        fake_rag_system.initialize(str(chapters))
+        fake_rag_system.documents = {}
+        count = mocker.spy(type(fake_rag_system.collection), 'count')
+        initialize = mocker.spy(fake_rag_system, 'initialize')
+
+        fake_rag_system.warm_up(str(chapters))
+
+        assert count.call_count == 1
+        initialize.assert_not_called()
+        assert len(fake_rag_system.documents) == 2
+        assert fake_rag_system.is_ready()
+
+    def test_failed_initial_build_is_not_ready(self, fake_rag_system, tmp_path):
+        with pytest.raises(RuntimeError, match="No markdown files"):
+            fake_rag_system.warm_up(str(tmp_path / "missing"))
+
+        assert not fake_rag_system.is_ready()
+
+
+class TestReadinessEndpoint:
+    """Test /api/ready against /api/health."""
+
+    @pytest.fixture
+    def client(self, mocker):
+        from main import app
+
+        mock_rag = MagicMock()
+        mocker.patch("main.rag_system", mock_rag)
+        mocker.patch("main.warm_up_error", None)
+        return TestClient(app), mock_rag
+
+    def test_warming_up(self, client):
+        client, mock_rag = client
+        mock_rag.is_ready.return_value = False
+        mock_rag.readiness.return_value = {'ready': False, 'components': {'embedding_model': False}}
+
+        assert client.get("/api/ready").status_code == 503
+        assert client.get("/api/ready").json()['status'] == "warming_up"
+        assert client.get("/api/health").status_code == 200
+        assert client.post("/api/query", json={"question": "Hi"}).status_code == 503
+
+    def test_ready(self, client):
+        client, mock_rag = client
+        mock_rag.readiness.return_value = {'ready': True, 'components': {'embedding_model': True}}
+
+        response = client.get("/api/ready")
+
+        assert response.status_code == 200
+        assert response.json()['status'] == "ready"
+
+    def test_warm_up_failure(self, client, mocker):
+        client, mock_rag = client
+        mock_rag.readiness.return_value = {'ready': False, 'components': {}}
+        mocker.patch("main.warm_up_error", "No markdown files found")
+
+        response = client.get("/api/ready")
+
+        assert response.status_code == 503
+        assert response.json()['error'] == "No markdown files found"
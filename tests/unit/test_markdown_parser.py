@@ -0,0 +1,108 @@
+"""Unit tests for the shared single-pass markdown parser."""
+import os
+
+import pytest
+
+from backend import markdown_parser
+from backend.markdown_parser import clear_parse_cache, parse_file, parse_markdown
+from backend.search_tools import _extract_lessons
+
+
+DOCUMENT = """---
+title: Getting Started
+url: https://example.com/start
+---
+
+Intro text
+
+## Installing
+
+Run this:
+
+```bash
+## not a header
+npm install
+```
+
+### Details (not a section)
+
+##Configuring
+Edit settings"""
+
+
+class TestParseMarkdown:
+    """Test the single-pass parse result."""
+
+    def test_frontmatter_and_url(self):
+        parsed = parse_markdown(DOCUMENT)
+
+        assert parsed['frontmatter'] == {'title': "Getting Started", 'url': "https://example.com/start"}
+        assert parsed['url'] == "https://example.com/start"
+        assert parsed['body'].startswith("\nIntro text")
+
+    def test_sections_skip_code_blocks_and_deeper_headers(self):
+        parsed = parse_markdown(DOCUMENT, default_title="chapter1")
+
+        assert [title for title, _ in parsed['sections']] == ["chapter1", "Installing", "Configuring"]
+        assert "## not a header" in parsed['sections'][1][1]
+        assert "### Details (not a section)" in parsed['sections'][1][1]
+
+    def test_lessons_match_sections(self):
+        parsed = parse_markdown(DOCUMENT)
+
+        assert parsed['lessons'] == [
+            {"number": 1, "title": "Installing"},
+            {"number": 2, "title": "Configuring"}
+        ]
+        # search_tools now agrees with the chunker on what a ## header is
+        assert _extract_lessons(DOCUMENT) == parsed['lessons']
+
+    def test_code_block_spans(self):
+        parsed = parse_markdown(DOCUMENT)
+        body_lines = parsed['body'].split('\n')
+
+        assert len(parsed['code_blocks']) == 1
+        start, end = parsed['code_blocks'][0]
+        assert body_lines[start] == "```bash"
+        assert body_lines[end] == "```"
+
+    def test_unclosed_frontmatter_is_body(self):
+        parsed = parse_markdown("---\ntitle: Broken\n## Section\ntext", default_title="ch")
+
+        assert parsed['frontmatter'] == {}
+        assert parsed['url'] == ''
+        assert parsed['body'].startswith("---")
+        assert parsed['lessons'] == [{"number": 1, "title": "Section"}]
+
+
+class TestParseFileCache:
+    """Test that files are parsed once until they change."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        clear_parse_cache()
+        yield
+        clear_parse_cache()
+
+    def test_unchanged_file_parsed_once(self, tmp_path, mocker):
+        path = tmp_path / "chapter1_intro.md"
+        path.write_text(DOCUMENT)
+        parse = mocker.spy(markdown_parser, 'parse_markdown')
+
+        first = parse_file(str(path))
+        second = parse_file(str(path))
+
+        assert first is second
+        assert parse.call_count == 1
+        assert first['sections'][0][0] == "chapter1_intro"
+
+    def test_modified_file_reparsed(self, tmp_path):
+        path = tmp_path / "chapter1_intro.md"
+        path.write_text(DOCUMENT)
+        parse_file(str(path))
+
+        path.write_text("## Replaced\nNew text")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert parse_file(str(path))['lessons'] == [{"number": 1, "title": "Replaced"}]
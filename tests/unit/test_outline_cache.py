@@ -0,0 +1,91 @@
+"""Unit tests for the snapshot-based course metadata cache."""
+import os
+import threading
+
+import pytest
+
+from backend import search_tools
+from backend.markdown_parser import bump_corpus_generation
+
+
+@pytest.fixture
+def chapters(tmp_path):
+    chapters_dir = tmp_path / "chapters"
+    chapters_dir.mkdir()
+    (chapters_dir / "chapter1_intro.md").write_text("---\ntitle: Intro\n---\n## One\nBody\n")
+    (chapters_dir / "chapter2_usage.md").write_text("---\ntitle: Usage\n---\n## Two\nBody\n")
+    return str(chapters_dir)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    search_tools.clear_course_cache()
+    search_tools.configure_outline_cache(60)
+    yield
+    search_tools.clear_course_cache()
+    search_tools.configure_outline_cache(2.0)
+
+
+def test_repeated_calls_do_not_touch_files(chapters, mocker):
+    first = search_tools._load_course_metadata(chapters)
+    stamps = mocker.spy(search_tools, '_get_chapter_file_stamps')
+    stat = mocker.spy(os, 'stat')
+
+    for _ in range(100):
+        assert search_tools._load_course_metadata(chapters) is first
+
+    assert stamps.call_count == 0
+    assert stat.call_count == 0
+
+
+def test_file_changes_picked_up_after_interval(chapters):
+    search_tools._load_course_metadata(chapters)
+    search_tools.configure_outline_cache(0)
+    with open(os.path.join(chapters, "chapter3_new.md"), "w") as f:
+        f.write("## Three\nBody\n")
+
+    metadata = search_tools._load_course_metadata(chapters)
+
+    assert sorted(metadata) == ["chapter1_intro", "chapter2_usage", "chapter3_new"]
+
+
+def test_unchanged_files_keep_snapshot_after_interval(chapters):
+    first = search_tools._load_course_metadata(chapters)
+    search_tools.configure_outline_cache(0)
+
+    assert search_tools._load_course_metadata(chapters) is first
+
+
+def test_generation_bump_rebuilds_without_interval(chapters):
+    search_tools.configure_outline_cache(None)
+    first = search_tools._load_course_metadata(chapters)
+
+    bump_corpus_generation()
+
+    assert search_tools._load_course_metadata(chapters) is not first
+
+
+def test_snapshot_is_read_only(chapters):
+    metadata = search_tools._load_course_metadata(chapters)
+
+    with pytest.raises(TypeError):
+        metadata["chapter9_fake"] = {}
+
+
+def test_concurrent_callers_share_one_build(chapters, mocker):
+    build = mocker.spy(search_tools, '_get_chapter_file_stamps')
+    start = threading.Barrier(16)
+    results = []
+
+    def load():
+        start.wait()
+        results.append(search_tools._load_course_metadata(chapters))
+
+    threads = [threading.Thread(target=load) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert build.call_count == 1
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,63 @@
+"""Unit tests for parallel document ingestion in load_documents."""
+import threading
+
+import pytest
+
+import rag_system
+from backend.markdown_parser import clear_parse_cache
+from rag_system import IndexBuildCancelled
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    chapters = tmp_path / "chapters"
+    chapters.mkdir()
+    for i in range(12):
+        sections = "\n".join(f"## Lesson {j}\nChapter {i} lesson {j} body\n" for j in range(3))
+        (chapters / f"chapter{i:02d}_topic.md").write_text(f"---\nurl: https://example.com/{i}\n---\n{sections}")
+    return chapters
+
+
+class TestParallelIngestion:
+    """Test that worker processes produce exactly the serial result."""
+
+    def test_parallel_matches_serial(self, fake_rag_system, corpus, mocker):
+        fake_rag_system.ingest_workers = 1
+        fake_rag_system.load_documents(str(corpus))
+        serial = fake_rag_system.documents
+
+        # Only files missing from the parse caches go to the pool
+        clear_parse_cache()
+        fake_rag_system.parse_cache.close()
+        fake_rag_system.parse_cache = None
+        pool = mocker.spy(rag_system, 'ProcessPoolExecutor')
+        fake_rag_system.ingest_workers = 3
+        fake_rag_system.parallel_ingest_min_files = 1
+        count = fake_rag_system.load_documents(str(corpus))
+
+        assert pool.call_count == 1
+        assert count == 36
+        assert list(fake_rag_system.documents.items()) == list(serial.items())
+        assert len(fake_rag_system.keyword_index) == 36
+
+    def test_small_corpus_stays_in_process(self, fake_rag_system, corpus, mocker):
+        pool = mocker.patch('rag_system.ProcessPoolExecutor')
+        fake_rag_system.ingest_workers = 4
+
+        fake_rag_system.load_documents(str(corpus))
+
+        pool.assert_not_called()
+
+    def test_cancel_stops_parallel_ingestion(self, fake_rag_system, corpus):
+        fake_rag_system.ingest_workers = 2
+        fake_rag_system.parallel_ingest_min_files = 1
+        cancel_event = threading.Event()
+
+        def cancel_after_first_file(**counters):
+            if counters.get('files_parsed') == 1:
+                cancel_event.set()
+
+        with pytest.raises(IndexBuildCancelled):
+            fake_rag_system.load_documents(str(corpus), progress=cancel_after_first_file, cancel_event=cancel_event)
+
+        assert fake_rag_system.documents == {}
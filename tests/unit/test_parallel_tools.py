@@ -0,0 +1,124 @@
+"""Unit tests for concurrent tool execution within one model turn."""
+import threading
+import time
+from types import SimpleNamespace
+
+
+def tool_use(tool_id, name, **tool_input):
+    return SimpleNamespace(type="tool_use", id=tool_id, name=name, input=tool_input)
+
+
+class TestRunToolCalls:
+    """Test RAGSystem._run_tool_calls."""
+
+    def test_calls_overlap_and_results_keep_request_order(self, fake_rag_system, mocker):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_execute(name, tool_input, rag):
+            barrier.wait()  # Only passes if all three run at once
+            time.sleep(0.01 * (3 - tool_input['n']))  # Finish in reverse order
+            return {"n": tool_input['n']}
+
+        mocker.patch('rag_system.execute_tool', side_effect=fake_execute)
+        content = [SimpleNamespace(type="text", text="Let me look")] + [
+            tool_use(f"call_{n}", "search_content", n=n) for n in range(3)
+        ]
+        tool_calls_made = []
+
+        results = fake_rag_system._run_tool_calls(content, tool_calls_made)
+
+        assert [r['tool_use_id'] for r in results] == ["call_0", "call_1", "call_2"]
+        assert [r['content'] for r in results] == ["{'n': 0}", "{'n': 1}", "{'n': 2}"]
+        assert [call['input']['n'] for call in tool_calls_made] == [0, 1, 2]
+
+    def test_slow_tool_times_out_without_dropping_others(self, fake_rag_system, mocker):
+        release = threading.Event()
+        fake_rag_system.tool_timeout = 0.1
+
+        def fake_execute(name, tool_input, rag):
+            if name == "get_course_outline":
+                release.wait(5)
+            return {"tool": name}
+
+        mocker.patch('rag_system.execute_tool', side_effect=fake_execute)
+        content = [tool_use("slow", "get_course_outline"), tool_use("fast", "search_content", query="x")]
+
+        try:
+            results = fake_rag_system._run_tool_calls(content, [])
+        finally:
+            release.set()
+
+        assert "timed out" in results[0]['content']
+        assert results[1]['content'] == "{'tool': 'search_content'}"
+
+    def test_no_tool_use_blocks(self, fake_rag_system, mocker):
+        execute = mocker.patch('rag_system.execute_tool')
+
+        assert fake_rag_system._run_tool_calls([SimpleNamespace(type="text", text="hi")], []) == []
+        execute.assert_not_called()
+
+
+class TestToolMemo:
+    """Test reuse of identical tool calls within one query."""
+
+    def test_repeat_across_turns_reuses_result(self, fake_rag_system, mocker):
+        execute = mocker.patch('rag_system.execute_tool', return_value={"results": ["hooks"]})
+        tool_memo = {}
+        tool_calls_made = []
+
+        fake_rag_system._run_tool_calls(
+            [tool_use("a", "search_content", query="hooks", top_k=3)], tool_calls_made, tool_memo
+        )
+        results = fake_rag_system._run_tool_calls(
+            [tool_use("b", "search_content", top_k=3, query="hooks")], tool_calls_made, tool_memo
+        )
+
+        assert execute.call_count == 1
+        assert results[0]['tool_use_id'] == "b"
+        assert results[0]['content'] == "{'results': ['hooks']}"
+        assert [call['deduplicated'] for call in tool_calls_made] == [False, True]
+
+    def test_duplicates_in_one_turn_run_once(self, fake_rag_system, mocker):
+        execute = mocker.patch('rag_system.execute_tool', return_value={"outline": []})
+        content = [
+            tool_use("a", "get_course_outline", course_identifier="3"),
+            tool_use("b", "get_course_outline", course_identifier="3"),
+            tool_use("c", "get_course_outline", course_identifier="4"),
+        ]
+        tool_calls_made = []
+
+        results = fake_rag_system._run_tool_calls(content, tool_calls_made, {})
+
+        assert execute.call_count == 2
+        assert [r['tool_use_id'] for r in results] == ["a", "b", "c"]
+        assert [call['deduplicated'] for call in tool_calls_made] == [False, True, False]
+
+    def test_timed_out_call_is_not_memoized(self, fake_rag_system, mocker):
+        release = threading.Event()
+        fake_rag_system.tool_timeout = 0.05
+        mocker.patch('rag_system.execute_tool', side_effect=lambda *args: release.wait(5))
+        tool_memo = {}
+
+        try:
+            fake_rag_system._run_tool_calls([tool_use("a", "search_content", query="x")], [], tool_memo)
+        finally:
+            release.set()
+
+        assert tool_memo == {}
+
+    def test_error_result_is_retried(self, fake_rag_system, mocker):
+        execute = mocker.patch('rag_system.execute_tool', side_effect=[
+            {"error": "Search failed: database is locked"},
+            {"results": ["hooks"]},
+        ])
+        tool_memo = {}
+        tool_calls_made = []
+
+        fake_rag_system._run_tool_calls([tool_use("a", "search_content", query="hooks")], tool_calls_made, tool_memo)
+        results = fake_rag_system._run_tool_calls(
+            [tool_use("b", "search_content", query="hooks")], tool_calls_made, tool_memo
+        )
+
+        assert execute.call_count == 2
+        assert results[0]['content'] == "{'results': ['hooks']}"
+        assert [call['deduplicated'] for call in tool_calls_made] == [False, False]
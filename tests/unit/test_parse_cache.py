@@ -0,0 +1,112 @@
+"""Unit tests for the persistent parse cache used on warm restarts."""
+import os
+
+import pytest
+
+from backend import markdown_parser
+from backend.markdown_parser import clear_parse_cache
+from backend.parse_cache import PersistentParseCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_parse_cache():
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+@pytest.fixture
+def chapters(tmp_path):
+    chapters_dir = tmp_path / "chapters"
+    chapters_dir.mkdir()
+    for i in range(3):
+        (chapters_dir / f"chapter{i}_topic.md").write_text(
+            f"---\nurl: https://example.com/{i}\n---\n## Lesson A\nBody {i}\n\n## Lesson B\nMore {i}\n"
+        )
+    return chapters_dir
+
+
+def restart(fake_rag_system):
+    """Simulate a process restart: new RAGSystem, empty in-memory parse cache."""
+    from rag_system import RAGSystem
+
+    fake_rag_system.shutdown()
+    clear_parse_cache()
+    return RAGSystem(
+        db_path=fake_rag_system.db_path,
+        embedding_cache_path=None,
+        parse_cache_path=fake_rag_system.parse_cache.path
+    )
+
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestWarmRestart:
+    """Test that restarts reuse persisted parse results."""
+
+    def test_unchanged_corpus_parses_no_files(self, fake_rag_system, chapters, mocker):
+        fake_rag_system.load_documents(str(chapters))
+        documents = fake_rag_system.documents
+        rag = restart(fake_rag_system)
+        parse = mocker.spy(markdown_parser, 'parse_markdown')
+
+        rag.load_documents(str(chapters))
+
+        assert parse.call_count == 0
+        assert list(rag.documents.items()) == list(documents.items())
+        rag.shutdown()
+
+    def test_touched_file_is_not_reparsed(self, fake_rag_system, chapters, mocker):
+        fake_rag_system.load_documents(str(chapters))
+        bump_mtime(chapters / "chapter1_topic.md")
+        rag = restart(fake_rag_system)
+        parse = mocker.spy(markdown_parser, 'parse_markdown')
+
+        rag.load_documents(str(chapters))
+
+        assert parse.call_count == 0
+        rag.shutdown()
+
+    def test_only_changed_file_is_reparsed(self, fake_rag_system, chapters, mocker):
+        fake_rag_system.load_documents(str(chapters))
+        path = chapters / "chapter2_topic.md"
+        path.write_text("## Rewritten\nNew body\n")
+        bump_mtime(path)
+        rag = restart(fake_rag_system)
+        parse = mocker.spy(markdown_parser, 'parse_markdown')
+
+        rag.load_documents(str(chapters))
+
+        assert parse.call_count == 1
+        assert rag.documents["chapter2_topic_chunk_0"]['title'] == "Rewritten"
+        rag.shutdown()
+
+
+class TestPersistentParseCache:
+    """Test the SQLite store itself."""
+
+    def test_sync_writes_only_changed_rows_and_drops_missing(self, tmp_path):
+        store = PersistentParseCache(str(tmp_path / "parse_cache.db"))
+        parsed = markdown_parser.parse_markdown("## One\ntext")
+        entries = {"a.md": (1, 10, "h1", parsed), "b.md": (1, 10, "h2", parsed)}
+
+        assert store.sync(entries) == 2
+        assert store.sync(entries) == 0
+        assert store.sync({"a.md": (2, 10, "h1", parsed)}) == 1
+        assert len(store) == 1
+
+        reloaded = PersistentParseCache(store.path).load()
+        assert reloaded == {"a.md": (2, 10, "h1", parsed)}
+        store.close()
+
+    def test_other_parser_version_ignored(self, tmp_path, mocker):
+        store = PersistentParseCache(str(tmp_path / "parse_cache.db"))
+        store.sync({"a.md": (1, 10, "h1", markdown_parser.parse_markdown("text"))})
+        store.close()
+
+        mocker.patch('backend.parse_cache.PARSER_VERSION', markdown_parser.PARSER_VERSION + 1)
+
+        assert PersistentParseCache(store.path).load() == {}
@@ -0,0 +1,113 @@
+"""Unit tests for pre-fork preloading and cross-process generation switches."""
+import os
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def chapters(tmp_path):
+    chapters_dir = tmp_path / "chapters"
+    chapters_dir.mkdir()
+    (chapters_dir / "chapter1_intro.md").write_text("## One\nBody one\n\n## Two\nBody two\n")
+    return chapters_dir
+
+
+@pytest.fixture
+def make_numpy_rag(fake_embedding_model, tmp_path, mocker):
+    """Factory for RAG systems sharing one NumPy index directory."""
+    mocker.patch('rag_system.SentenceTransformer', return_value=fake_embedding_model)
+    mocker.patch('rag_system.OpenAI')
+    mocker.patch('rag_system.AsyncOpenAI')
+    from rag_system import RAGSystem
+
+    created = []
+
+    def make():
+        rag = RAGSystem(vector_backend="numpy", index_path=str(tmp_path / "index"), embedding_cache_path=None,
+                        parse_cache_path=str(tmp_path / "parse_cache.db"))
+        created.append(rag)
+        return rag
+
+    yield make
+    for rag in created:
+        rag.shutdown()
+
+
+class TestPreload:
+    """Test what the pre-fork master loads."""
+
+    def test_preload_loads_shareable_state_only(self, make_numpy_rag, chapters, fake_embedding_model):
+        threads_before = threading.active_count()
+        rag = make_numpy_rag()
+
+        rag.preload(str(chapters))
+
+        components = rag.readiness()['components']
+        assert components['embedding_model'] and components['collection']
+        assert not components['openai_client'] and not components['async_openai_client']
+        assert len(rag.documents) == 2 and len(rag.keyword_index) == 2
+        assert rag.parse_cache._conn is None  # SQLite connections must not cross fork()
+        fake_embedding_model.encode.assert_not_called()
+        assert threading.active_count() == threads_before
+        assert not rag.is_ready()
+
+    def test_warm_up_after_preload_keeps_documents(self, make_numpy_rag, chapters):
+        make_numpy_rag().initialize(str(chapters))
+        rag = make_numpy_rag()
+        rag.preload(str(chapters))
+        documents = rag.documents
+
+        rag.warm_up(str(chapters))
+
+        assert rag.documents is documents
+        assert rag.is_ready()
+
+
+class TestSharedGenerations:
+    """Test that workers follow generations published by other workers."""
+
+    def test_query_follows_generation_built_elsewhere(self, make_numpy_rag, chapters):
+        worker_a = make_numpy_rag()
+        worker_b = make_numpy_rag()
+        worker_a.initialize(str(chapters))
+        assert worker_b.index_generation == 0
+
+        context = worker_b.retrieve_context("body one", top_k=2, mode="vector")
+
+        assert worker_b.index_generation == 1
+        assert len(context) == 2
+
+    def test_query_follows_in_place_update_made_elsewhere(self, make_numpy_rag, chapters):
+        worker_a = make_numpy_rag()
+        worker_b = make_numpy_rag()
+        worker_a.in_place_update_ratio = 1.0
+        worker_a.initialize(str(chapters))
+        worker_b.retrieve_context("body one", top_k=2, mode="vector")
+
+        (chapters / "chapter1_intro.md").write_text("## One\nBody one\n\n## Two\nEdited two\n")
+        worker_a.initialize(str(chapters))
+        context = worker_b.retrieve_context("edited two", top_k=2, mode="vector")
+
+        assert worker_b.index_generation == worker_a.index_generation == 2
+        # Published as a new directory, never rewritten under a reader
+        assert worker_a._read_pointer() == (2, 2)
+        assert worker_a.collection.path == worker_a._generation_name(2)
+        assert worker_b._list_generations() == [1, 2]
+        assert "Edited two" in " ".join(item['content'] for item in context)
+
+    def test_switch_keeping_the_mtime_is_noticed(self, make_numpy_rag, chapters):
+        from rag_system import GENERATION_FILE
+
+        worker_a = make_numpy_rag()
+        worker_b = make_numpy_rag()
+        worker_a.initialize(str(chapters))
+        worker_b.retrieve_context("body one", top_k=2, mode="vector")
+        pointer = os.path.join(worker_a._generation_root(), GENERATION_FILE)
+        stat = os.stat(pointer)
+
+        worker_a.create_embeddings(incremental=False)
+        os.utime(pointer, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        worker_b.retrieve_context("body one", top_k=2, mode="vector")
+
+        assert worker_b.index_generation == worker_a.index_generation == 2
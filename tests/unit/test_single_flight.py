@@ -0,0 +1,133 @@
+"""Unit tests for coalescing concurrent identical queries."""
+import asyncio
+
+import pytest
+
+from backend.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test sharing, failure and cancellation of in-flight calls."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_execution(self):
+        group = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await release.wait()
+            return "answer"
+
+        waiters = [asyncio.ensure_future(group.do("q", work)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["answer"] * 10
+        assert len(calls) == 1
+        assert group.stats()['coalesced'] == 9
+        assert len(group) == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        group = SingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(group.do("a", lambda: work(1)), group.do("b", lambda: work(2)))
+
+        assert results == [1, 2]
+        assert group.executions == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_every_caller_and_is_not_reused(self):
+        group = SingleFlight()
+        release = asyncio.Event()
+
+        async def fail():
+            await release.wait()
+            raise RuntimeError("upstream down")
+
+        waiters = [asyncio.ensure_future(group.do("q", fail)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        async def succeed():
+            return "ok"
+
+        assert await group.do("q", succeed) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        group = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "answer"
+
+        first = asyncio.ensure_future(group.do("q", work))
+        second = asyncio.ensure_future(group.do("q", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "answer"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_work_cancelled_when_every_caller_leaves(self):
+        group = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.ensure_future(group.do("q", work))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert len(group) == 0
+        assert group.stats()['abandoned'] == 1
+
+
+class TestQueryCoalescing:
+    """Test coalescing in front of RAGSystem.aquery."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_questions_share_one_pipeline_run(self, fake_rag_system, mocker):
+        release = asyncio.Event()
+
+        async def slow_run(question, use_tools, retrieval_mode):
+            await release.wait()
+            return {'answer': "Use /help", 'sources': [], 'context_count': 0}
+
+        run = mocker.patch.object(fake_rag_system, '_arun_query', side_effect=slow_run)
+
+        waiters = [
+            asyncio.ensure_future(fake_rag_system.aquery(question))
+            for question in ["How do I get help?", "how do i get help?", "How do I get help?"]
+        ]
+        other = asyncio.ensure_future(fake_rag_system.aquery("How do I get help?", use_tools=False))
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*waiters, other)
+
+        assert run.await_count == 2  # One per variant
+        assert all(result['answer'] == "Use /help" for result in results)
+        assert results[0] is not results[1]
+        assert fake_rag_system.get_stats()['query_coalescing']['coalesced'] == 2
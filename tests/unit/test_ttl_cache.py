@@ -0,0 +1,74 @@
+"""Unit tests for the LRU/TTL cache and query embedding caching."""
+from backend.ttl_cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Test LRU eviction, expiry and counters."""
+
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()['evictions'] == 1
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, timer=clock)
+        cache.set("a", 1)
+
+        clock.now = 9.9
+        assert cache.get("a") == 1
+
+        clock.now = 10.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_no_ttl_never_expires(self):
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=None, timer=clock)
+        cache.set("a", 1)
+
+        clock.now = 1e9
+        assert cache.get("a") == 1
+
+
+class TestQueryEmbeddingCache:
+    """Test that retrieve_context reuses cached query embeddings."""
+
+    def test_repeated_query_skips_encoder(self, fake_rag_system, fake_embedding_model):
+        first = fake_rag_system._embed_query("How do I read files?")
+        second = fake_rag_system._embed_query("  how do I   READ files? ")
+
+        assert first == second
+        assert fake_embedding_model.encode.call_count == 1
+        stats = fake_rag_system.get_stats()['query_embedding_cache']
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
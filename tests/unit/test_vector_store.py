@@ -0,0 +1,184 @@
+"""Unit tests for the in-process NumPy vector store."""
+import numpy as np
+import pytest
+
+from backend.vector_store import NumpyVectorStore, VectorStore
+
+
+def _store_with(path=None):
+    store = NumpyVectorStore(path)
+    store.add(
+        ids=["a", "b", "c"],
+        embeddings=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+        documents=["doc a", "doc b", "doc c"],
+        metadatas=[{"chapter": "A"}, {"chapter": "B"}, {"chapter": "C"}]
+    )
+    return store
+
+
+class TestNumpyVectorStore:
+    """Test the collection-style API of NumpyVectorStore."""
+
+    def test_query_returns_nearest_first(self):
+        store = _store_with()
+
+        results = store.query(query_embeddings=[[0.9, 0.1]], n_results=2)
+
+        assert results['ids'] == [["a", "c"]]
+        assert results['documents'][0][0] == "doc a"
+        assert results['metadatas'][0][0] == {"chapter": "A"}
+        assert results['distances'][0][0] == pytest.approx(1 - 0.9 / np.hypot(0.9, 0.1), abs=1e-6)
+
+    def test_batch_of_queries(self):
+        store = _store_with()
+
+        results = store.query(query_embeddings=[[1.0, 0.0], [0.0, 1.0]], n_results=1)
+
+        assert results['ids'] == [["a"], ["b"]]
+
+    def test_n_results_larger_than_store(self):
+        store = _store_with()
+
+        results = store.query(query_embeddings=[[0.0, 1.0]], n_results=10)
+
+        assert results['ids'][0][0] == "b"
+        assert len(results['ids'][0]) == 3
+
+    def test_empty_store(self):
+        results = NumpyVectorStore().query(query_embeddings=[[1.0, 0.0]], n_results=3)
+
+        assert results['documents'] == [[]]
+        assert NumpyVectorStore().count() == 0
+
+    def test_upsert_replaces_and_add_skips_existing(self):
+        store = _store_with()
+
+        store.add(ids=["a"], embeddings=[[0.0, 1.0]], documents=["ignored"], metadatas=[{}])
+        assert store.get(ids=["a"])['documents'] == ["doc a"]
+
+        store.upsert(ids=["a", "d"], embeddings=[[0.0, 1.0], [1.0, 0.0]],
+                     documents=["new a", "doc d"], metadatas=[{}, {}])
+        assert store.count() == 4
+        assert store.get(ids=["a"])['documents'] == ["new a"]
+        assert store.query(query_embeddings=[[0.0, 1.0]], n_results=2)['ids'][0][0] in ("a", "b")
+
+    def test_delete(self):
+        store = _store_with()
+
+        store.delete(ids=["b", "missing"])
+
+        assert store.count() == 2
+        assert store.get()['ids'] == ["a", "c"]
+        assert store.query(query_embeddings=[[0.0, 1.0]], n_results=1)['ids'] == [["c"]]
+
+    def test_get_include(self):
+        store = _store_with()
+
+        data = store.get(include=['metadatas'])
+
+        assert data['ids'] == ["a", "b", "c"]
+        assert data['documents'] is None
+        assert data['metadatas'][1] == {"chapter": "B"}
+
+    def test_persists_and_memory_maps(self, tmp_path):
+        _store_with(str(tmp_path / "index")).flush()
+
+        reopened = NumpyVectorStore(str(tmp_path / "index"))
+
+        assert reopened.count() == 3
+        assert isinstance(reopened._state[0], np.memmap)
+        assert reopened.query(query_embeddings=[[0.0, 1.0]], n_results=1)['ids'] == [["b"]]
+
+        reopened.delete(ids=["a"])
+        reopened.flush()
+        assert NumpyVectorStore(str(tmp_path / "index")).get()['ids'] == ["b", "c"]
+
+    def test_writes_persist_only_on_flush(self, tmp_path, mocker):
+        store = NumpyVectorStore(str(tmp_path / "index"))
+        save = mocker.spy(store, '_save')
+
+        for i in range(50):
+            store.add(ids=[f"d{i}"], embeddings=[[1.0, float(i)]], documents=[f"doc {i}"], metadatas=[{}])
+
+        assert save.call_count == 0
+        assert NumpyVectorStore(str(tmp_path / "index")).count() == 0
+
+        store.flush()
+        store.flush()  # Nothing new to write
+
+        assert save.call_count == 1
+        assert NumpyVectorStore(str(tmp_path / "index")).count() == 50
+
+    def test_save_to_leaves_old_directory_untouched(self, tmp_path):
+        store = _store_with(str(tmp_path / "old"))
+        store.flush()
+
+        store.delete(ids=["a"])
+        store.save_to(str(tmp_path / "new"))
+        store.add(ids=["d"], embeddings=[[1.0, 0.0]], documents=["doc d"], metadatas=[{}])
+        store.flush()
+
+        assert NumpyVectorStore(str(tmp_path / "old")).get()['ids'] == ["a", "b", "c"]
+        assert NumpyVectorStore(str(tmp_path / "new")).get()['ids'] == ["b", "c", "d"]
+
+    def test_appends_do_not_change_earlier_snapshots(self):
+        store = NumpyVectorStore()
+        store.add(ids=["a"], embeddings=[[1.0, 0.0]], documents=["doc a"], metadatas=[{}])
+        snapshot = store._state
+
+        for i in range(100):
+            store.add(ids=[f"d{i}"], embeddings=[[0.0, 1.0]], documents=[""], metadatas=[{}])
+        store.upsert(ids=["a"], embeddings=[[0.0, 1.0]], documents=["new a"], metadatas=[{}])
+
+        assert snapshot[0].shape == (1, 2)
+        assert snapshot[0][0].tolist() == [1.0, 0.0]
+        assert store.count() == 101
+        assert store.get(ids=["d99"], include=['embeddings'])['embeddings'] == [[0.0, 1.0]]
+
+
+    def test_interface_is_abstract(self):
+        class PartialStore(VectorStore):
+            def count(self):
+                return 0
+
+        with pytest.raises(TypeError):
+            PartialStore()
+        assert NumpyVectorStore().count() == 0
+
+
+class TestNumpyBackend:
+    """Test RAGSystem running on the NumPy backend."""
+
+    def test_index_and_retrieve(self, fake_embedding_model, tmp_path, mocker):
+        mocker.patch('rag_system.SentenceTransformer', return_value=fake_embedding_model)
+        mocker.patch('rag_system.OpenAI')
+        mocker.patch('rag_system.AsyncOpenAI')
+        from rag_system import RAGSystem
+
+        rag = RAGSystem(
+            vector_backend="numpy",
+            index_path=str(tmp_path / "index"),
+            embedding_cache_path=None,
+            parse_cache_path=None
+        )
+        chapters = tmp_path / "chapters"
+        chapters.mkdir()
+        (chapters / "chapter1_intro.md").write_text("## One\nBody one\n\n## Two\nBody two\n")
+
+        rag.load_documents(str(chapters))
+        rag.create_embeddings()
+        context = rag.retrieve_context("body two", top_k=1)
+
+        assert rag.collection.count() == 2
+        assert len(context) == 1
+        assert context[0]['chapter'] == "chapter1_intro"
+        assert context[0]['title'] in ("One", "Two")
+        assert 0.0 <= context[0]['relevance'] <= 1.0
+        # The finished generation was persisted before the switch
+        assert NumpyVectorStore(rag._generation_name(rag.index_generation)).count() == 2
+
+    def test_unknown_backend_rejected(self):
+        from rag_system import RAGSystem
+
+        with pytest.raises(ValueError, match="Unknown vector backend"):
+            RAGSystem(vector_backend="faiss")
@@ -0,0 +1,139 @@
+"""Unit tests for the chapter watcher and watcher-driven re-indexing."""
+import os
+import threading
+
+import pytest
+
+from backend import search_tools
+from backend.markdown_parser import bump_corpus_generation, corpus_generation
+from backend.watcher import ChapterWatcher
+
+
+@pytest.fixture
+def chapters(tmp_path):
+    chapters_dir = tmp_path / "chapters"
+    chapters_dir.mkdir()
+    (chapters_dir / "chapter1_intro.md").write_text("## One\nBody one\n\n## Two\nBody two\n")
+    (chapters_dir / "chapter2_usage.md").write_text("## Three\nBody three\n")
+    return chapters_dir
+
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class Recorder:
+    """on_change callback that records batches and can fail on demand."""
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+        self.event = threading.Event()
+
+    def __call__(self, paths):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("busy")
+        self.batches.append(paths)
+        self.event.set()
+
+
+@pytest.fixture(params=[False, True], ids=["polling", "inotify"])
+def use_inotify(request):
+    return request.param
+
+
+class TestChapterWatcher:
+    """Test change detection and debouncing in both modes."""
+
+    def test_burst_of_changes_reported_once(self, chapters, use_inotify):
+        recorder = Recorder()
+        watcher = ChapterWatcher(str(chapters), recorder, debounce=0.3, poll_interval=0.1,
+                                 use_inotify=use_inotify).start()
+        if use_inotify and watcher.backend != "inotify":
+            watcher.stop()
+            pytest.skip("inotify not available")
+        try:
+            intro = chapters / "chapter1_intro.md"
+            intro.write_text("## One\nEdited\n")
+            bump_mtime(intro)
+            (chapters / "chapter2_usage.md").unlink()
+            (chapters / "chapter3_new.md").write_text("## New\nBody\n")
+            (chapters / "notes.txt").write_text("ignored")
+
+            assert recorder.event.wait(5)
+        finally:
+            watcher.stop()
+
+        assert recorder.batches == [{
+            os.path.join(str(chapters), name)
+            for name in ("chapter1_intro.md", "chapter2_usage.md", "chapter3_new.md")
+        }]
+
+    def test_failed_handler_is_retried(self, chapters):
+        recorder = Recorder(failures=1)
+        watcher = ChapterWatcher(str(chapters), recorder, debounce=0.1, poll_interval=0.1,
+                                 use_inotify=False).start()
+        try:
+            (chapters / "chapter3_new.md").write_text("## New\nBody\n")
+            assert recorder.event.wait(5)
+        finally:
+            watcher.stop()
+
+        assert recorder.batches == [{os.path.join(str(chapters), "chapter3_new.md")}]
+
+
+class TestReindexFiles:
+    """Test that watched changes re-parse and re-embed only affected files."""
+
+    def test_only_changed_chunks_embedded(self, fake_rag_system, fake_embedding_model, chapters):
+        fake_rag_system.initialize(str(chapters))
+        fake_embedding_model.encoded.clear()
+        generation = corpus_generation()
+
+        intro = chapters / "chapter1_intro.md"
+        intro.write_text("## One\nBody one\n\n## Two\nBody two changed\n")
+        bump_mtime(intro)
+        result = fake_rag_system.reindex_files([str(intro)], str(chapters))
+
+        assert result['status'] == 'success'
+        assert result['embeddings_created'] == 1
+        assert fake_embedding_model.encoded == ["chapter1_intro: Two\nBody two changed\n"]
+        assert corpus_generation() > generation
+        assert list(fake_rag_system.documents) == [
+            "chapter1_intro_chunk_0", "chapter1_intro_chunk_1", "chapter2_usage_chunk_0"
+        ]
+
+    def test_deleted_file_chunks_removed(self, fake_rag_system, chapters):
+        fake_rag_system.initialize(str(chapters))
+        usage = chapters / "chapter2_usage.md"
+        usage.unlink()
+
+        fake_rag_system.reindex_files([str(usage)], str(chapters))
+
+        assert all(doc['chapter'] != "chapter2_usage" for doc in fake_rag_system.documents.values())
+        assert fake_rag_system.collection.count() == 2
+
+    def test_documents_only_refresh_skips_embedding(self, fake_rag_system, fake_embedding_model, chapters):
+        fake_rag_system.initialize(str(chapters))
+        fake_embedding_model.encoded.clear()
+        new = chapters / "chapter3_new.md"
+        new.write_text("## New\nBody\n")
+
+        result = fake_rag_system.reindex_files([str(new)], str(chapters), embed=False)
+
+        assert result['embeddings_created'] == 0
+        assert "chapter3_new_chunk_0" in fake_rag_system.documents
+        assert fake_embedding_model.encoded == []
+
+
+def test_generation_bump_invalidates_course_outline_cache(chapters):
+    search_tools.clear_course_cache()
+    first = search_tools._load_course_metadata(str(chapters))
+    assert search_tools._load_course_metadata(str(chapters)) is first
+
+    bump_corpus_generation()
+
+    assert search_tools._load_course_metadata(str(chapters)) is not first
+    search_tools.clear_course_cache()